@@ -0,0 +1,117 @@
+"""Concurrent dispatch of blocking backend requests.
+
+Resolvers talk to remote endpoints (SPARQL, HTTP APIs) with blocking
+calls, so independent requests are run on a shared thread pool. Each call
+runs in a copy of the caller's context, so the active Session
+(see oold.backend.session) is visible to it.
+"""
+
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Coroutine, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, NamedTuple
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="oold-backend"
+                )
+    return _executor
+
+
+def _run_in_worker(context: contextvars.Context, call: Callable[[], Any]) -> Any:
+    _local.in_worker = True
+    try:
+        return context.run(call)
+    finally:
+        _local.in_worker = False
+
+
+class CallResult(NamedTuple):
+    """Outcome of the call at index: its return value or the exception."""
+
+    index: int
+    value: Any = None
+    error: BaseException | None = None
+
+
+def iter_concurrently(
+    calls: list[Callable[[], Any]], timeouts: list[float | None] | None = None
+) -> Iterator[CallResult]:
+    """Run the calls concurrently and yield their results as they complete.
+
+    A call exceeding its timeout (in seconds, None for no limit) yields a
+    TimeoutError. Python threads cannot be interrupted, so the call keeps
+    running in the background and its result is discarded. Calls issued
+    from within a call (e.g. a resolver resolving nested references) are
+    run one by one in the calling thread, without timeouts, so the pool
+    cannot deadlock. Closing the iterator early leaves the remaining calls
+    running in the background."""
+    if timeouts is None:
+        timeouts = [None] * len(calls)
+    if getattr(_local, "in_worker", False) or (len(calls) <= 1 and all(t is None for t in timeouts)):
+        for index, call in enumerate(calls):
+            try:
+                yield CallResult(index, call())
+            except Exception as e:
+                yield CallResult(index, error=e)
+        return
+    executor = _get_executor()
+    start = time.monotonic()
+    pending = {executor.submit(_run_in_worker, contextvars.copy_context(), call): i for i, call in enumerate(calls)}
+    deadlines = {
+        future: start + timeouts[index] if timeouts[index] is not None else math.inf
+        for future, index in pending.items()
+    }
+    while pending:
+        next_deadline = min(deadlines[future] for future in pending)
+        wait_time = None if next_deadline == math.inf else max(0.0, next_deadline - time.monotonic())
+        done, _ = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            error = future.exception()
+            yield CallResult(index, None if error is not None else future.result(), error)
+        now = time.monotonic()
+        for future in [future for future in pending if deadlines[future] <= now]:
+            index = pending.pop(future)
+            future.cancel()
+            yield CallResult(index, error=TimeoutError(f"No response within {timeouts[index]} s"))
+
+
+def run_concurrently(calls: list[Callable[[], Any]]) -> list:
+    """Run the calls concurrently and return their results in order.
+
+    The first exception (in the order of calls) is raised after all calls
+    have finished, see iter_concurrently."""
+    results = sorted(iter_concurrently(calls), key=lambda result: result.index)
+    for result in results:
+        if result.error is not None:
+            raise result.error
+    return [result.value for result in results]
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code.
+
+    If the calling thread runs an event loop (a synchronous call from
+    async code), the coroutine is run in a separate thread with its own
+    loop, blocking the calling loop until it is done."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coroutine).result()
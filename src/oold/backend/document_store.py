@@ -1,10 +1,20 @@
+import asyncio
+import bisect
+import contextvars
+import functools
 import json
+import os
 import sqlite3
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from oold.backend.interface import (
     Backend,
+    ComparisonOperator,
     Condition,
     LinkedDataFormat,
     Query,
@@ -15,33 +25,315 @@ from oold.backend.interface import (
     apply_operator,
 )
 
+_MISSING = object()
+
+
+class _HashIndex:
+    """Maps the values of a top-level key to the IRIs of the documents
+    holding them, answers eq and ne conditions."""
+
+    def __init__(self):
+        self.buckets: dict[Any, set[str]] = {}
+        # all documents with the key, including unhashable values
+        self.keyed: set[str] = set()
+
+    def add(self, iri: str, value: Any):
+        self.keyed.add(iri)
+        # unhashable values equal no query value
+        with suppress(TypeError):
+            self.buckets.setdefault(value, set()).add(iri)
+
+    def remove(self, iri: str, value: Any):
+        self.keyed.discard(iri)
+        try:
+            bucket = self.buckets.get(value)
+        except TypeError:
+            return
+        if bucket is not None:
+            bucket.discard(iri)
+            if not bucket:
+                del self.buckets[value]
+
+    def count(self, operator: ComparisonOperator, value: Any) -> int | None:
+        """Return the number of matches, None if the condition is not supported."""
+        if operator == ComparisonOperator.EQ:
+            return len(self.buckets.get(value, ()))
+        if operator == ComparisonOperator.NE:
+            return len(self.keyed) - len(self.buckets.get(value, ()))
+        return None
+
+    def select(self, operator: ComparisonOperator, value: Any) -> set[str]:
+        if operator == ComparisonOperator.EQ:
+            return set(self.buckets.get(value, ()))
+        return self.keyed - self.buckets.get(value, set())
+
+
+class _SortedIndex:
+    """Keeps the values of a top-level key sorted (with the IRIs in
+    parallel), answers eq and range conditions by bisection."""
+
+    def __init__(self, items: list[tuple[str, Any]] = ()):
+        self.values: list = []
+        self.iris: list[str] = []
+        # documents with values not comparable to the sorted ones, tested
+        # one by one like in a scan
+        self.unsorted: dict[str, Any] = {}
+        # presorted, the values are appended; for mixed types they are
+        # inserted one by one
+        with suppress(TypeError):
+            items = sorted(items, key=lambda item: item[1])
+        for iri, value in items:
+            self.add(iri, value)
+
+    def add(self, iri: str, value: Any):
+        try:
+            if not self.values:
+                # the first value is not compared by bisect, but must be ordered
+                value < value  # noqa: B015
+            pos = bisect.bisect_right(self.values, value)
+        except TypeError:
+            self.unsorted[iri] = value
+            return
+        self.values.insert(pos, value)
+        self.iris.insert(pos, iri)
+
+    def remove(self, iri: str, value: Any):
+        if self.unsorted.pop(iri, _MISSING) is not _MISSING:
+            return
+        lo = bisect.bisect_left(self.values, value)
+        hi = bisect.bisect_right(self.values, value, lo)
+        pos = self.iris.index(iri, lo, hi)
+        del self.values[pos]
+        del self.iris[pos]
+
+    def _range(self, operator: ComparisonOperator, value: Any) -> tuple[int, int] | None:
+        if operator == ComparisonOperator.EQ:
+            return bisect.bisect_left(self.values, value), bisect.bisect_right(self.values, value)
+        if operator == ComparisonOperator.LT:
+            return 0, bisect.bisect_left(self.values, value)
+        if operator == ComparisonOperator.LE:
+            return 0, bisect.bisect_right(self.values, value)
+        if operator == ComparisonOperator.GT:
+            return bisect.bisect_right(self.values, value), len(self.values)
+        if operator == ComparisonOperator.GE:
+            return bisect.bisect_left(self.values, value), len(self.values)
+        return None
+
+    def count(self, operator: ComparisonOperator, value: Any) -> int | None:
+        try:
+            bounds = self._range(operator, value)
+        except TypeError:  # not comparable to the sorted values
+            return None
+        if bounds is None:
+            return None
+        return bounds[1] - bounds[0] + len(self.unsorted)
+
+    def select(self, operator: ComparisonOperator, value: Any) -> set[str]:
+        lo, hi = self._range(operator, value)
+        matches = set(self.iris[lo:hi])
+        matches.update(iri for iri, v in self.unsorted.items() if apply_operator(operator, v, value))
+        return matches
+
 
 class SimpleDictDocumentStore(Backend):
     """In-memory document store backed by a Python dict.
 
     Optionally persists to a JSON file if ``file_path`` is set.
     On init, loads existing data from the file (if it exists).
-    On every store, writes the full dict back to disk.
+    On every store, writes the full dict back to disk, or, with
+    ``journal=True``, appends the changed entities to a journal file
+    (``file_path`` + ``".journal"``) of newline-delimited JSON records.
+    The journal is replayed on init and merged into ``file_path`` by
+    ``compact()``.
     """
 
     _store: dict[str, dict] | None = None
     file_path: Path | str | None = None
     format: LinkedDataFormat = LinkedDataFormat.JSON
+    # append changes to the journal instead of rewriting file_path
+    journal: bool = False
+    # number of journal records written before the journal is synced to
+    # disk (fsync); records are flushed to the OS on every store
+    sync_batch_size: int = 100
+    # compact the journal once it holds this many records and at least as
+    # many as the store has entries, None to compact only explicitly
+    compact_threshold: int | None = 10000
+    # top-level keys to keep hash indexes (eq, ne) and sorted indexes
+    # (eq, lt, le, gt, ge) for, see create_index
+    indexes: list[str] = []
+    sorted_indexes: list[str] = []
+    _indexes: dict[str, list] | None = None
+    _journal_file: Any = None
+    _journal_records: int = 0
+    _unsynced_records: int = 0
+    # guards the journal file, which is appended to from several threads
+    _lock: Any = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._store = {}
+        self._lock = threading.Lock()
         if self.file_path is not None:
             p = Path(self.file_path)
             if p.exists():
                 with open(p) as f:
                     self._store = json.load(f)
+            if self.journal:
+                self._replay()
+        elif self.journal:
+            raise ValueError("journal requires a file_path")
+        self._indexes = {}
+        for key in self.indexes:
+            self.create_index(key)
+        for key in self.sorted_indexes:
+            self.create_index(key, kind="sorted")
+
+    @property
+    def journal_path(self) -> Path:
+        return Path(str(self.file_path) + ".journal")
+
+    def _replay(self):
+        """Apply the journal records to the loaded snapshot and open the
+        journal for appending. An incomplete last record (of an
+        interrupted write) is dropped."""
+        path = self.journal_path
+        if path.exists():
+            with open(path, "rb+") as f:
+                offset = 0
+                for line in f:
+                    record = None
+                    # every record is written with its newline at once
+                    if line.endswith(b"\n"):
+                        with suppress(json.JSONDecodeError):
+                            record = json.loads(line)
+                    if record is None:
+                        if f.read(1):
+                            raise ValueError(f"Corrupt journal record at byte {offset} of {path}")
+                        f.truncate(offset)
+                        break
+                    self._apply(record)
+                    offset += len(line)
+                    self._journal_records += 1
+        self._journal_file = open(path, "ab")  # noqa: SIM115
+
+    def _apply(self, record: dict):
+        if record["op"] == "upsert":
+            self._put(record["id"], record["data"])
+        elif record["op"] == "delete":
+            self._remove(record["id"])
+        else:
+            raise ValueError(f"Unknown journal operation {record['op']}")
+
+    def _put(self, iri: str, json_dict: dict):
+        """Set the document of iri and update the indexes."""
+        if self._indexes:
+            self._unindex(iri)
+            for key, indexes in self._indexes.items():
+                if key in json_dict:
+                    for index in indexes:
+                        index.add(iri, json_dict[key])
+        self._store[iri] = json_dict
+
+    def _remove(self, iri: str):
+        if self._indexes:
+            self._unindex(iri)
+        self._store.pop(iri, None)
+
+    def _unindex(self, iri: str):
+        old = self._store.get(iri)
+        if old is not None:
+            for key, indexes in self._indexes.items():
+                if key in old:
+                    for index in indexes:
+                        index.remove(iri, old[key])
+
+    def create_index(self, key: str, kind: Literal["hash", "sorted"] = "hash") -> None:
+        """Index the values of a top-level key. Queries on the key then
+        select the matching documents from the index instead of testing
+        every document: a hash index answers eq and ne conditions, a
+        sorted index eq and range conditions."""
+        indexes = self._indexes.setdefault(key, [])
+        index_cls = _HashIndex if kind == "hash" else _SortedIndex
+        if any(isinstance(index, index_cls) for index in indexes):
+            return
+        items = [(iri, json_dict[key]) for iri, json_dict in self._store.items() if key in json_dict]
+        if index_cls is _HashIndex:
+            index = _HashIndex()
+            for iri, value in items:
+                index.add(iri, value)
+        else:
+            index = _SortedIndex(items)
+        indexes.append(index)
+
+    def drop_index(self, key: str) -> None:
+        """Drop the indexes of a key."""
+        self._indexes.pop(key, None)
+
+    def _append(self, records: list[dict]):
+        """Append records to the journal, syncing every sync_batch_size
+        records, and apply them. Records are only applied once written,
+        so a failed write leaves the store as it is in the journal."""
+        data = b"".join(json.dumps(record).encode() + b"\n" for record in records)
+        with self._lock:
+            self._journal_file.write(data)
+            self._journal_file.flush()
+            self._journal_records += len(records)
+            self._unsynced_records += len(records)
+            if self._unsynced_records >= self.sync_batch_size:
+                os.fsync(self._journal_file.fileno())
+                self._unsynced_records = 0
+            for record in records:
+                self._apply(record)
+        if (
+            self.compact_threshold is not None
+            and self._journal_records >= self.compact_threshold
+            and self._journal_records >= len(self._store)
+        ):
+            self.compact()
+
+    def _write_snapshot(self):
+        """Replace file_path by the current dict. The dict is written to a
+        temporary file first, so an interrupted write leaves the previous
+        file intact."""
+        path = Path(self.file_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._store, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
 
     def _persist(self):
         """Write store to file if file_path is set."""
         if self.file_path is not None:
-            with open(self.file_path, "w") as f:
-                json.dump(self._store, f, indent=2)
+            self._write_snapshot()
+
+    def compact(self):
+        """Write the current dict to file_path and clear the journal."""
+        if not self.journal:
+            return
+        with self._lock:
+            self._write_snapshot()
+            # replaying the journal on the new snapshot is idempotent, so a
+            # crash before the journal is cleared loses nothing
+            self._journal_file.truncate(0)
+            os.fsync(self._journal_file.fileno())
+            self._journal_records = 0
+            self._unsynced_records = 0
+
+    def sync(self):
+        """Sync the journal to disk."""
+        if self._journal_file is not None:
+            with self._lock:
+                os.fsync(self._journal_file.fileno())
+                self._unsynced_records = 0
+
+    def close(self):
+        """Sync and close the journal."""
+        if self._journal_file is not None:
+            self.sync()
+            self._journal_file.close()
+            self._journal_file = None
 
     def resolve_iris(self, iris: list[str]) -> dict[str, dict]:
         jsonld_dicts = {}
@@ -50,8 +342,21 @@ class SimpleDictDocumentStore(Backend):
         return jsonld_dicts
 
     def store_json_dicts(self, json_dicts: dict[str, dict]) -> StoreResult:
+        if self.journal:
+            self._append([{"op": "upsert", "id": iri, "data": json_dict} for iri, json_dict in json_dicts.items()])
+            return StoreResult(success=True)
         for iri, json_dict in json_dicts.items():
-            self._store[iri] = json_dict
+            self._put(iri, json_dict)
+        self._persist()
+        return StoreResult(success=True)
+
+    def delete_iris(self, iris: list[str]) -> StoreResult:
+        """Remove the documents of the IRIs."""
+        if self.journal:
+            self._append([{"op": "delete", "id": iri} for iri in iris])
+            return StoreResult(success=True)
+        for iri in iris:
+            self._remove(iri)
         self._persist()
         return StoreResult(success=True)
 
@@ -75,30 +380,70 @@ class SimpleDictDocumentStore(Backend):
                 matched_entities.add(iri)
         return matched_entities
 
+    def _matches(self, query: Query | Condition, jsonld_dict: dict) -> bool:
+        """Test a single document, see _filter."""
+        if isinstance(query, Condition):
+            return query.field in jsonld_dict and apply_operator(query.operator, jsonld_dict[query.field], query.value)
+        elif isinstance(query, Query):
+            if query.operator == "and":
+                return self._matches(query.op1, jsonld_dict) and self._matches(query.op2, jsonld_dict)
+            elif query.operator == "or":
+                return self._matches(query.op1, jsonld_dict) or self._matches(query.op2, jsonld_dict)
+            else:
+                raise NotImplementedError(f"Operator {query.operator} not implemented")
+        else:
+            raise TypeError("Invalid query type")
+
+    def _best_index(self, condition: Query | Condition) -> tuple[int, Any] | None:
+        """Return the number of matches and the most selective index for
+        a condition, None if no index answers it."""
+        if not isinstance(condition, Condition):
+            return None
+        best = None
+        for index in self._indexes.get(condition.field, ()):
+            count = index.count(ComparisonOperator(condition.operator), condition.value)
+            if count is not None and (best is None or count < best[0]):
+                best = (count, index)
+        return best
+
     def _query(
         self,
         query: Query | Condition,
         context: dict | None = None,
         data: dict[str, dict] | None = None,
     ) -> set[str]:
-        print("QUERY", query)
         if data is None:
             data = self._store
-        if isinstance(query, Condition):
-            return self._filter(query.field, query.operator, query.value, context, data)
-        elif isinstance(query, Query):
-            c1_res = self._query(query.op1, context, data)
-            c2_res = self._query(query.op2, context, data)
-            if query.operator == "and":
-                # intersect the results
-                return c1_res & c2_res
-            elif query.operator == "or":
-                # union the results
-                return c1_res | c2_res
+        if data is not self._store or not self._indexes:
+            if isinstance(query, Condition):
+                return self._filter(query.field, query.operator, query.value, context, data)
+            return {iri for iri, jsonld_dict in data.items() if self._matches(query, jsonld_dict)}
+        if isinstance(query, Query) and query.operator == "or":
+            return self._query(query.op1, context) | self._query(query.op2, context)
+        # select the candidates of a conjunction from the most selective
+        # index and test the other conditions on the candidates only
+        conditions = []
+        pending = [query]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, Query) and item.operator == "and":
+                pending += [item.op2, item.op1]
             else:
-                raise NotImplementedError(f"Operator {query.operator} not implemented")
-        else:
-            raise TypeError("Invalid query type")
+                conditions.append(item)
+        best = None
+        for pos, condition in enumerate(conditions):
+            candidate = self._best_index(condition)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = (*candidate, pos)
+        if best is None:
+            return {iri for iri, jsonld_dict in data.items() if self._matches(query, jsonld_dict)}
+        _, index, pos = best
+        # (removed by position, == on a Condition builds a new condition)
+        selected = conditions.pop(pos)
+        matches = index.select(ComparisonOperator(selected.operator), selected.value)
+        for condition in conditions:
+            matches = {iri for iri in matches if self._matches(condition, data[iri])}
+        return matches
 
     def query(self, param: QueryParam) -> ResolveResult:
         context = None
@@ -110,74 +455,320 @@ class SimpleDictDocumentStore(Backend):
         return self.resolve(ResolveParam(iris=list(iris), model_cls=param.model_cls))
 
 
+# the default maximum number of parameters of a statement before SQLite 3.32
+_MAX_VARIABLES = 999
+
+_SQL_OPERATORS = {
+    ComparisonOperator.EQ: "=",
+    ComparisonOperator.NE: "!=",
+    ComparisonOperator.LT: "<",
+    ComparisonOperator.LE: "<=",
+    ComparisonOperator.GT: ">",
+    ComparisonOperator.GE: ">=",
+}
+
+
+def _json_path(key: str) -> str:
+    """Return the SQL string literal of the JSON path of a top-level key.
+    The path is inlined (not bound) so that queries match the expression
+    indexes, see SqliteDocumentStore.create_index."""
+    if '"' in key:
+        raise ValueError(f"Unsupported key {key!r}")
+    return "'$.\"" + key.replace("'", "''") + "\"'"
+
+
+def _compile_query(query: Query | Condition) -> tuple[str, list]:
+    """Compile a query into an SQL condition on the data column of the
+    entities table and its parameters. As in SimpleDictDocumentStore, a
+    condition only matches documents that contain the key."""
+    if isinstance(query, Condition):
+        operator = ComparisonOperator(query.operator)
+        path = _json_path(query.field)
+        value = query.value
+        if value is None:
+            if operator == ComparisonOperator.EQ:
+                return f"json_type(data, {path}) = 'null'", []
+            if operator == ComparisonOperator.NE:
+                return f"json_type(data, {path}) != 'null'", []
+            raise ValueError(f"Operator {operator.value} not supported for None")
+        condition = f"json_extract(data, {path}) {_SQL_OPERATORS[operator]} ?"
+        if operator == ComparisonOperator.NE:
+            # json_extract returns NULL for a null value, which differs from any value
+            condition = f"({condition} OR json_type(data, {path}) = 'null')"
+        return condition, [value]
+    elif isinstance(query, Query):
+        if query.operator not in ("and", "or"):
+            raise NotImplementedError(f"Operator {query.operator} not implemented")
+        sql1, params1 = _compile_query(query.op1)
+        sql2, params2 = _compile_query(query.op2)
+        return f"({sql1} {query.operator.upper()} {sql2})", params1 + params2
+    else:
+        raise TypeError("Invalid query type")
+
+
 class SqliteDocumentStore(Backend):
+    """Document store backed by a SQLite database.
+
+    A database file is read through a bounded pool of connections and
+    written through a single writer connection. The database is switched
+    to ``journal_mode`` (WAL by default) so that several threads and
+    processes read concurrently while one writer commits; a writer waits
+    up to ``busy_timeout`` seconds for the lock held by another process.
+    An in-memory database (``db_path=":memory:"``) lives in a single
+    connection, which is shared between threads under a lock.
+    """
+
     db_path: Path | str
     format: LinkedDataFormat = LinkedDataFormat.JSON
-    persist_connection: bool = False
+    # keep idle connections open for reuse, if False every request opens
+    # and closes its own connection
+    persist_connection: bool = True
+    # maximum number of reader connections open at the same time
+    pool_size: int = 8
+    journal_mode: Literal["delete", "truncate", "persist", "memory", "wal", "off"] = "wal"
+    synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    # page cache size per connection, in pages or in KiB if negative,
+    # None for the SQLite default
+    cache_size: int | None = None
+    # maximum number of bytes of the database file to memory-map
+    mmap_size: int | None = None
+    # seconds to wait for a lock held by another connection
+    busy_timeout: float = 5.0
+    # top-level keys to create expression indexes for, see create_index
+    indexes: list[str] = []
+    # number of IRIs from which on resolve_iris joins a temporary table
+    # instead of selecting the IRIs in chunks, which reads all documents
+    # from one snapshot of the database but is slower; None to always
+    # select in chunks, see iter_resolve_iris
+    temp_table_threshold: int | None = None
     _conn: sqlite3.Connection | None = None
+    # guards the persistent connection, which is shared between threads
+    _lock: Any = None
+    # idle reader connections and the slots limiting the open ones
+    _idle: list[sqlite3.Connection] | None = None
+    _slots: Any = None
+    # the single writer connection; writers of this store queue on the
+    # lock instead of waiting on the database lock
+    _writer: sqlite3.Connection | None = None
+    _write_lock: Any = None
+    # runs the async requests on dedicated threads
+    _executor: ThreadPoolExecutor | None = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.pool_size)
 
         if self.db_path == ":memory:":
             self.persist_connection = True
-            self._conn = sqlite3.connect(self.db_path)
-
-        # create table 'entities' if not exists
-        conn = self._conn if self.persist_connection else sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS entities (
-                id TEXT PRIMARY KEY,
-                data JSONB
+            self._conn = self._connect()
+
+        with self._connection(write=True) as conn:
+            if self._conn is None:
+                # the journal mode is a property of the database file
+                conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            # create table 'entities' if not exists
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entities (
+                    id TEXT PRIMARY KEY,
+                    data JSONB
+                )
+                """
             )
-            """
-        )
-        conn.commit()
-        if not self.persist_connection:
-            conn.close()
+        for key in self.indexes:
+            self.create_index(key)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and apply the connection-level pragmas."""
+        # connections are handed from thread to thread, but used by one
+        # thread at a time
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        if self.cache_size is not None:
+            conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        if self.mmap_size is not None:
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle reader connection or open one, waiting while
+        pool_size connections are in use."""
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop()
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: sqlite3.Connection, reuse: bool = True) -> None:
+        try:
+            if reuse and self.persist_connection:
+                with self._lock:
+                    self._idle.append(conn)
+            else:
+                conn.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def _connection(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection. A write runs in a transaction, which is
+        committed on exit or rolled back on error."""
+        if self._conn is not None:
+            with self._lock, self._conn:
+                yield self._conn
+        elif write:
+            with self._write_lock:
+                if self._writer is None:
+                    self._writer = self._connect()
+                try:
+                    with self._writer:
+                        yield self._writer
+                finally:
+                    if not self.persist_connection:
+                        self._writer.close()
+                        self._writer = None
+        else:
+            conn = self._acquire()
+            try:
+                yield conn
+            except BaseException:
+                # the connection may be left in an unknown state
+                self._release(conn, reuse=False)
+                raise
+            self._release(conn)
 
     def close(self):
-        """Close the persistent connection if it exists."""
+        """Close the persistent, the writer and the idle reader connections."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
         if self._conn is not None:
             self._conn.close()
             self._conn = None
 
+    async def _run(self, func, *args):
+        """Run func in one of the store's threads. sqlite3 has no async
+        API, so the blocking calls run on dedicated threads (one per pooled
+        connection) instead of the shared default executor."""
+        with self._lock:
+            if self._executor is None:
+                workers = 1 if self._conn is not None else self.pool_size
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oold-sqlite")
+        call = functools.partial(contextvars.copy_context().run, func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def aresolve_iris(self, iris: list[str]) -> dict[str, dict]:
+        return await self._run(self.resolve_iris, iris)
+
+    async def astore_json_dicts(self, json_dicts: dict[str, dict]) -> StoreResult:
+        return await self._run(self._store_dicts, json_dicts)
+
     def resolve_iris(self, iris: list[str]) -> dict[str, dict]:
-        jsonld_dicts = {}
-        conn = self._conn if self.persist_connection else sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        # Only the number of `?` placeholders is interpolated; the actual IRI
-        # values are bound as query parameters, so this is not an injection vector.
-        placeholders = ",".join("?" for _ in iris)
-        c.execute(
-            f"SELECT id, data FROM entities WHERE id IN ({placeholders})",  # noqa: S608
-            iris,
-        )
-        rows = c.fetchall()
-        for iri, data in rows:
-            jsonld_dicts[iri] = json.loads(data)
-        if not self.persist_connection:
-            conn.close()
-        return jsonld_dicts
+        return dict(self.iter_resolve_iris(iris))
+
+    def iter_resolve_iris(self, iris: list[str], chunk_size: int = 500) -> Iterator[tuple[str, dict | None]]:
+        """Yield (iri, document) pairs in the order of iris (None if not
+        found) while the rows are read. The IRIs are selected chunk_size
+        at a time, or joined from a temporary table in a single query if
+        there are more than temp_table_threshold."""
+        threshold = self.temp_table_threshold
+        if threshold is not None and len(iris) > threshold and self._conn is None:
+            yield from self._iter_join(iris, chunk_size)
+            return
+        # SQLite limits the number of parameters of a statement
+        chunk_size = min(chunk_size, _MAX_VARIABLES)
+        for start in range(0, len(iris), chunk_size):
+            chunk = iris[start : start + chunk_size]
+            # Only the number of `?` placeholders is interpolated; the actual IRI
+            # values are bound as query parameters, so this is not an injection vector.
+            placeholders = ",".join("?" * len(chunk))
+            with self._connection() as conn:
+                rows = conn.execute(
+                    f"SELECT id, data FROM entities WHERE id IN ({placeholders})",  # noqa: S608
+                    chunk,
+                ).fetchall()
+            found = dict(rows)
+            for iri in chunk:
+                data = found.get(iri)
+                yield iri, json.loads(data) if data is not None else None
+
+    def _iter_join(self, iris: list[str], chunk_size: int) -> Iterator[tuple[str, dict | None]]:
+        """Join the IRIs from a temporary table of the reader connection,
+        which is held until the generator is exhausted or closed."""
+        with self._connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS requested_iris (pos INTEGER PRIMARY KEY, id TEXT)")
+            try:
+                conn.executemany("INSERT INTO requested_iris (pos, id) VALUES (?, ?)", enumerate(iris))
+                cursor = conn.execute(
+                    """
+                    SELECT r.id, e.data FROM requested_iris r
+                    LEFT JOIN entities e ON e.id = r.id
+                    ORDER BY r.pos
+                    """
+                )
+                while rows := cursor.fetchmany(chunk_size):
+                    for iri, data in rows:
+                        yield iri, json.loads(data) if data is not None else None
+            finally:
+                conn.execute("DELETE FROM requested_iris")
+                conn.commit()
 
     def _store_dicts(self, dicts: dict[str, dict]) -> StoreResult:
-        conn = self._conn if self.persist_connection else sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.executemany(
-            """
-            INSERT OR REPLACE INTO entities (id, data) VALUES (?, ?)
-            """,
-            [(iri, json.dumps(d)) for iri, d in dicts.items()],
-        )
-        conn.commit()
-        if not self.persist_connection:
-            conn.close()
+        with self._connection(write=True) as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO entities (id, data) VALUES (?, ?)
+                """,
+                [(iri, json.dumps(d)) for iri, d in dicts.items()],
+            )
         return StoreResult(success=True)
 
     def store_json_dicts(self, json_dicts: dict[str, dict]) -> StoreResult:
         return self._store_dicts(json_dicts)
 
-    def query():
-        raise NotImplementedError()
+    def create_index(self, key: str) -> None:
+        """Create an index on the value of a top-level key of the documents,
+        used by queries filtering on the key for equality and ranges."""
+        path = _json_path(key)
+        name = '"idx_entities_' + key + '"'
+        with self._connection(write=True) as conn:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON entities (json_extract(data, {path}))")
+
+    def drop_index(self, key: str) -> None:
+        """Drop the index created by create_index."""
+        _json_path(key)  # validate the key
+        with self._connection(write=True) as conn:
+            conn.execute('DROP INDEX IF EXISTS "idx_entities_' + key + '"')
+
+    def _query_dicts(self, query: Query | Condition) -> dict[str, dict]:
+        """Return the documents matching the query by IRI."""
+        condition, params = _compile_query(query)
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT id, data FROM entities WHERE {condition}", params).fetchall()  # noqa: S608
+        return {iri: json.loads(data) for iri, data in rows}
+
+    def query(self, param: QueryParam) -> ResolveResult:
+        """Filter the documents in the database, see _compile_query."""
+        model_cls = param.model_cls if param.model_cls is not None else self.model_cls
+        if model_cls is None:
+            raise ValueError("No model_cls provided in request or resolver")
+        json_dicts = self._query_dicts(param.query)
+        return self._build_result(ResolveParam(iris=list(json_dicts), model_cls=model_cls), model_cls, json_dicts, {})
+
+    async def aquery(self, param: QueryParam) -> ResolveResult:
+        return await self._run(self.query, param)
@@ -1,11 +1,19 @@
+import asyncio
+import logging
 import operator as _op
-from abc import abstractmethod
+import weakref
+from collections.abc import Awaitable, Callable, Iterator
 from enum import Enum
 from typing import Union
 
 from pydantic import BaseModel
 
-from oold.static import GenericLinkedBaseModel
+from oold.backend.concurrency import iter_concurrently, run_concurrently, run_sync
+from oold.backend.routing import PrefixMap, RoutingTable, matches_any_prefix
+from oold.backend.session import get_session
+from oold.static import GenericLinkedBaseModel, get_context_prefixes
+
+_logger = logging.getLogger(__name__)
 
 
 class ComparisonOperator(str, Enum):
@@ -31,6 +39,11 @@ def apply_operator(operator: ComparisonOperator, a, b) -> bool:
     return _COMPARISON_FNS[operator](a, b)
 
 
+def _overrides(obj, base: type, name: str) -> bool:
+    """Whether the class of obj overrides the method name of base."""
+    return getattr(type(obj), name) is not getattr(base, name)
+
+
 class SetResolverParam(BaseModel):
     iri: str
     resolver: "Resolver"
@@ -38,6 +51,8 @@ class SetResolverParam(BaseModel):
 
 class GetResolverParam(BaseModel):
     iri: str
+    # the context of model_cls provides the CURIE prefixes for routing
+    model_cls: type[GenericLinkedBaseModel] | None = None
 
 
 class GetResolverResult(BaseModel):
@@ -95,56 +110,424 @@ class LinkedDataFormat(str, Enum):
 class Resolver(BaseModel):
     model_cls: type[GenericLinkedBaseModel] | None = None
     format: LinkedDataFormat | None = LinkedDataFormat.JSON_LD
+    # class IRIs (compact or expanded) of the nodes held by the resolver,
+    # empty if unrestricted, see serves_class
+    class_iris: list[str] = []
+    # IRI prefixes of the nodes held by the resolver (notation as for
+    # set_resolver), empty if unrestricted, see serves_iri
+    iri_prefixes: list[str] = []
+    # seconds to wait for the resolver when several resolvers are
+    # requested at once (see resolve_all), None for no limit
+    timeout: float | None = None
+
+    def serves_class(self, model_cls) -> bool:
+        """Whether the resolver may hold instances of model_cls, i.e. it
+        declares the IRI of model_cls, one of its bases or subclasses."""
+        if not self.class_iris or model_cls is None:
+            return True
+        related = _get_related_class_iris(model_cls)
+        prefixes = get_prefix_map(model_cls)
+        return any(iri in related or prefixes.expand(iri) in related for iri in self.class_iris)
+
+    def serves_iri(self, iri: str, model_cls=None) -> bool:
+        """Whether the resolver may hold the node with the IRI. The context
+        of model_cls provides the CURIE prefixes to match compact and
+        expanded IRIs."""
+        if not self.iri_prefixes:
+            return True
+        return matches_any_prefix(iri, self.iri_prefixes, get_prefix_map(model_cls))
+
+    # Subclasses implement the sync or the async variant of each request
+    # (or both), the other one is adapted: sync methods run in a worker
+    # thread when awaited, async methods on a new event loop when called
+    # synchronously.
 
-    @abstractmethod
     def resolve_iris(self, iris: list[str]) -> dict[str, dict]:
-        pass
-
-    def resolve(self, request: ResolveParam):
-        # print("RESOLVE", request)
-
+        """Return the documents of the IRIs (None if not found)."""
+        if not _overrides(self, Resolver, "aresolve_iris"):
+            raise NotImplementedError("resolve_iris method not implemented in Resolver subclass")
+        return run_sync(self.aresolve_iris(iris))
+
+    async def aresolve_iris(self, iris: list[str]) -> dict[str, dict]:
+        """Async variant of resolve_iris."""
+        return await asyncio.to_thread(self.resolve_iris, iris)
+
+    def iter_resolve_iris(self, iris: list[str], chunk_size: int = 500) -> Iterator[tuple[str, dict | None]]:
+        """Yield (iri, document) pairs in the order of iris (None if not
+        found), requesting chunk_size IRIs at a time."""
+        for start in range(0, len(iris), chunk_size):
+            chunk = iris[start : start + chunk_size]
+            documents = self.resolve_iris(chunk)
+            for iri in chunk:
+                yield iri, documents.get(iri)
+
+    def _lookup_session(self, request: ResolveParam) -> tuple[type, list[str], dict]:
+        """Return the model class, the IRIs to request and the nodes
+        already known to the active identity map."""
         model_cls = request.model_cls
         if model_cls is None:
             model_cls = self.model_cls
         if model_cls is None:
             raise ValueError("No model_cls provided in request or resolver")
 
-        jsonld_dicts = self.resolve_iris(request.iris)
-        nodes = {}
-        for iri, jsonld_dict in jsonld_dicts.items():
-            if jsonld_dict is None:
-                nodes[iri] = None
-            else:
-                if self.format == LinkedDataFormat.JSON_LD:
-                    node = model_cls.from_jsonld(jsonld_dict)
-                elif self.format == LinkedDataFormat.JSON:
-                    node = model_cls.from_json(jsonld_dict)
+        # serve already known nodes from the active identity map
+        session = get_session()
+        iris = request.iris
+        cached = {}
+        if session is not None:
+            iris = []
+            for iri in request.iris:
+                node = session.get(iri, model_cls)
+                if node is None:
+                    iris.append(iri)
                 else:
-                    raise ValueError(f"Unsupported format {self.format}")
-                nodes[iri] = node
+                    cached[iri] = node
+        return model_cls, iris, cached
 
+    def _build_result(self, request: ResolveParam, model_cls, jsonld_dicts: dict, cached: dict) -> ResolveResult:
+        session = get_session()
+        found = {iri: jsonld_dict for iri, jsonld_dict in jsonld_dicts.items() if jsonld_dict is not None}
+        parsed = dict(zip(found, self._parse_many(model_cls, list(found.values())), strict=True))
+        nodes = {}
+        for iri in jsonld_dicts:
+            node = parsed.get(iri)
+            if node is not None and session is not None:
+                session.put(iri, node)
+            nodes[iri] = node
+
+        if cached:
+            # keep the requested order
+            nodes = {
+                iri: cached[iri] if iri in cached else nodes[iri]
+                for iri in request.iris
+                if iri in cached or iri in nodes
+            }
         return ResolveResult(nodes=nodes)
 
+    def resolve(self, request: ResolveParam):
+        model_cls, iris, cached = self._lookup_session(request)
+        jsonld_dicts = self.resolve_iris(iris) if iris else {}
+        return self._build_result(request, model_cls, jsonld_dicts, cached)
+
+    async def aresolve(self, request: ResolveParam) -> ResolveResult:
+        """Async variant of resolve."""
+        model_cls, iris, cached = self._lookup_session(request)
+        jsonld_dicts = await self.aresolve_iris(iris) if iris else {}
+        return self._build_result(request, model_cls, jsonld_dicts, cached)
+
+    def _parse_many(self, model_cls, dicts: list[dict]) -> list:
+        """Construct model instances from the documents in the resolver's format."""
+        if not dicts:
+            return []
+        if self.format == LinkedDataFormat.JSON_LD:
+            if hasattr(model_cls, "from_jsonld_many"):
+                return model_cls.from_jsonld_many(dicts)
+            return [model_cls.from_jsonld(d) for d in dicts]
+        elif self.format == LinkedDataFormat.JSON:
+            return [model_cls.from_json(d) for d in dicts]
+        raise ValueError(f"Unsupported format {self.format}")
+
     def query(self, param: QueryParam) -> ResolveResult:
         """Query the backend and return a ResolveResult."""
-        raise NotImplementedError("Query method not implemented in Resolver subclass")
+        if not _overrides(self, Resolver, "aquery"):
+            raise NotImplementedError("Query method not implemented in Resolver subclass")
+        return run_sync(self.aquery(param))
+
+    async def aquery(self, param: QueryParam) -> ResolveResult:
+        """Async variant of query."""
+        return await asyncio.to_thread(self.query, param)
 
 
 global _resolvers
 _resolvers = {}
+_resolver_routes: RoutingTable["Resolver"] = RoutingTable()
+
+# CURIE prefixes available for routing in addition to those of the model
+# contexts, see register_prefixes
+_prefixes: dict[str, str] = {}
+_prefix_maps: "weakref.WeakKeyDictionary[type, tuple[dict, PrefixMap]]" = weakref.WeakKeyDictionary()
+_global_prefix_map: PrefixMap | None = None
+
+
+def register_prefixes(prefixes: dict[str, str]) -> None:
+    """Register CURIE prefixes (prefix -> IRI) used to route IRIs that
+    are not covered by the context of the requesting model."""
+    global _global_prefix_map
+    _prefixes.update(prefixes)
+    _prefix_maps.clear()
+    _global_prefix_map = None
+
+
+def get_prefix_map(model_cls=None) -> PrefixMap:
+    """Return the prefixes for routing the IRIs of model_cls: the
+    registered prefixes and those of the model context."""
+    global _global_prefix_map
+    if model_cls is None:
+        if _global_prefix_map is None:
+            _global_prefix_map = PrefixMap(_prefixes)
+        return _global_prefix_map
+    context_prefixes = get_context_prefixes(model_cls)
+    entry = _prefix_maps.get(model_cls)
+    # the context prefixes are rebuilt when a class is registered
+    if entry is None or entry[0] is not context_prefixes:
+        entry = (context_prefixes, PrefixMap({**_prefixes, **context_prefixes}))
+        _prefix_maps[model_cls] = entry
+    return entry[1]
+
+
+# IRIs of the classes related to a model class, see _get_related_class_iris
+_related_class_iris: "weakref.WeakKeyDictionary[type, tuple[PrefixMap, frozenset[str]]]" = weakref.WeakKeyDictionary()
+
+
+def _get_related_class_iris(model_cls) -> frozenset[str]:
+    """Return the class IRIs (as given and expanded) of model_cls, its
+    bases and its subclasses."""
+    prefixes = get_prefix_map(model_cls)
+    entry = _related_class_iris.get(model_cls)
+    # the prefix map is replaced when a class is registered
+    if entry is not None and entry[0] is prefixes:
+        return entry[1]
+    classes = list(model_cls.__mro__)
+    pending = [model_cls]
+    while pending:
+        for sub in pending.pop().__subclasses__():
+            if sub not in classes:
+                classes.append(sub)
+                pending.append(sub)
+    iris = set()
+    for cls in classes:
+        cls_iri = cls.get_cls_iri() if hasattr(cls, "get_cls_iri") else None
+        for iri in cls_iri if isinstance(cls_iri, list) else [cls_iri]:
+            if isinstance(iri, str):
+                iris.add(iri)
+                iris.add(get_prefix_map(cls).expand(iri))
+    related = frozenset(iris)
+    _related_class_iris[model_cls] = (prefixes, related)
+    return related
 
 
 def set_resolver(param: SetResolverParam) -> None:
+    """Register the resolver for an IRI prefix, see oold.backend.routing."""
     _resolvers[param.iri] = param.resolver
+    _resolver_routes.register(param.iri, param.resolver)
 
 
 def get_resolver(param: GetResolverParam) -> GetResolverResult:
-    # ToDo: Handle prefixes (ex:) as well as full IRIs (http://example.com/)
-    # ToDo: Handle list of IRIs with mixed domains
-    iri = param.iri.split(":")[0]
-    if iri not in _resolvers:
-        raise ValueError(f"No resolvers found for {iri}")
-    return GetResolverResult(resolver=_resolvers[iri])
+    """Return the resolver registered for the longest prefix of the IRI."""
+    resolver = _resolver_routes.lookup(param.iri, get_prefix_map(param.model_cls))
+    if resolver is None:
+        raise ValueError(f"No resolvers found for {param.iri}")
+    return GetResolverResult(resolver=resolver)
+
+
+def group_by_resolver(iris: list[str], model_cls=None) -> list[tuple["Resolver", list[str]]]:
+    """Split iris into one batch per resolver (see get_resolver),
+    keeping the order of the IRIs within each batch."""
+    prefixes = get_prefix_map(model_cls)
+    batches: dict[int, tuple[Resolver, list[str]]] = {}
+    for iri in iris:
+        resolver = _resolver_routes.lookup(iri, prefixes)
+        if resolver is None:
+            raise ValueError(f"No resolvers found for {iri}")
+        batches.setdefault(id(resolver), (resolver, []))[1].append(iri)
+    return list(batches.values())
+
+
+def resolve(param: ResolveParam, context_cls=None) -> ResolveResult:
+    """Resolve IRIs of mixed domains. The batches of the individual
+    resolvers are resolved concurrently and merged in the order of
+    param.iris.
+
+    Parameters
+    ----------
+    param
+        The IRIs and the model class to construct the nodes with.
+    context_cls
+        The model class whose context provides the CURIE prefixes for
+        routing, defaults to param.model_cls.
+    """
+    if context_cls is None:
+        context_cls = param.model_cls
+    batches = group_by_resolver(param.iris, context_cls)
+    if len(batches) == 1:
+        resolver, iris = batches[0]
+        return resolver.resolve(ResolveParam(iris=iris, model_cls=param.model_cls))
+    results = run_concurrently([
+        lambda resolver=resolver, iris=iris: resolver.resolve(ResolveParam(iris=iris, model_cls=param.model_cls))
+        for resolver, iris in batches
+    ])
+    return _merge_batches(param, results)
+
+
+async def aresolve(param: ResolveParam, context_cls=None) -> ResolveResult:
+    """Async variant of resolve."""
+    if context_cls is None:
+        context_cls = param.model_cls
+    batches = group_by_resolver(param.iris, context_cls)
+    results = await asyncio.gather(
+        *(resolver.aresolve(ResolveParam(iris=iris, model_cls=param.model_cls)) for resolver, iris in batches)
+    )
+    return _merge_batches(param, results)
+
+
+def _merge_batches(param: ResolveParam, results: list[ResolveResult]) -> ResolveResult:
+    merged = {}
+    for result in results:
+        merged.update(result.nodes)
+    return ResolveResult(nodes={iri: merged[iri] for iri in param.iris if iri in merged})
+
+
+def get_resolvers(model_cls=None) -> list["Resolver"]:
+    """Return the distinct registered resolvers that may hold instances
+    of model_cls (see Resolver.serves_class) in the order of registration."""
+    resolvers = {id(resolver): resolver for resolver in _resolvers.values()}
+    return [resolver for resolver in resolvers.values() if resolver.serves_class(model_cls)]
+
+
+def _fan_out(
+    calls: list[tuple["Resolver", Callable[[], ResolveResult]]], stop: Callable[[ResolveResult], bool] | None = None
+) -> list[ResolveResult]:
+    """Run the requests to the resolvers concurrently, see iter_concurrently.
+    Returns the results in the order of calls, skipping resolvers that
+    do not support the request or did not respond within their timeout.
+    Stops early once stop(result) is true."""
+    timeouts = [resolver.timeout for resolver, _ in calls]
+    results: dict[int, ResolveResult] = {}
+    for index, value, error in iter_concurrently([call for _, call in calls], timeouts):
+        if _accept(calls[index][0], error) and _collect(results, index, value, stop):
+            break
+    return [results[index] for index in sorted(results)]
+
+
+def _accept(resolver: "Resolver", error: BaseException | None) -> bool:
+    """Whether to use the result of a fan-out request. Errors other than
+    missing support and timeouts are raised."""
+    if isinstance(error, NotImplementedError):
+        return False  # resolver does not support the request
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        _logger.warning("Skipping %s: %s", type(resolver).__name__, error)
+        return False
+    if error is not None:
+        raise error
+    return True
+
+
+def _collect(results: dict, index: int, value: ResolveResult, stop) -> bool:
+    """Add the result, return True if the fan-out can stop."""
+    results[index] = value
+    return stop is not None and stop(value)
+
+
+async def _afan_out(
+    calls: list[tuple["Resolver", Callable[[], Awaitable[ResolveResult]]]],
+    stop: Callable[[ResolveResult], bool] | None = None,
+) -> list[ResolveResult]:
+    """Async variant of _fan_out. Requests still pending when stopping
+    early are cancelled."""
+
+    async def run(index: int, resolver: Resolver, call):
+        try:
+            if resolver.timeout is None:
+                return index, await call(), None
+            try:
+                return index, await asyncio.wait_for(call(), resolver.timeout), None
+            except asyncio.TimeoutError:
+                return index, None, TimeoutError(f"No response within {resolver.timeout} s")
+        except Exception as e:
+            return index, None, e
+
+    tasks = [asyncio.ensure_future(run(index, resolver, call)) for index, (resolver, call) in enumerate(calls)]
+    results: dict[int, ResolveResult] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, value, error = await next_done
+            if _accept(calls[index][0], error) and _collect(results, index, value, stop):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+    return [results[index] for index in sorted(results)]
+
+
+def _merge(results: list[ResolveResult]) -> dict:
+    """Merge the nodes of several results, the first node found for an
+    IRI wins."""
+    merged = {}
+    for result in results:
+        for iri, node in result.nodes.items():
+            if merged.get(iri) is None:
+                merged[iri] = node
+    return merged
+
+
+def resolve_all(param: ResolveParam, first_match: bool = False) -> ResolveResult:
+    """Request the IRIs from all registered resolvers that serve
+    param.model_cls and the respective IRIs (see Resolver.serves_class,
+    Resolver.serves_iri) concurrently. The results are deduplicated by IRI,
+    IRIs not returned by any resolver are omitted.
+
+    If first_match is set, the request returns as soon as a resolver found
+    a node for each IRI, the other requests are not awaited. This is
+    meant for lookups of a single IRI."""
+    batches, stop = _plan_resolve_all(param, first_match)
+    calls = [
+        (resolver, lambda resolver=resolver, request=request: resolver.resolve(request))
+        for resolver, request in batches
+    ]
+    merged = _merge(_fan_out(calls, stop))
+    return ResolveResult(nodes={iri: merged[iri] for iri in param.iris if iri in merged})
+
+
+def _plan_resolve_all(param: ResolveParam, first_match: bool):
+    """Return the request per serving resolver and the stop condition
+    of resolve_all."""
+    batches = []
+    for resolver in get_resolvers(param.model_cls):
+        iris = [iri for iri in param.iris if resolver.serves_iri(iri, param.model_cls)]
+        if iris:
+            batches.append((resolver, ResolveParam(iris=iris, model_cls=param.model_cls)))
+    found: set[str] = set()
+
+    def all_found(result: ResolveResult) -> bool:
+        found.update(iri for iri, node in result.nodes.items() if node is not None)
+        return len(found) >= len(set(param.iris))
+
+    return batches, all_found if first_match else None
+
+
+async def aresolve_all(param: ResolveParam, first_match: bool = False) -> ResolveResult:
+    """Async variant of resolve_all."""
+    batches, stop = _plan_resolve_all(param, first_match)
+    calls = [
+        (resolver, lambda resolver=resolver, request=request: resolver.aresolve(request))
+        for resolver, request in batches
+    ]
+    merged = _merge(await _afan_out(calls, stop))
+    return ResolveResult(nodes={iri: merged[iri] for iri in param.iris if iri in merged})
+
+
+def query_all(param: QueryParam) -> ResolveResult:
+    """Run the query concurrently on all registered resolvers that serve
+    param.model_cls (see Resolver.serves_class) and merge the results,
+    deduplicated by IRI."""
+    calls = [(resolver, lambda resolver=resolver: resolver.query(param)) for resolver in get_resolvers(param.model_cls)]
+    return _canonical_result(_merge(_fan_out(calls)))
+
+
+async def aquery_all(param: QueryParam) -> ResolveResult:
+    """Async variant of query_all."""
+    calls = [
+        (resolver, lambda resolver=resolver: resolver.aquery(param)) for resolver in get_resolvers(param.model_cls)
+    ]
+    return _canonical_result(_merge(await _afan_out(calls)))
+
+
+def _canonical_result(nodes: dict) -> ResolveResult:
+    session = get_session()
+    if session is not None:
+        # query results share the canonical instance per IRI
+        nodes = {iri: session.canonical(iri, node) if node is not None else None for iri, node in nodes.items()}
+    return ResolveResult(nodes=nodes)
 
 
 class SetBackendParam(BaseModel):
@@ -154,6 +537,8 @@ class SetBackendParam(BaseModel):
 
 class GetBackendParam(BaseModel):
     iri: str
+    # the context of model_cls provides the CURIE prefixes for routing
+    model_cls: type[GenericLinkedBaseModel] | None = None
 
 
 class GetBackendResult(BaseModel):
@@ -172,41 +557,88 @@ class StoreResult(BaseModel):
 
 
 class Backend(Resolver):
-    def store(self, param: StoreParam) -> StoreResult:
-        jsonld_dicts = {}
-        for iri, node in param.nodes.items():
-            if node is None:
-                jsonld_dicts[iri] = None
-            else:
-                if self.format == LinkedDataFormat.JSON_LD:
-                    jsonld_dicts[iri] = node.to_jsonld()
-                elif self.format == LinkedDataFormat.JSON:
-                    jsonld_dicts[iri] = node.to_json()
+    def _export(self, param: StoreParam) -> dict[str, dict | None]:
+        """Register the nodes in the active identity map and return their
+        documents in the backend's format."""
+        session = get_session()
+        if session is not None:
+            # the stored nodes become the canonical instances
+            for iri, node in param.nodes.items():
+                if node is None:
+                    session.discard(iri)
                 else:
-                    raise ValueError(f"Unsupported format {self.format}")
+                    session.put(iri, node)
+        if self.format not in (LinkedDataFormat.JSON_LD, LinkedDataFormat.JSON):
+            raise ValueError(f"Unsupported format {self.format}")
+        jsonld_dicts = dict.fromkeys(param.nodes)
+        if self.format == LinkedDataFormat.JSON:
+            for iri, node in param.nodes.items():
+                if node is not None:
+                    jsonld_dicts[iri] = node.to_json()
+        else:
+            # export the nodes in batches per model base class
+            batches: dict = {}
+            for iri, node in param.nodes.items():
+                if node is not None:
+                    export_many = getattr(type(node), "to_jsonld_many", None)
+                    batches.setdefault(export_many, []).append(iri)
+            for export_many, iris in batches.items():
+                nodes = [param.nodes[iri] for iri in iris]
+                exported = export_many(nodes) if export_many is not None else [node.to_jsonld() for node in nodes]
+                jsonld_dicts.update(zip(iris, exported, strict=True))
+        return jsonld_dicts
+
+    def store(self, param: StoreParam) -> StoreResult:
+        jsonld_dicts = self._export(param)
         if self.format == LinkedDataFormat.JSON:
             return self.store_json_dicts(jsonld_dicts)
         else:
             return self.store_jsonld_dicts(jsonld_dicts)
 
+    async def astore(self, param: StoreParam) -> StoreResult:
+        """Async variant of store."""
+        jsonld_dicts = self._export(param)
+        if self.format == LinkedDataFormat.JSON:
+            return await self.astore_json_dicts(jsonld_dicts)
+        else:
+            return await self.astore_jsonld_dicts(jsonld_dicts)
+
     def store_jsonld_dicts(self, jsonld_dicts: dict[str, dict]) -> StoreResult:
-        raise NotImplementedError("store_jsonld_dicts method not implemented in Backend subclass")
+        if not _overrides(self, Backend, "astore_jsonld_dicts"):
+            raise NotImplementedError("store_jsonld_dicts method not implemented in Backend subclass")
+        return run_sync(self.astore_jsonld_dicts(jsonld_dicts))
+
+    async def astore_jsonld_dicts(self, jsonld_dicts: dict[str, dict]) -> StoreResult:
+        """Async variant of store_jsonld_dicts."""
+        return await asyncio.to_thread(self.store_jsonld_dicts, jsonld_dicts)
 
     def store_json_dicts(self, json_dicts: dict[str, dict]) -> StoreResult:
-        raise NotImplementedError("store_json_dicts method not implemented in Backend subclass")
+        if not _overrides(self, Backend, "astore_json_dicts"):
+            raise NotImplementedError("store_json_dicts method not implemented in Backend subclass")
+        return run_sync(self.astore_json_dicts(json_dicts))
+
+    async def astore_json_dicts(self, json_dicts: dict[str, dict]) -> StoreResult:
+        """Async variant of store_json_dicts."""
+        return await asyncio.to_thread(self.store_json_dicts, json_dicts)
 
 
 global _backends
 _backends = {}
+_backend_routes: RoutingTable[Backend] = RoutingTable()
 
 
 def set_backend(param: SetBackendParam) -> None:
+    """Register the backend (as resolver and for storing) for an IRI
+    prefix, see oold.backend.routing."""
     _resolvers[param.iri] = param.backend
     _backends[param.iri] = param.backend
+    _resolver_routes.register(param.iri, param.backend)
+    _backend_routes.register(param.iri, param.backend)
 
 
 def get_backend(param: GetBackendParam) -> GetBackendResult:
-    iri = param.iri.split(":")[0]
-    if iri not in _backends:
-        raise ValueError(f"No backends found for {iri}")
-    return GetBackendResult(backend=_backends[iri])
+    """Return the backend registered for the longest prefix of the IRI."""
+    backend = _backend_routes.lookup(param.iri, get_prefix_map(param.model_cls))
+    if backend is None:
+        raise ValueError(f"No backends found for {param.iri}")
+    return GetBackendResult(backend=backend)
@@ -0,0 +1,201 @@
+"""Routing of IRIs to resolvers and backends.
+
+Resolvers and backends are registered for an IRI prefix, which may be a
+CURIE prefix name (``"ex"``, routing ``ex:...``), a compact IRI prefix
+(``"ex:Item/"``) or an expanded IRI prefix (``"https://example.com/"``).
+An IRI is routed to the registration with the longest matching prefix.
+
+Compact IRIs are expanded and expanded IRIs are compacted with the CURIE
+prefixes of the model context (see oold.static.get_context_prefixes), so
+``ex:e1`` and ``https://example.com/e1`` reach the same resolver whichever
+form was used for the registration. Matches are compared by the length of
+their expanded prefix, e.g. ``"https://example.com/items/"`` wins over
+``"ex"`` for ``ex:items/1``.
+"""
+
+from collections.abc import Iterator, Mapping
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+# key of the value slot in a trie node, never a character of a key
+_VALUE = None
+
+
+class PrefixTrie(Generic[T]):
+    """Character trie mapping strings to values.
+
+    Lookups of all registered prefixes of a string take O(len(string)),
+    independent of the number of keys."""
+
+    def __init__(self):
+        self._root: dict = {}
+        self._size = 0
+
+    def _find(self, key: str) -> dict | None:
+        node = self._root
+        for c in key:
+            node = node.get(c)
+            if node is None:
+                return None
+        return node
+
+    def __setitem__(self, key: str, value: T) -> None:
+        node = self._root
+        for c in key:
+            node = node.setdefault(c, {})
+        if _VALUE not in node:
+            self._size += 1
+        node[_VALUE] = value
+
+    def __getitem__(self, key: str) -> T:
+        node = self._find(key)
+        if node is None or _VALUE not in node:
+            raise KeyError(key)
+        return node[_VALUE]
+
+    def __delitem__(self, key: str) -> None:
+        path = [self._root]
+        for c in key:
+            node = path[-1].get(c)
+            if node is None:
+                raise KeyError(key)
+            path.append(node)
+        if _VALUE not in path[-1]:
+            raise KeyError(key)
+        del path[-1][_VALUE]
+        self._size -= 1
+        # prune branches without values
+        for i in range(len(key), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][key[i - 1]]
+
+    def __contains__(self, key: str) -> bool:
+        node = self._find(key)
+        return node is not None and _VALUE in node
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, key: str, default: Any = None) -> T | Any:
+        node = self._find(key)
+        if node is None or _VALUE not in node:
+            return default
+        return node[_VALUE]
+
+    def items(self) -> Iterator[tuple[str, T]]:
+        stack = [("", self._root)]
+        while stack:
+            key, node = stack.pop()
+            for c, child in node.items():
+                if c is _VALUE:
+                    yield key, child
+                else:
+                    stack.append((key + c, child))
+
+    def prefixes(self, s: str) -> Iterator[tuple[str, T]]:
+        """Yield (key, value) of all keys that are a prefix of s,
+        shortest first."""
+        node = self._root
+        if _VALUE in node:
+            yield "", node[_VALUE]
+        for i, c in enumerate(s):
+            node = node.get(c)
+            if node is None:
+                return
+            if _VALUE in node:
+                yield s[: i + 1], node[_VALUE]
+
+    def longest_prefix(self, s: str) -> tuple[str, T] | None:
+        """Return (key, value) of the longest key that is a prefix of s
+        or None."""
+        longest = None
+        for match in self.prefixes(s):
+            longest = match
+        return longest
+
+
+class PrefixMap:
+    """CURIE prefixes (prefix name -> IRI) for the expansion and
+    compaction of IRIs without JSON-LD processing."""
+
+    def __init__(self, prefixes: Mapping[str, str]):
+        self.prefixes = dict(prefixes)
+        self._names: PrefixTrie[list[str]] = PrefixTrie()
+        for name, iri in self.prefixes.items():
+            names = self._names.get(iri)
+            if names is None:
+                self._names[iri] = names = []
+            names.append(name)
+
+    def expand(self, iri: str) -> str:
+        """Expand a compact IRI, other IRIs are returned unchanged."""
+        prefix, colon, suffix = iri.partition(":")
+        if not colon or suffix.startswith("//"):
+            return iri
+        prefix_iri = self.prefixes.get(prefix)
+        return iri if prefix_iri is None else prefix_iri + suffix
+
+    def compact(self, iri: str) -> list[str]:
+        """Return all compact forms of an expanded IRI, the one with the
+        longest prefix IRI first."""
+        forms = []
+        for prefix_iri, names in self._names.prefixes(iri):
+            forms[:0] = [name + ":" + iri[len(prefix_iri) :] for name in names]
+        return forms
+
+
+def iri_forms(iri: str, prefixes: PrefixMap | None = None) -> list[str]:
+    """Return iri as given followed by its expanded and compact forms."""
+    forms = [iri]
+    if prefixes is not None:
+        expanded = prefixes.expand(iri)
+        if expanded != iri:
+            forms.append(expanded)
+        forms.extend(form for form in prefixes.compact(expanded) if form != iri)
+    return forms
+
+
+def _route_key(prefix: str) -> str:
+    # a plain prefix name routes the compact IRIs using it
+    return prefix if ":" in prefix else prefix + ":"
+
+
+def matches_any_prefix(iri: str, routes: list[str], prefixes: PrefixMap | None = None) -> bool:
+    """Whether iri (in any of its forms) starts with one of the route
+    prefixes, given in the same notation as for RoutingTable.register."""
+    keys = tuple(_route_key(route) for route in routes)
+    return any(form.startswith(keys) for form in iri_forms(iri, prefixes))
+
+
+class RoutingTable(Generic[T]):
+    """Maps IRIs to the value (resolver or backend) registered for their
+    longest prefix, see the module documentation."""
+
+    def __init__(self):
+        self._trie: PrefixTrie[T] = PrefixTrie()
+
+    def register(self, prefix: str, value: T) -> None:
+        self._trie[_route_key(prefix)] = value
+
+    def unregister(self, prefix: str) -> None:
+        del self._trie[_route_key(prefix)]
+
+    def __len__(self) -> int:
+        return len(self._trie)
+
+    def lookup(self, iri: str, prefixes: PrefixMap | None = None) -> T | None:
+        """Return the value registered for the longest prefix of iri
+        (in compact or expanded form) or None."""
+        best = None
+        best_length = -1
+        for form in iri_forms(iri, prefixes):
+            match = self._trie.longest_prefix(form)
+            if match is None:
+                continue
+            key, value = match
+            length = len(prefixes.expand(key)) if prefixes is not None else len(key)
+            if length > best_length:
+                best, best_length = value, length
+        return best
@@ -0,0 +1,130 @@
+"""Identity map for resolved nodes.
+
+Within an active :class:`Session` every IRI is resolved to exactly one
+canonical model instance: repeated resolution of the same IRI (e.g. reached
+from two different parents, via ``Model["iri"]`` or via a query) returns the
+cached instance instead of parsing and validating the document again.
+
+Sessions are opt-in and scoped by a context variable::
+
+    with Session(max_size=10000, ttl=60) as session:
+        a = Entity["ex:a"]
+        b = Entity["ex:a"]
+        assert a is b
+        print(session.hits, session.misses)
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class Session:
+    """IRI -> instance cache with optional LRU and TTL eviction.
+
+    Parameters
+    ----------
+    max_size
+        Maximum number of cached instances. The least recently used
+        entry is evicted first. None means unbounded.
+    ttl
+        Time to live of an entry in seconds, counted from the time the
+        entry was stored. None means entries never expire.
+    """
+
+    def __init__(self, max_size: int | None = None, ttl: float | None = None):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be a positive integer or None")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._nodes: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._tokens: list[contextvars.Token] = []
+
+    def get(self, iri: str, model_cls: type | None = None) -> Any | None:
+        """Return the cached instance for iri or None.
+
+        Entries that are expired or not an instance of model_cls count
+        as a miss."""
+        with self._lock:
+            entry = self._nodes.get(iri)
+            if entry is not None:
+                node, stored_at = entry
+                if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                    del self._nodes[iri]
+                elif model_cls is None or isinstance(node, model_cls):
+                    self._nodes.move_to_end(iri)
+                    self.hits += 1
+                    return node
+            self.misses += 1
+            return None
+
+    def put(self, iri: str, node: Any) -> Any:
+        """Store node as the canonical instance for iri (replacing any
+        previous one) and return it."""
+        with self._lock:
+            self._nodes[iri] = (node, time.monotonic())
+            self._nodes.move_to_end(iri)
+            if self.max_size is not None:
+                while len(self._nodes) > self.max_size:
+                    self._nodes.popitem(last=False)
+        return node
+
+    def canonical(self, iri: str, node: Any) -> Any:
+        """Return the cached instance for iri if present (and of the
+        same class as node), otherwise register node as canonical."""
+        cached = self.get(iri, type(node))
+        if cached is not None:
+            return cached
+        return self.put(iri, node)
+
+    def discard(self, iri: str) -> None:
+        with self._lock:
+            self._nodes.pop(iri, None)
+
+    def clear(self) -> None:
+        """Drop all cached instances and reset the counters."""
+        with self._lock:
+            self._nodes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, iri: str) -> bool:
+        with self._lock:
+            entry = self._nodes.get(iri)
+            if entry is None:
+                return False
+            return self.ttl is None or time.monotonic() - entry[1] <= self.ttl
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __enter__(self) -> "Session":
+        self._tokens.append(_session.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _session.reset(self._tokens.pop())
+
+
+_session: contextvars.ContextVar[Session | None] = contextvars.ContextVar("oold_session", default=None)
+
+
+def get_session() -> Session | None:
+    """Return the session active in the current context, if any."""
+    return _session.get()
+
+
+def set_session(session: Session | None) -> contextvars.Token:
+    """Activate session in the current context without a with block.
+    Returns the token to restore the previous session via
+    ``reset_session``."""
+    return _session.set(session)
+
+
+def reset_session(token: contextvars.Token) -> None:
+    _session.reset(token)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 from pydantic import ConfigDict
@@ -7,6 +8,17 @@ from SPARQLWrapper import JSONLD, SPARQLWrapper
 from oold.backend.auth import UserPwdCredential, get_credential
 from oold.backend.interface import Backend, Resolver, StoreResult
 
+# prefixes declared in the queries
+_PREFIXES = {"ex": "https://example.com/"}
+
+
+def _expand(iri: str) -> str:
+    """Expand a compact IRI with the prefixes declared in the queries."""
+    prefix, sep, suffix = iri.partition(":")
+    if sep and prefix in _PREFIXES:
+        return _PREFIXES[prefix] + suffix
+    return iri
+
 
 class LocalSparqlResolver(Resolver):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -75,51 +87,79 @@ class SparqlResolver(Resolver):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     endpoint: str
+    # number of IRIs requested with a single query
+    batch_size: int = 50
+    # number of queries aresolve_iris sends to the endpoint at once
+    max_concurrency: int = 4
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         self._sparql = SPARQLWrapper(self.endpoint)
 
-    def resolve_iris(self, iris: list[str]) -> dict[str, dict]:
-        # sparql query to get a node by IRI with all its properties
-        # using CONSTRUCT to get the full node
-        # format the result as json-ld
-        jsonld_dicts = {}
-
+    def _set_credentials(self, sparql: SPARQLWrapper) -> None:
         # lookup  credential for the endpoint
         try:
             cred = get_credential(self.endpoint)
         except ValueError:
             cred = None
         if cred is not None and isinstance(cred, UserPwdCredential):
-            self._sparql.setCredentials(cred.username, cred.password.get_secret_value())
+            sparql.setCredentials(cred.username, cred.password.get_secret_value())
+
+    def _resolve_batch(self, sparql: SPARQLWrapper, iris: list[str]) -> dict[str, dict | None]:
+        # sparql query to get the nodes of the IRIs with all their
+        # properties in a single request, using CONSTRUCT to get the full
+        # nodes formatted as json-ld
+        values = " ".join(f"<{iri}>" if iri.startswith("http") else iri for iri in iris)
+        sparql.setQuery(
+            """
+            PREFIX ex: <https://example.com/>
+            CONSTRUCT {
+                ?s ?p ?o .
+            }
+            WHERE {
+                VALUES ?s { {{{values}}} }
+                ?s ?p ?o .
+            }
+            """.replace("{{{values}}}", values)
+        )
+        sparql.setReturnFormat(JSONLD)
+        result: Graph = sparql.query().convert()
+        nodes = {}
+        if len(result) > 0:
+            nodes = {node["@id"]: node for node in json.loads(result.serialize(format="json-ld"))}
+        # the nodes are returned with expanded IRIs
+        return {iri: nodes.get(_expand(iri)) for iri in iris}
+
+    def _batches(self, iris: list[str]) -> list[list[str]]:
+        return [iris[i : i + self.batch_size] for i in range(0, len(iris), self.batch_size)]
 
-        for iri in iris:
-            iri_filter = f"FILTER (?s = {iri})"
-            # check if the iri is a full IRI or a prefix
-            if iri.startswith("http"):
-                iri_filter = f"FILTER (?s = <{iri}>)"
-            self._sparql.setQuery(
-                """
-                PREFIX ex: <https://example.com/>
-                CONSTRUCT {
-                    ?s ?p ?o .
-                }
-                WHERE {
-                    ?s ?p ?o .
-                    {{{iri_filter}}}
-                }
-                """.replace("{{{iri_filter}}}", iri_filter)
-            )
-            self._sparql.setReturnFormat(JSONLD)
-            result: Graph = self._sparql.query().convert()
-            if len(result) == 0:
-                jsonld_dicts[iri] = None
-                continue
-            jsonld_dict = json.loads(result.serialize(format="json-ld"))[0]
-            jsonld_dicts[iri] = jsonld_dict
+    def resolve_iris(self, iris: list[str]) -> dict[str, dict]:
+        self._set_credentials(self._sparql)
+        jsonld_dicts = {}
+        for batch in self._batches(iris):
+            jsonld_dicts.update(self._resolve_batch(self._sparql, batch))
+        return jsonld_dicts
 
+    async def aresolve_iris(self, iris: list[str]) -> dict[str, dict]:
+        """Request the batches of IRIs concurrently, at most
+        max_concurrency at once. SPARQLWrapper is blocking and keeps the
+        query as state, so every request runs in a worker thread with its
+        own SPARQLWrapper."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        def resolve_batch(batch: list[str]) -> dict[str, dict | None]:
+            sparql = SPARQLWrapper(self.endpoint)
+            self._set_credentials(sparql)
+            return self._resolve_batch(sparql, batch)
+
+        async def request(batch: list[str]) -> dict[str, dict | None]:
+            async with semaphore:
+                return await asyncio.to_thread(resolve_batch, batch)
+
+        jsonld_dicts = {}
+        for nodes in await asyncio.gather(*(request(batch) for batch in self._batches(iris))):
+            jsonld_dicts.update(nodes)
         return jsonld_dicts
 
 
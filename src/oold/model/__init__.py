@@ -1,14 +1,22 @@
 import json
 import logging
+import types
+import weakref
+from array import array
+from collections import ChainMap, Counter
+from collections.abc import Mapping
 from typing import (
     TYPE_CHECKING,
+    Annotated,
     Any,
     Generic,
     Literal,
+    NamedTuple,
     Optional,
     TypeVar,
     Union,
     get_args,
+    get_origin,
     overload,
 )
 
@@ -16,30 +24,34 @@ import pydantic
 
 # monkey patching pydantic FieldInfo
 import pydantic.fields
-from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic import BaseModel, GetCoreSchemaHandler, PrivateAttr
 from pydantic.fields import FieldInfo
+from pydantic.v1 import BaseModel as BaseModel_v1
 from pydantic_core import PydanticUndefined, core_schema
 from typing_extensions import Self
 
 from oold.backend import interface
 from oold.backend.interface import (
+    ComparisonOperator,
     Condition,
     GetBackendParam,
-    GetResolverParam,
     Query,
     QueryParam,
     ResolveParam,
-    Resolver,
     StoreParam,
     apply_operator,
     get_backend,
-    get_resolver,
 )
 from oold.static import (
     GenericLinkedBaseModel,
+    document_loader,
     export_jsonld,
+    export_jsonld_many,
     import_json,
     import_jsonld,
+    import_jsonld_many,
+    invalidate_context_cache,
+    remove_none_inplace,
 )
 
 
@@ -112,14 +124,286 @@ M = TypeVar("M", bound="LinkedBaseModel")
 _logger = logging.getLogger(__name__)
 
 
+def _annotation_is_list(annotation) -> bool:
+    """Check if a field annotation describes a list,
+    e.g. List[Entity], Optional[List[Entity]] or Annotated[List[str], ...]"""
+    if annotation is list:
+        return True
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _annotation_is_list(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        return any(_annotation_is_list(arg) for arg in get_args(annotation) if arg is not type(None))
+    return isinstance(origin, type) and issubclass(origin, list)
+
+
+def _annotation_may_hold_dict(annotation) -> bool:
+    """Check if values of a field annotation may contain plain dicts
+    (outside of nested models), e.g. dict[str, Any], list[dict] or Any"""
+    if annotation is None or annotation is Any or annotation is object:
+        return True
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return False
+        return issubclass(annotation, Mapping)
+    origin = get_origin(annotation)
+    if isinstance(origin, type) and issubclass(origin, Mapping):
+        return True
+    return any(_annotation_may_hold_dict(arg) for arg in get_args(annotation) if not isinstance(arg, (str, int)))
+
+
+class FieldPlan(NamedTuple):
+    """Immutable per-class summary of the field metadata that
+    LinkedBaseModel needs on construction, assignment and serialization.
+    Compiled once per class so that instances don't have to
+    inspect json_schema_extra of every field again."""
+
+    range_fields: Mapping[str, bool]
+    """Names of the fields annotated with a 'range' (IRI reference fields),
+    mapped to whether the field annotation is a list."""
+    required_iri_fields: tuple[str, ...]
+    """Names of the fields annotated with 'x-oold-required-iri'."""
+    complete: bool
+    """False if the class still had unresolved forward references
+    when the plan was compiled."""
+    aliases: Mapping[str, str]
+    """Field names mapped to their serialization alias (if any)."""
+    none_default_fields: frozenset[str]
+    """Names of the range fields with default None."""
+    dict_fields: tuple[str, ...]
+    """Names of the fields whose values may contain plain dicts, from
+    which None values are removed on serialization with exclude_none."""
+
+    @classmethod
+    def compile(cls, model_cls) -> "FieldPlan":
+        range_fields = {}
+        required_iri_fields = []
+        aliases = {}
+        none_default_fields = set()
+        dict_fields = []
+        # pydantic v2
+        for name, field_info in model_cls.model_fields.items():
+            alias = field_info.serialization_alias or field_info.alias
+            if alias:
+                aliases[name] = alias
+            if _annotation_may_hold_dict(field_info.annotation):
+                dict_fields.append(name)
+            extra = field_info.json_schema_extra
+            if not isinstance(extra, dict):
+                continue
+            if "range" in extra:
+                range_fields[name] = _annotation_is_list(field_info.annotation)
+                if field_info.default is None:
+                    none_default_fields.add(name)
+            if "x-oold-required-iri" in extra:
+                required_iri_fields.append(name)
+        return cls(
+            range_fields=types.MappingProxyType(range_fields),
+            required_iri_fields=tuple(required_iri_fields),
+            complete=type.__getattribute__(model_cls, "__pydantic_complete__"),
+            aliases=types.MappingProxyType(aliases),
+            none_default_fields=frozenset(none_default_fields),
+            dict_fields=tuple(dict_fields),
+        )
+
+
+def _is_excluded(name: str, info: pydantic.SerializationInfo) -> bool:
+    """Check if the field name is excluded by the include / exclude
+    arguments of the current serialization."""
+    exclude = info.exclude
+    if (
+        exclude is not None
+        and name in exclude
+        and (not isinstance(exclude, dict) or exclude[name] is True or exclude[name] is ...)
+    ):
+        return True
+    include = info.include
+    return include is not None and name not in include
+
+
+def _get_field_plan(model_cls) -> FieldPlan:
+    """Return the field plan of a class. The plan is recompiled
+    once if the class was completed (e.g. by model_rebuild) after
+    the metaclass compiled the initial plan."""
+    plan: FieldPlan = type.__getattribute__(model_cls, "__oold_field_plan__")
+    if not plan.complete and type.__getattribute__(model_cls, "__pydantic_complete__"):
+        plan = FieldPlan.compile(model_cls)
+        type.__setattr__(model_cls, "__oold_field_plan__", plan)
+    return plan
+
+
+class CastPlan(NamedTuple):
+    """Per (source, target) class pair summary of how LinkedBaseModel.cast
+    can copy field values without revalidation."""
+
+    fields: tuple[str, ...]
+    """Target fields (except 'type') that are declared with the same
+    annotation in the source class, so their validated values can be
+    reused as they are."""
+    extra: tuple[str, ...]
+    """Source fields that the target class does not declare."""
+    ignores_extra: bool
+    """True if the target class ignores extra fields (pydantic default)."""
+    kwarg_fields: frozenset[str]
+    """Names that can be passed as keyword arguments to a trusted cast:
+    target fields except range fields (which need IRI handling)."""
+    trusted: bool
+    """False if the target requires validation anyway: a shared field
+    with a different annotation, a required field missing in the source
+    or validators on the target class."""
+
+    @classmethod
+    def compile(cls, source_cls, target_cls) -> "CastPlan":
+        source_fields = source_cls.model_fields
+        target_fields = target_cls.model_fields
+        decorators = target_cls.__pydantic_decorators__
+        trusted = not (
+            decorators.validators
+            or decorators.field_validators
+            or decorators.root_validators
+            or decorators.model_validators
+        )
+        fields = []
+        for name, field_info in target_fields.items():
+            if name == "type":
+                continue  # the target class sets its own type
+            source_field = source_fields.get(name)
+            if source_field is None:
+                trusted = trusted and not field_info.is_required()
+            elif source_field.annotation == field_info.annotation:
+                fields.append(name)
+            else:
+                trusted = False
+        return cls(
+            fields=tuple(fields),
+            extra=tuple(name for name in source_fields if name not in target_fields),
+            ignores_extra=target_cls.model_config.get("extra") in (None, "ignore"),
+            kwarg_fields=frozenset(
+                {"type", "__iris__"}
+                | {name for name in target_fields if name not in _get_field_plan(target_cls).range_fields}
+            ),
+            trusted=trusted,
+        )
+
+
+_cast_plans: "weakref.WeakKeyDictionary[type, weakref.WeakKeyDictionary[type, CastPlan]]" = weakref.WeakKeyDictionary()
+
+
+def _get_cast_plan(source_cls, target_cls) -> CastPlan | None:
+    """Return the cached cast plan of the class pair or None if one of
+    the classes is not a (complete) pydantic v2 LinkedBaseModel."""
+    plans = _cast_plans.get(source_cls)
+    if plans is not None:
+        plan = plans.get(target_cls)
+        if plan is not None:
+            return plan
+    if not (
+        isinstance(target_cls, LinkedBaseModelMetaClass)
+        and type.__getattribute__(source_cls, "__pydantic_complete__")
+        and type.__getattribute__(target_cls, "__pydantic_complete__")
+    ):
+        return None
+    plan = CastPlan.compile(source_cls, target_cls)
+    _cast_plans.setdefault(source_cls, weakref.WeakKeyDictionary())[target_cls] = plan
+    return plan
+
+
+def _is_none_or_empty(value) -> bool:
+    """Check if a value is dropped by cast(none_to_default=True)"""
+    return value is None or (isinstance(value, list) and all(item is None for item in value))
+
+
+def _raw_value(value):
+    """Convert a field value for _raw_dict: models to dicts (keeping
+    IRI references of LinkedBaseModels), other values as they are."""
+    if isinstance(value, LinkedBaseModel):
+        return value._raw_dict()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_raw_value(item) for item in value]
+    if isinstance(value, BaseModel_v1):
+        return value._raw_dict() if hasattr(value, "_raw_dict") else value.dict()
+    return value
+
+
+def _is_unresolved(value) -> bool:
+    """Check if the value of a range field still needs to be resolved from its IRI(s)"""
+    return value is None or (isinstance(value, list) and len(value) == 0)
+
+
+class RangeFieldDescriptor:
+    """Data descriptor installed on the class for every range (IRI reference) field.
+    Resolves unresolved IRIs lazily on first access and wraps list values
+    in a LinkedBaseModelList that is synced with __iris__.
+    All other fields and methods are accessed without any Python-level hook."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        name = self.name
+        if obj is None:
+            if LinkedBaseModelMetaClass._constructing:
+                # hide the descriptor from pydantic's field collection,
+                # see LinkedBaseModelMetaClass._constructing
+                raise AttributeError(name)
+            return FieldProxy(owner.model_fields[name].default, name, owner)
+
+        values = obj.__dict__
+        if name not in values:
+            raise AttributeError(name)
+        value = values[name]
+        iris = obj.__iris__
+        ref = iris.get(name)
+        # async? https://stackoverflow.com/questions/33128325/
+        # how-to-set-class-attribute-with-await-in-init
+        if ref and _is_unresolved(value):
+            node_dict = obj._resolve(ref if isinstance(ref, list) else [ref], type(obj))
+            obj._set_resolved(name, ref, node_dict)
+            value = values[name]
+
+        if isinstance(value, list) and name in iris:
+            # reuse the synced list wrapper as long as neither the field value
+            # nor its IRI list were replaced, see LinkedBaseModel.__setattr__
+            private = obj.__pydantic_private__
+            synced_lists = private["_synced_lists"]
+            if synced_lists is None:
+                synced_lists = private["_synced_lists"] = {}
+            cached = synced_lists.get(name)
+            if cached is not None and cached[0] is value and cached[1] is iris[name]:
+                return cached[2]
+            wrapper = LinkedBaseModelList[owner](value, _synced_iri_list=iris[name])
+            synced_lists[name] = (value, iris[name], wrapper)
+            return wrapper
+        return value
+
+    def __set__(self, obj, value):
+        # regular assignments are routed through pydantic's __setattr__,
+        # which writes the instance __dict__ directly
+        obj.__dict__[self.name] = value
+
+
+class _ModelFieldsProperty:
+    """Exposes model_fields on the class and on instances.
+    Pydantic >= 2.11 emits a deprecation warning on instance access,
+    which would fire for every ``self.model_fields`` in generated code."""
+
+    def __get__(self, obj, owner=None):
+        return getattr(owner, "__pydantic_fields__", {})
+
+
 # pydantic v2
 class LinkedBaseModelMetaClass(pydantic.main._model_construction.ModelMetaclass):
     _constructing: bool = False
-    """Guards against __getattribute__ intercepting field access during class
-    construction. Pydantic checks ``getattr(base, field_name, None)`` in its
+    """Guards RangeFieldDescriptor.__get__ while pydantic collects the fields
+    of a new class. Pydantic checks ``getattr(base, field_name, None)`` in its
     metaclass __new__ to detect shadowed BaseModel attributes. Without this
-    flag our __getattribute__ override would return a truthy FieldInfo instead
-    of the default None, causing false-positive field-name collision errors."""
+    flag the descriptors installed on the bases would return a truthy
+    FieldProxy instead of the default None, causing false-positive
+    field-name collision errors."""
 
     def __new__(mcs, name, bases, namespace, **kwargs):
         LinkedBaseModelMetaClass._constructing = True
@@ -128,11 +412,18 @@ class LinkedBaseModelMetaClass(pydantic.main._model_construction.ModelMetaclass)
         finally:
             LinkedBaseModelMetaClass._constructing = False
 
+        plan = FieldPlan.compile(cls)
+        cls.__oold_field_plan__ = plan
+        # lazy IRI resolution for range fields, see RangeFieldDescriptor
+        for field_name in plan.range_fields:
+            setattr(cls, field_name, RangeFieldDescriptor(field_name))
+
         # Register type IRI mapping. Controllers go to _controller_types
         # (they extend data models but should not replace them in
-        # the type lookup table).
+        # the type lookup table). Union classes of controllers with several
+        # data model bases (see BaseController) are not registered at all.
         _is_ctrl = any(b.__module__ == "oold.model" and b.__name__ == "BaseController" for b in cls.__mro__)
-        if hasattr(cls, "get_cls_iri"):
+        if hasattr(cls, "get_cls_iri") and not namespace.get("__oold_union__"):
             iri = cls.get_cls_iri()
             if iri is not None:
                 iris = iri if isinstance(iri, list) else [iri]
@@ -142,6 +433,10 @@ class LinkedBaseModelMetaClass(pydantic.main._model_construction.ModelMetaclass)
                         registry.setdefault(i, []).append(cls)
                     else:
                         registry[i] = cls
+                if not _is_ctrl:
+                    document_loader.register(cls)
+                # the new class may complete forward refs of known classes
+                invalidate_context_cache()
         return cls
 
     # override operators, see https://docs.python.org/3/library/operator.html
@@ -212,24 +507,32 @@ T = TypeVar("T")
 
 class LinkedBaseModelList(Generic[T], list[T | None]):
     """Extension of list that tracks changes to the list.
-    by syncing every modification with the __iri__ field of the parent model."""
+    by syncing every modification with the __iri__ field of the parent model.
+
+    Lookups by IRI use a lazily built IRI -> position index. Equality
+    queries on fields declared with create_index() use lazily built
+    value -> positions indexes. Both are updated by append() and extend()
+    and rebuilt on the next lookup after any other modification."""
+
+    _iri_index: dict[str, int] | None = None
+    _indexed_fields: tuple[str, ...] = ()
+    _value_indexes: dict[str, dict[Any, list[int]] | None] | None = None
 
     def __init__(self, *args: T | None, _synced_iri_list: list[str] | None = None):
         super().__init__(*args)
-        self._synced_iri_list = _synced_iri_list  # if _synced_iri_list is not None else []
-        # self._synced_iri_list.extend(
-        #     item.get_iri() for item in self if item is not None
-        # )
+        self._synced_iri_list = _synced_iri_list
         # initialize the synced_iri_list with the IRIs of the initial items in the list
         if self._synced_iri_list is not None:
             self._synced_list = args[0]
-            self._synced_iri_list.extend(
-                item.get_iri() for item in self if item is not None and item.get_iri() not in self._synced_iri_list
-            )
-
-    # def _set_synced_iri_list(self, iri_list: List[str]) -> None:
-    #     """Set the list of IRIs that are synced with the linked data store."""
-    #     self._synced_iri_list = iri_list
+            # multiset of the synced IRIs for O(1) membership tests
+            self._synced_iri_index = Counter(self._synced_iri_list)
+            for item in self:
+                if item is None:
+                    continue
+                iri = item.get_iri()
+                if iri not in self._synced_iri_index:
+                    self._synced_iri_list.append(iri)
+                    self._synced_iri_index[iri] += 1
 
     @classmethod
     def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
@@ -242,29 +545,336 @@ class LinkedBaseModelList(Generic[T], list[T | None]):
         non_instance_schema = core_schema.no_info_after_validator_function(LinkedBaseModelList, sequence_t_schema)
         return core_schema.union_schema([instance_schema, non_instance_schema])
 
+    def _sync_add(self, iri: str) -> None:
+        self._synced_iri_list.append(iri)
+        self._synced_iri_index[iri] += 1
+
+    def _sync_remove(self, iri: str) -> None:
+        self._synced_iri_list.remove(iri)
+        self._synced_iri_index[iri] -= 1
+        if self._synced_iri_index[iri] <= 0:
+            del self._synced_iri_index[iri]
+
     def append(self, item: T | None) -> None:
         if self._synced_iri_list is not None:
-            self._synced_iri_list.append(item.get_iri())
+            self._sync_add(item.get_iri())
             self._synced_list.append(item)
         super().append(item)
+        self._index_items(len(self) - 1)
 
     def remove(self, item: T | None) -> None:
         if self._synced_iri_list is not None:
-            self._synced_iri_list.remove(item.get_iri())
+            self._sync_remove(item.get_iri())
             self._synced_list.remove(item)
         super().remove(item)
+        self._invalidate_indexes()
 
     def extend(self, iterable):
+        start = len(self)
         if self._synced_iri_list is not None:
-            self._synced_iri_list.extend(item.get_iri() for item in iterable if item is not None)
+            iterable = list(iterable)  # may be consumed twice
+            for item in iterable:
+                if item is not None:
+                    self._sync_add(item.get_iri())
             self._synced_list.extend(iterable)
-        return super().extend(iterable)
+        super().extend(iterable)
+        self._index_items(start)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def _sync_replace(self, removed, added) -> None:
+        """Sync a positional modification: update the IRIs of the removed
+        and added items and mirror the new order to the synced list."""
+        for item in removed:
+            if item is not None:
+                self._sync_remove(item.get_iri())
+        for item in added:
+            if item is not None:
+                self._sync_add(item.get_iri())
+        self._synced_list[:] = self
+        # keep the IRIs in the order of the items, unless there are
+        # IRIs without item (unresolvable or duplicates)
+        iris = [item.get_iri() for item in self if item is not None]
+        if len(iris) == len(self._synced_iri_list):
+            self._synced_iri_list[:] = iris
+
+    # modifications that shift positions invalidate the indexes
+
+    def insert(self, index, item: T | None) -> None:
+        super().insert(index, item)
+        if self._synced_iri_list is not None:
+            self._sync_replace((), (item,))
+        self._invalidate_indexes()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        if self._synced_iri_list is not None:
+            self._sync_replace((item,), ())
+        self._invalidate_indexes()
+        return item
+
+    def clear(self) -> None:
+        removed = list(self)
+        super().clear()
+        if self._synced_iri_list is not None:
+            self._sync_replace(removed, ())
+        self._invalidate_indexes()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        if self._synced_iri_list is not None:
+            self._sync_replace((), ())
+        self._invalidate_indexes()
+
+    def reverse(self) -> None:
+        super().reverse()
+        if self._synced_iri_list is not None:
+            self._sync_replace((), ())
+        self._invalidate_indexes()
+
+    def __setitem__(self, index, value) -> None:
+        if self._synced_iri_list is not None:
+            removed = list.__getitem__(self, index)
+            removed = removed if isinstance(index, slice) else (removed,)
+            value = list(value) if isinstance(index, slice) else value  # may be consumed twice
+            super().__setitem__(index, value)
+            self._sync_replace(removed, value if isinstance(index, slice) else (value,))
+        else:
+            super().__setitem__(index, value)
+        self._invalidate_indexes()
+
+    def __delitem__(self, index) -> None:
+        removed = list.__getitem__(self, index)
+        super().__delitem__(index)
+        if self._synced_iri_list is not None:
+            self._sync_replace(removed if isinstance(index, slice) else (removed,), ())
+        self._invalidate_indexes()
+
+    def __imul__(self, n):
+        added = list(self) * (n - 1) if n > 1 else ()
+        removed = list(self) if n < 1 else ()
+        result = super().__imul__(n)
+        if self._synced_iri_list is not None:
+            self._sync_replace(removed, added)
+        self._invalidate_indexes()
+        return result
+
+    def create_index(self, *fields: str) -> None:
+        """Declare fields for which a value index should be used
+        to evaluate equality queries, e.g. l[Entity.name == 'John'].
+        The index is built on the first query. Note: items modified
+        in place after the index was built are not re-indexed."""
+        self._indexed_fields = (*self._indexed_fields, *(f for f in fields if f not in self._indexed_fields))
+        if self._value_indexes is None:
+            self._value_indexes = {}
+        for field in fields:
+            self._value_indexes.setdefault(field, None)
+
+    def _invalidate_indexes(self) -> None:
+        self._iri_index = None
+        if self._value_indexes:
+            self._value_indexes = dict.fromkeys(self._value_indexes)
+
+    def _index_items(self, start: int) -> None:
+        """Add the items from position start on to the already built indexes."""
+        iri_index = self._iri_index
+        value_indexes = self._value_indexes
+        if iri_index is None and not value_indexes:
+            return
+        for pos in range(start, len(self)):
+            item = list.__getitem__(self, pos)
+            if item is None:
+                continue
+            if iri_index is not None:
+                iri_index.setdefault(item.get_iri(), pos)
+            if value_indexes:
+                for field, index in value_indexes.items():
+                    if index is not None and not self._add_to_value_index(index, item, field, pos):
+                        value_indexes[field] = None
+
+    @staticmethod
+    def _add_to_value_index(index: dict, item, field: str, pos: int) -> bool:
+        value = getattr(item, field, None)
+        try:
+            index.setdefault(value, []).append(pos)
+        except TypeError:  # unhashable value
+            return False
+        return True
+
+    def _get_iri_index(self) -> dict[str, int]:
+        if self._iri_index is None:
+            iri_index = {}
+            for pos, item in enumerate(list.__iter__(self)):
+                if item is not None:
+                    iri_index.setdefault(item.get_iri(), pos)
+            self._iri_index = iri_index
+        return self._iri_index
+
+    def _get_value_index(self, field: str) -> dict[Any, list[int]] | None:
+        """Return the value index of a field declared with create_index()
+        or None if the field is not indexed or holds unhashable values."""
+        if not self._value_indexes or field not in self._value_indexes:
+            return None
+        index = self._value_indexes[field]
+        if index is None:
+            index = {}
+            for pos, item in enumerate(list.__iter__(self)):
+                if item is not None and not self._add_to_value_index(index, item, field, pos):
+                    self._indexed_fields = tuple(f for f in self._indexed_fields if f != field)
+                    del self._value_indexes[field]
+                    return None
+            self._value_indexes[field] = index
+        return index
+
+    def _select(self, query: Query | Condition, candidates: list[int] | None = None) -> list[int]:
+        """Return the sorted positions of the items matching the query.
+        If candidates is given, only these positions are tested."""
+        if isinstance(query, Condition):
+            key = query.field
+            op = query.operator
+            value = query.value
+            index = self._get_value_index(key) if op == ComparisonOperator.EQ else None
+            if index is not None:
+                try:
+                    matches = index.get(value, [])
+                except TypeError:  # unhashable query value
+                    matches = None
+                if matches is not None:
+                    if candidates is None:
+                        return list(matches)
+                    match_set = set(matches)
+                    return [pos for pos in candidates if pos in match_set]
+            if candidates is None:
+                candidates = range(len(self))
+            return [
+                pos
+                for pos in candidates
+                if (item := list.__getitem__(self, pos)) and apply_operator(op, getattr(item, key, None), value)
+            ]
+        elif isinstance(query, Query):
+            if query.operator == "and":
+                # evaluate an indexed condition first
+                # and test the other operand only on its matches
+                op1, op2 = query.op1, query.op2
+                if self._is_indexed(op2) and not self._is_indexed(op1):
+                    op1, op2 = op2, op1
+                matches = self._select(op1, candidates)
+                return self._select(op2, matches) if matches else matches
+            elif query.operator == "or":
+                return sorted(set(self._select(query.op1, candidates)) | set(self._select(query.op2, candidates)))
+            else:
+                raise NotImplementedError(f"Operator {query.operator} not implemented")
+        else:
+            raise TypeError("Invalid query type")
+
+    def _is_indexed(self, query: Query | Condition) -> bool:
+        return (
+            isinstance(query, Condition)
+            and query.operator == ComparisonOperator.EQ
+            and query.field in self._indexed_fields
+        )
+
+    def has_iri(self, iri: str) -> bool:
+        """Check if an IRI is part of the synced IRI list in O(1)."""
+        if self._synced_iri_list is None:
+            return any(item is not None and item.get_iri() == iri for item in self)
+        return iri in self._synced_iri_index
 
     def get_item_type(self):
         # Returns the actual type argument, e.g. Entity
-        if hasattr(self, "__orig_class__"):
-            return get_args(self.__orig_class__)[0]
-        return None
+        # __orig_class__ is set by typing after __init__, so the result
+        # is cached on the first call
+        values = self.__dict__
+        item_type = values.get("_item_type")
+        if item_type is None:
+            orig_class = values.get("__orig_class__")
+            if orig_class is None:
+                return None
+            item_type = values["_item_type"] = get_args(orig_class)[0]
+        return item_type
+
+    def _iter_column(self, name: str, resolve: bool):
+        is_iri_column = {}  # per item class
+        for item in list.__iter__(self):
+            if item is None:
+                yield None
+            elif resolve:
+                yield getattr(item, name, None)
+            else:
+                item_cls = type(item)
+                is_iri = is_iri_column.get(item_cls)
+                if is_iri is None:
+                    is_iri = is_iri_column[item_cls] = (
+                        issubclass(item_cls, LinkedBaseModel) and name in _get_field_plan(item_cls).range_fields
+                    )
+                if is_iri:
+                    # IRI column, return the references without resolving them
+                    yield item.get_iri_ref(name)
+                else:
+                    yield item.__dict__.get(name)
+
+    def column(self, name: str, resolve: bool = False, use_numpy: bool | None = None):
+        """Return the values of a field of all items as a column.
+
+        Parameters
+        ----------
+        name
+            The name of the field.
+        resolve
+            If False (default), range fields return the IRI reference(s)
+            of each item instead of triggering their resolution.
+        use_numpy
+            Return numeric columns as numpy arrays. Defaults to True
+            if numpy is installed.
+
+        Returns
+        -------
+            For int, float or bool columns without missing values a numpy
+            array or an array.array, otherwise a list with None for
+            missing values. Int columns with values beyond 64 bits and
+            mixed columns with values beyond the float range are
+            returned as a list as well.
+        """
+        values = list(self._iter_column(name, resolve))
+        value_types = {type(v) for v in values}
+        typecode = None
+        if value_types == {bool}:
+            typecode = "b"
+        elif value_types == {int}:
+            if min(values) >= -(2**63) and max(values) < 2**63:
+                typecode = "q"
+        elif value_types and value_types <= {int, float}:
+            typecode = "d"
+        if typecode is None:
+            return values
+
+        try:
+            if use_numpy is not False:
+                try:
+                    import numpy  # ty: ignore[unresolved-import]  # optional dependency
+                except ImportError:
+                    if use_numpy:
+                        raise
+                else:
+                    dtype = {"b": numpy.bool_, "q": numpy.int64, "d": numpy.float64}[typecode]
+                    return numpy.fromiter(values, dtype=dtype, count=len(values))
+            return array(typecode, values)
+        except OverflowError:  # ints too large for a float
+            return values
+
+    def to_columns(
+        self, names: list[str] | None = None, resolve: bool = False, use_numpy: bool | None = None
+    ) -> dict[str, Any]:
+        """Return a dict of columns, see column().
+        Defaults to all fields of the item type."""
+        if names is None:
+            item_type = self.get_item_type()
+            if item_type is None:
+                raise ValueError("No field names given and the item type is unknown")
+            names = list(item_type.model_fields)
+        return {name: self.column(name, resolve=resolve, use_numpy=use_numpy) for name in names}
 
     # override [] operator to also support string indices
 
@@ -287,52 +897,41 @@ class LinkedBaseModelList(Generic[T], list[T | None]):
                 # query, e.g. "@name=='John'"
                 key = index[1:].split("==")[0].strip()
                 value = index.split("==")[1].strip("'\"")
-                return LinkedBaseModelList[self.get_item_type()](
-                    [item for item in self if item and getattr(item, key, None) == value],
-                    _synced_iri_list=self._synced_iri_list,
-                )
+                index = Condition(field=key, operator=ComparisonOperator.EQ, value=value)
 
             else:
                 # IRI lookup
-                for item in self:
-                    if item and item.get_iri() == index:
-                        return item
-                raise KeyError(f"No item with IRI {index} found")
-        elif isinstance(index, Condition):
-            key = index.field
-            op = index.operator
-            value = index.value
+                pos = self._get_iri_index().get(index)
+                if pos is None:
+                    raise KeyError(f"No item with IRI {index} found")
+                return list.__getitem__(self, pos)
+        if isinstance(index, (Condition, Query)):
             return LinkedBaseModelList[self.get_item_type()](
-                [item for item in self if item and apply_operator(op, getattr(item, key, None), value)],
+                [list.__getitem__(self, pos) for pos in self._select(index)],
                 _synced_iri_list=self._synced_iri_list,
             )
-        elif isinstance(index, Query):
-            raise NotImplementedError("Query-based indexing not implemented yet")
         else:
             return super().__getitem__(index)
 
-    def __getattribute__(self, name):
-        # if name == "links":
-        #    print(typing.get_args(self))
-        if name != "__orig_class__" and self is not None and hasattr(self, "__orig_class__"):
-            _type = get_args(self.__orig_class__)[0]
-            if name in _type.model_fields:
-                # print(f"Attribute {name} is in type {_type}")
-                # build a new LinkedBaseModelList with all
-                # the values of this attribute
-                # if attribute is List
-                result_list = LinkedBaseModelList[_type]([], _synced_iri_list=None)
-                for item in self:
-                    if item is not None and hasattr(item, name):
-                        value = getattr(item, name)
-                        if isinstance(value, list):
-                            result_list.extend(value)
-                        else:
-                            result_list.append(value)
-                return result_list
-
-        # else:
-        return super().__getattribute__(name)
+    def __getattr__(self, name):
+        # only called if regular lookup fails, so list methods
+        # and instance attributes don't pay for this
+        if name.startswith("__"):
+            raise AttributeError(name)
+        _type = self.get_item_type()
+        if _type is not None and name in _type.model_fields:
+            # build a new LinkedBaseModelList with all
+            # the values of this attribute
+            result_list = LinkedBaseModelList[_type]([], _synced_iri_list=None)
+            for item in list.__iter__(self):
+                if item is not None and hasattr(item, name):
+                    value = getattr(item, name)
+                    if isinstance(value, list):
+                        result_list.extend(value)
+                    else:
+                        result_list.append(value)
+            return result_list
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
 
 # the following switch ensures that autocomplete works in IDEs like VSCode
@@ -354,6 +953,24 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
     """LinkedBaseModel for pydantic v2"""
 
     __iris__: dict[str, str | list[str]] | None = {}
+    # synced list wrappers of the range fields, see RangeFieldDescriptor.
+    # Not carried into copies and pickles, which get their own wrappers.
+    _synced_lists: dict[str, tuple] | None = PrivateAttr(None)
+
+    def __copy__(self):
+        copied = super().__copy__()
+        copied.__pydantic_private__["_synced_lists"] = None
+        return copied
+
+    def __deepcopy__(self, memo=None):
+        copied = super().__deepcopy__(memo)
+        copied.__pydantic_private__["_synced_lists"] = None
+        return copied
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {**state["__pydantic_private__"], "_synced_lists": None}
+        return state
 
     @classmethod
     def get_cls_iri(cls) -> str | list[str] | None:
@@ -413,9 +1030,9 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
             The validated model instance.
         """
         if isinstance(obj, str):
-            return cls._resolve([obj])[obj]
+            return cls._resolve([obj], cls)[obj]
         if isinstance(obj, list):
-            node_dict = cls._resolve(obj)
+            node_dict = cls._resolve(obj, cls)
             node_list = []
             for iri in obj:
                 node = node_dict[iri]
@@ -438,192 +1055,107 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         if "__iris__" not in kw:
             kw["__iris__"] = {}
 
-        for name in list(kw):  # force copy of keys for inline-delete
-            if name == "__iris__":
-                continue
-            if name not in self.model_fields:
-                continue
-            # rewrite <attr> to <attr>_iri
-            # pprint(self.__fields__)
-            extra = None
-            # pydantic v1
-            # if name in self.__fields__:
-            #     if hasattr(self.__fields__[name].default, "json_schema_extra"):
-            #         extra = self.__fields__[name].default.json_schema_extra
-            #     elif hasattr(self.__fields__[name].field_info, "extra"):
-            #         extra = self.__fields__[name].field_info.extra
-            # pydantic v2
-            extra = self.model_fields[name].json_schema_extra
-
-            if extra and "range" in extra:
+        plan = _get_field_plan(type(self))
+        range_fields = plan.range_fields
+        iris = kw["__iris__"]
+
+        if range_fields:
+            for name in list(kw):  # force copy of keys for inline-delete
+                if name not in range_fields:
+                    continue
+                # rewrite <attr> to <attr>_iri
                 arg_is_list = isinstance(kw[name], list)
 
-                # annotation_is_list = False
-                # args = self.model_fields[name].annotation.__args__
-                # if hasattr(args[0], "_name"):
-                #    is_list = args[0]._name == "List"
                 if arg_is_list:
-                    kw["__iris__"][name] = []
-                    for e in kw[name][:]:  # interate over copy of list
+                    iris[name] = []
+                    has_str = False
+                    for e in kw[name]:
                         if isinstance(e, BaseModel):  # contructed with object ref
-                            kw["__iris__"][name].append(e.get_iri())
+                            iris[name].append(e.get_iri())
                         elif isinstance(e, str):  # constructed from json
-                            kw["__iris__"][name].append(e)
-                            kw[name].remove(e)  # remove to construct valid instance
+                            iris[name].append(e)
+                            has_str = True
+                    if has_str:
+                        # remove to construct valid instance,
+                        # without modifying the list of the caller
+                        kw[name] = [e for e in kw[name] if not isinstance(e, str)]
                     if len(kw[name]) == 0:
-                        # pydantic v1
-                        # kw[name] = None # else pydantic v1 will set a FieldInfo object
                         # pydantic v2
                         kw[name] = None  # else default value may be set
                 else:
                     if isinstance(kw[name], BaseModel):  # contructed with object ref
-                        # print(kw[name].id)
-                        kw["__iris__"][name] = kw[name].get_iri()
+                        iris[name] = kw[name].get_iri()
                     elif isinstance(kw[name], str):  # constructed from json
-                        kw["__iris__"][name] = kw[name]
-                        # pydantic v1
-                        # kw[name] = None # else pydantic v1 will set a FieldInfo object
+                        iris[name] = kw[name]
                         # pydantic v2
                         kw[name] = None  # else default value may be set
 
         BaseModel.__init__(self, *a, **kw)
-        # handle default values
-        for name in list(self.__dict__.keys()):
-            if self.__dict__[name] is None:
-                continue
-            extra = None
-            # pydantic v1
-            # if name in self.__fields__:
-            #     if hasattr(self.__fields__[name].default, "json_schema_extra"):
-            #         extra = self.__fields__[name].default.json_schema_extra
-            #     elif hasattr(self.__fields__[name].field_info, "extra"):
-            #         extra = self.__fields__[name].field_info.extra
-            # pydantic v2
-            extra = self.model_fields[name].json_schema_extra
-
-            if extra and "range" in extra:
-                arg_is_list = isinstance(self.__dict__, list)
 
-                if arg_is_list:
-                    kw["__iris__"][name] = []
-                    for e in self.__dict__[name]:
-                        if isinstance(e, BaseModel):  # contructed with object ref
-                            kw["__iris__"][name].append(e.get_iri())
-                else:
-                    if isinstance(self.__dict__[name], BaseModel):  # contructed with object ref
-                        kw["__iris__"][name] = self.__dict__[name].get_iri()
+        # handle default values
+        if range_fields:
+            values = self.__dict__
+            for name in range_fields:
+                value = values.get(name)
+                if value is None or name in iris:
+                    continue
+                if isinstance(value, list):
+                    iris[name] = [e.get_iri() for e in value if isinstance(e, BaseModel)]
+                elif isinstance(value, BaseModel):  # contructed with object ref
+                    iris[name] = value.get_iri()
 
-        self.__iris__ = kw["__iris__"]
+        self.__iris__ = iris
 
-        # iterate over all fields
         # if x-oold-required-iri occurs in extra and the field is not set in __iri__
         # throw an error
-        for name in self.model_fields:
-            extra = None
-            # pydantic v1
-            # if name in self.__fields__:
-            #     if hasattr(self.__fields__[name].default, "json_schema_extra"):
-            #         extra = self.__fields__[name].default.json_schema_extra
-            #     elif hasattr(self.__fields__[name].field_info, "extra"):
-            #         extra = self.__fields__[name].field_info.extra
-            # pydantic v2
-            extra = self.model_fields[name].json_schema_extra
-
-            if extra and "x-oold-required-iri" in extra and name not in self.__iris__:
+        for name in plan.required_iri_fields:
+            if name not in iris:
                 raise ValueError(f"{name} is required but not set")
 
     def _handle_value(self, name, value):
-        extra = None
-        # pydantic v1
-        # if name in self.__fields__:
-        #     if hasattr(self.__fields__[name].default, "json_schema_extra"):
-        #         extra = self.__fields__[name].default.json_schema_extra
-        #     elif hasattr(self.__fields__[name].field_info, "extra"):
-        #         extra = self.__fields__[name].field_info.extra
-        # pydantic v2
-        extra = self.model_fields[name].json_schema_extra
-
-        if extra and "range" in extra:
-            arg_is_list = isinstance(value, list)
-
-            if arg_is_list:
-                self.__iris__[name] = []
-                for e in value[:]:  # interate over copy of list
-                    if isinstance(e, BaseModel):  # contructed with object ref
-                        self.__iris__[name].append(e.get_iri())
-                    elif isinstance(e, str):  # constructed from json
-                        self.__iris__[name].append(e)
-                        value.remove(e)  # remove to construct valid instance
-                if len(value) == 0:
-                    # pydantic v1
-                    value = None  # else pydantic v1 will set a FieldInfo object
-                    # pydantic v2
-                    # del kw[name]
-            else:
-                if isinstance(value, BaseModel):  # contructed with object ref
-                    # print(value.id)
-                    self.__iris__[name] = value.get_iri()
-                elif isinstance(value, str):  # constructed from json
-                    self.__iris__[name] = value
-                    # pydantic v1
-                    value = None  # else pydantic v1 will set a FieldInfo object
-                    # pydantic v2
-                    # del kw[name]
-                elif value is None:
-                    del self.__iris__[name]
+        if name not in _get_field_plan(type(self)).range_fields:
+            return value
+
+        arg_is_list = isinstance(value, list)
+
+        if arg_is_list:
+            self.__iris__[name] = []
+            has_str = False
+            for e in value:
+                if isinstance(e, BaseModel):  # contructed with object ref
+                    self.__iris__[name].append(e.get_iri())
+                elif isinstance(e, str):  # constructed from json
+                    self.__iris__[name].append(e)
+                    has_str = True
+            if has_str:
+                # remove to construct valid instance,
+                # without modifying the list of the caller
+                value = [e for e in value if not isinstance(e, str)]
+            if len(value) == 0:
+                value = None
+        else:
+            if isinstance(value, BaseModel):  # contructed with object ref
+                self.__iris__[name] = value.get_iri()
+            elif isinstance(value, str):  # constructed from json
+                self.__iris__[name] = value
+                value = None
+            elif value is None:
+                self.__iris__.pop(name, None)
         return value
 
     def __setattr__(self, name, value, internal=False):
-        # print("__setattr__", name, value)
-        # Only apply range handling for declared model fields
-        if not internal and name in self.model_fields:
-            value = self._handle_value(name, value)
+        # Only apply range handling for declared range fields
+        if name in _get_field_plan(type(self)).range_fields:
+            if not internal:
+                value = self._handle_value(name, value)
+            # drop the cached list wrapper, see RangeFieldDescriptor
+            private = self.__pydantic_private__
+            synced_lists = private and private.get("_synced_lists")
+            if synced_lists:
+                synced_lists.pop(name, None)
 
         return super().__setattr__(name, value)
 
-    def __getattribute__(self, name):
-        # print("__getattribute__ ", name)
-        # async? https://stackoverflow.com/questions/33128325/
-        # how-to-set-class-attribute-with-await-in-init
-
-        if name in ["__dict__", "__pydantic_private__", "__iris__"]:
-            return BaseModel.__getattribute__(self, name)  # prevent loop
-
-        if name == "model_fields":
-            return type(self).model_fields
-
-        else:
-            if (
-                hasattr(self, "__iris__")
-                and name in self.__iris__
-                and len(self.__iris__[name]) > 0
-                and (
-                    self.__dict__[name] is None
-                    or (isinstance(self.__dict__[name], list) and len(self.__dict__[name]) == 0)
-                )
-            ):
-                iris = self.__iris__[name]
-                is_list = isinstance(iris, list)
-                if not is_list:
-                    iris = [iris]
-
-                node_dict = self._resolve(iris)
-                if is_list:
-                    node_list = []
-                    for iri in iris:
-                        node = node_dict[iri]
-                        node_list.append(node)
-                    self.__setattr__(name, node_list, True)
-                else:
-                    node = node_dict[iris[0]]
-                    if node:
-                        self.__setattr__(name, node, True)
-
-        result = BaseModel.__getattribute__(self, name)
-        if isinstance(result, list) and name in self.__iris__:
-            result = LinkedBaseModelList[type(self)](result, _synced_iri_list=self.__iris__[name])
-        return result
-
     def _raw_dict(self):
         """Serialize to dict without _object_to_iri at any level.
 
@@ -631,65 +1163,71 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         IRI-only fields (value=None, IRI in __iris__) are included as
         IRI strings. Inline objects are recursively serialized as dicts.
         """
+        values = self.__dict__
+        iris = values.get("__iris__") or {}
         d = {}
-        fields = self.model_fields if hasattr(self, "model_fields") else getattr(self, "__fields__", {})
-        for name in fields:
-            val = self.__dict__.get(name)
+        for name in type(self).__pydantic_fields__:
+            val = values.get(name)
             if val is None:
-                iri = self.__iris__.get(name) if hasattr(self, "__iris__") else None
-                d[name] = iri if iri else None
-            elif isinstance(val, list):
-                items = []
-                for item in val:
-                    if hasattr(item, "_raw_dict"):
-                        items.append(item._raw_dict())
-                    elif hasattr(item, "model_dump"):
-                        items.append(item.model_dump())
-                    elif hasattr(item, "dict"):
-                        items.append(item.dict())
-                    else:
-                        items.append(item)
-                d[name] = items
-            elif hasattr(val, "_raw_dict"):
-                d[name] = val._raw_dict()
-            elif hasattr(val, "model_dump"):
-                d[name] = val.model_dump()
-            elif hasattr(val, "dict"):
-                d[name] = val.dict()
+                d[name] = iris.get(name) or None
             else:
-                d[name] = val
+                d[name] = _raw_value(val)
         return d
 
-    def model_dump(self, **kwargs):  # extent BaseClass export function
-        # print("dict")
-        remove_none = kwargs.get("exclude_none", False)
-        kwargs["exclude_none"] = False
-        d = super().model_dump(**kwargs)
-        # pprint(d)
-        self._object_to_iri(d)
-        self._recursive_object_to_iri(d, self)
-        if remove_none:
-            d = self.remove_none(d)
-        # pprint(d)
-        return d
+    @pydantic.model_serializer(mode="wrap")
+    def _serialize_iris(self, handler: pydantic.SerializerFunctionWrapHandler, info: pydantic.SerializationInfo):
+        """Serialize range fields as their IRI(s) from __iris__.
 
-    @staticmethod
-    @staticmethod
-    def _recursive_object_to_iri(d: dict, model_obj):
-        """Recursively apply __iris__ replacement for nested model objects."""
-        fields = model_obj.model_fields if hasattr(model_obj, "model_fields") else getattr(model_obj, "__fields__", {})
-        for name, value in list(d.items()):
-            if name not in fields:
-                continue
-            model_value = model_obj.__dict__.get(name)
-            if isinstance(value, list) and isinstance(model_value, list):
-                for item, model_item in zip(value, model_value, strict=False):
-                    if isinstance(item, dict) and hasattr(model_item, "__iris__"):
-                        model_item._object_to_iri(item)
-                        LinkedBaseModel._recursive_object_to_iri(item, model_item)
-            elif isinstance(value, dict) and hasattr(model_value, "__iris__"):
-                model_value._object_to_iri(value)
-                LinkedBaseModel._recursive_object_to_iri(value, model_value)
+        Runs as part of pydantic's serialization (for nested models as
+        well), so model_dump and model_dump_json need no post-processing
+        of the output."""
+        data = handler(self)
+        if not isinstance(data, dict):
+            return data
+        plan = _get_field_plan(type(self))
+        by_alias = info.by_alias
+        aliases = plan.aliases if by_alias else {}
+        if info.exclude_none:
+            # match remove_none() for plain dicts, pydantic only drops
+            # None values of fields
+            for name in plan.dict_fields:
+                key = aliases.get(name, name)
+                value = data.get(key)
+                if isinstance(value, (dict, list)):
+                    remove_none_inplace(value)
+        iris = self.__dict__.get("__iris__")
+        if not iris:
+            return data
+        missing = None
+        for name, iri in iris.items():
+            key = aliases.get(name, name)
+            if key in data:
+                data[key] = iri
+            elif (
+                info.exclude_none
+                and self.__dict__.get(name) is None
+                and not (info.exclude_defaults and name in plan.none_default_fields)
+                and not (info.exclude_unset and name not in self.__pydantic_fields_set__)
+                and not _is_excluded(name, info)
+            ):
+                # the value is None because only the IRI is known
+                if missing is None:
+                    missing = {}
+                missing[key] = iri
+        if missing:
+            # keep the field order
+            ordered = {}
+            for name in type(self).__pydantic_fields__:
+                key = aliases.get(name, name)
+                if key in data:
+                    ordered[key] = data[key]
+                elif key in missing:
+                    ordered[key] = missing[key]
+            if len(ordered) < len(data) + len(missing):
+                for key, value in data.items():  # extra fields
+                    ordered.setdefault(key, value)
+            data = ordered
+        return data
 
     def get_iri_ref(self, field_name: str):
         """Return the stored IRI reference string(s) for a field without
@@ -733,41 +1271,69 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         return self.__dict__.get(field_name)
 
     @staticmethod
-    def _resolve(iris):
-        resolver = get_resolver(GetResolverParam(iri=iris[0])).resolver
-        node_dict = resolver.resolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel)).nodes
-        return node_dict
+    def _resolve(iris, context_cls=None):
+        # one concurrent request per resolver, the context of context_cls
+        # provides the CURIE prefixes for routing
+        return interface.resolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel), context_cls).nodes
+
+    @staticmethod
+    async def _aresolve(iris, context_cls=None):
+        """Async variant of _resolve."""
+        return (await interface.aresolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel), context_cls)).nodes
+
+    def _set_resolved(self, name: str, ref: str | list[str], node_dict: dict[str, Any]):
+        """Assign the resolved node(s) of the IRI reference(s) ref to
+        the range field name, keeping __iris__ as it is."""
+        if isinstance(ref, list):
+            self.__setattr__(name, [node_dict.get(iri) for iri in ref], True)
+        else:
+            node = node_dict.get(ref)
+            if node:
+                self.__setattr__(name, node, True)
 
     def _store(self):
-        backend = get_backend(GetBackendParam(iri=self.get_iri())).backend
+        backend = get_backend(GetBackendParam(iri=self.get_iri(), model_cls=type(self))).backend
         backend.store(StoreParam(nodes={self.get_iri(): self}))
 
     def store_jsonld(self):
         """Store the model instance in a backend matching its IRI."""
         self._store()
 
+    async def _astore(self):
+        backend = get_backend(GetBackendParam(iri=self.get_iri(), model_cls=type(self))).backend
+        await backend.astore(StoreParam(nodes={self.get_iri(): self}))
+
+    async def astore_jsonld(self):
+        """Async variant of store_jsonld."""
+        await self._astore()
+
     @classmethod
     def _oold_query(cls, query: str | list[str] | Query | Condition) -> "LinkedBaseModelList[Self]":
-        # get all resolvers
-        # ToDo: filter resolvers that support this class
-        resolvers: list[Resolver] = interface._resolvers.values()
-        node_list = []
-        for r in resolvers:
-            try:
-                if isinstance(query, (str, list)):
-                    _node_list = r.resolve(
-                        ResolveParam(
-                            iris=[query] if isinstance(query, str) else query,
-                            model_cls=cls,
-                        )
-                    ).nodes.values()
-                else:
-                    _node_list = r.query(QueryParam(query=query, model_cls=cls)).nodes.values()
-                node_list.extend(_node_list)
-            except NotImplementedError:
-                # resolver does not support query
-                continue
+        # all resolvers that may hold instances of this class are
+        # requested concurrently, see interface.resolve_all
+        if isinstance(query, (str, list)):
+            iris = [query] if isinstance(query, str) else query
+            nodes = interface.resolve_all(
+                ResolveParam(iris=iris, model_cls=cls), first_match=isinstance(query, str)
+            ).nodes
+        else:
+            nodes = interface.query_all(QueryParam(query=query, model_cls=cls)).nodes
+        return cls._query_result(query, nodes)
+
+    @classmethod
+    async def _aoold_query(cls, query: str | list[str] | Query | Condition) -> "LinkedBaseModelList[Self]":
+        if isinstance(query, (str, list)):
+            iris = [query] if isinstance(query, str) else query
+            result = await interface.aresolve_all(
+                ResolveParam(iris=iris, model_cls=cls), first_match=isinstance(query, str)
+            )
+        else:
+            result = await interface.aquery_all(QueryParam(query=query, model_cls=cls))
+        return cls._query_result(query, result.nodes)
 
+    @classmethod
+    def _query_result(cls, query: str | list[str] | Query | Condition, nodes: dict):
+        node_list = list(nodes.values())
         if isinstance(query, str):
             return node_list[0] if len(node_list) > 0 else None
         else:
@@ -806,6 +1372,13 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         #         )
         #     )
 
+    @classmethod
+    async def aoold_query(
+        cls, item: str | list[str] | Query | bool
+    ) -> Union[Self, "LinkedBaseModelList[Self]", Optional["LinkedBaseModelList[Self]"]]:
+        """Async variant of oold_query, e.g. ``await Entity.aoold_query("ex:e1")``."""
+        return await cls._aoold_query(item)
+
     # pydantic v2
     def model_dump_json(
         self,
@@ -850,29 +1423,23 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         Returns:
             A JSON string representation of the model.
         """
-        d = json.loads(
-            BaseModel.model_dump_json(
-                self,
-                indent=indent,
-                include=include,
-                exclude=exclude,
-                context=context,
-                by_alias=by_alias,
-                exclude_unset=exclude_unset,
-                exclude_defaults=exclude_defaults,
-                exclude_none=False,  # handle None values separately
-                round_trip=round_trip,
-                warnings=warnings,
-                serialize_as_any=serialize_as_any,
-            )
-        )  # ToDo directly use dict?
-        # this may replace some None values with IRIs in case they were never resolved
-        # thats why we handle exclude_none there
-        self._object_to_iri(d)
-        self._recursive_object_to_iri(d, self)
-        if exclude_none:
-            d = self.remove_none(d)
-        return json.dumps(d, **dumps_kwargs)
+        kwargs = {
+            "include": include,
+            "exclude": exclude,
+            "context": context,
+            "by_alias": by_alias,
+            "exclude_unset": exclude_unset,
+            "exclude_defaults": exclude_defaults,
+            "exclude_none": exclude_none,
+            "round_trip": round_trip,
+            "warnings": warnings,
+            "serialize_as_any": serialize_as_any,
+        }
+        if dumps_kwargs:
+            # json.dumps options are not supported by pydantic's serializer
+            return json.dumps(self.model_dump(mode="json", **kwargs), indent=indent, **dumps_kwargs)
+        # range fields are serialized as IRIs by _serialize_iris
+        return super().model_dump_json(indent=indent, **kwargs)
 
     def cast(
         self,
@@ -880,6 +1447,7 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         none_to_default=False,
         remove_extra=False,
         silent=True,
+        trusted=False,
         **kwargs,
     ):
         """Cast this instance to a different model class.
@@ -895,9 +1463,24 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
             If True, drop fields not defined on the target class.
         silent
             If True, suppress warnings about dropped fields.
+        trusted
+            If True, field values (including nested instances) that are
+            declared with the same type in both classes are reused
+            without dumping and revalidating them. Falls back to a
+            validated cast if the classes are not compatible. Note that
+            nested instances are then shared with this instance.
         kwargs
             Additional fields to set on the new instance.
         """
+        if trusted:
+            plan = _get_cast_plan(type(self), cls)
+            if (
+                plan is not None
+                and plan.trusted
+                and (remove_extra or plan.ignores_extra or not plan.extra)
+                and all(k in plan.kwarg_fields for k in kwargs)
+            ):
+                return self._cast_trusted(cls, plan, none_to_default, remove_extra, silent, kwargs)
         # Use _raw_dict to preserve inline objects at all depths.
         raw = self._raw_dict()
         data = {**raw, **kwargs}
@@ -905,7 +1488,7 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         if none_to_default:
             reduced = {}
             for k, v in data.items():
-                if v is None or (isinstance(v, list) and (len(v) == 0 or all(item is None for item in v))):
+                if _is_none_or_empty(v):
                     none_args.append(k)
                 else:
                     reduced[k] = v
@@ -936,6 +1519,57 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
             data["__iris__"] = iris
         return cls(**data)
 
+    def _cast_trusted(self, cls, plan: CastPlan, none_to_default: bool, remove_extra: bool, silent: bool, kwargs: dict):
+        """Construct the cast instance from the validated values of this
+        instance, validating only kwargs, see cast(trusted=True)."""
+        values = self.__dict__
+        iris = dict(values.get("__iris__") or {})
+        iris.update(kwargs.pop("__iris__", None) or {})
+        kwargs.pop("type", None)
+        none_args = []
+        data = {}
+        for name in plan.fields:
+            if name not in values:
+                continue
+            value = values[name]
+            if none_to_default and name not in iris and _is_none_or_empty(value):
+                none_args.append(name)
+                continue
+            # copy containers, but share the validated items
+            data[name] = list(value) if isinstance(value, list) else value
+        if none_to_default:
+            for k in [k for k, v in kwargs.items() if _is_none_or_empty(v)]:
+                del kwargs[k]
+                data.pop(k, None)
+                none_args.append(k)
+        if not silent:
+            if none_args:
+                _logger.warning("Removed None/empty attributes: %s", none_args)
+            if remove_extra and plan.extra:
+                _logger.warning("Removed extra attributes: %s", list(plan.extra))
+
+        result = cls.model_construct(_fields_set={*data, *kwargs}, **data)
+        validator = cls.__pydantic_validator__
+        for name, value in kwargs.items():
+            validator.validate_assignment(result, name, value)
+
+        # as in __init__: register IRIs of default values, check required IRIs
+        target_plan = _get_field_plan(cls)
+        result_values = result.__dict__
+        for name in target_plan.range_fields:
+            value = result_values.get(name)
+            if value is None or name in iris:
+                continue
+            if isinstance(value, list):
+                iris[name] = [e.get_iri() for e in value if isinstance(e, BaseModel)]
+            elif isinstance(value, BaseModel):
+                iris[name] = value.get_iri()
+        result.__iris__ = iris
+        for name in target_plan.required_iri_fields:
+            if name not in iris:
+                raise ValueError(f"{name} is required but not set")
+        return result
+
     def cast_none_to_default(self, cls, **kwargs):
         """Cast to target class, dropping None/empty list attributes."""
         return self.cast(cls, none_to_default=True, **kwargs)
@@ -949,6 +1583,18 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
         """Constructs a model instance from a JSON-LD representation."""
         return import_jsonld(BaseModel, LinkedBaseModel, cls, jsonld, _types)
 
+    @staticmethod
+    def to_jsonld_many(instances: list["LinkedBaseModel"]) -> list[dict]:
+        """Return the JSON-LD representations of many model instances.
+        Contexts are built once per class."""
+        return export_jsonld_many(instances, BaseModel, LinkedBaseModel)
+
+    @classmethod
+    def from_jsonld_many(cls, jsonld_dicts: list[dict]) -> list["LinkedBaseModel"]:
+        """Constructs model instances from many JSON-LD representations
+        (in the same order). Contexts are built once per class."""
+        return import_jsonld_many(BaseModel, LinkedBaseModel, cls, jsonld_dicts, _types)
+
     def to_json(self, exclude_defaults: bool = False) -> dict:
         """Return the JSON representation of the object.
 
@@ -959,17 +1605,16 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
             output. Useful for compact storage where defaults can be
             re-populated on deserialization via from_json().
         """
-        result = json.loads(
-            self.model_dump_json(
-                exclude_none=True,
-                exclude_defaults=exclude_defaults,
-            )
-        )
+        return self._to_json(exclude_defaults=exclude_defaults)
+
+    def _to_json(self, include: set[str] | frozenset[str] | None = None, exclude_defaults: bool = False) -> dict:
+        """to_json() restricted to the fields in include (if given)."""
+        result = self.model_dump(mode="json", include=include, exclude_none=True, exclude_defaults=exclude_defaults)
         # Re-inject IRI-only fields from __iris__ that were excluded
         # because their model value is None (the IRI lives in __iris__)
         if hasattr(self, "__iris__"):
             for field_name, iri in self.__iris__.items():
-                if iri is None:
+                if iri is None or (include is not None and field_name not in include):
                     continue
                 existing = result.get(field_name)
                 if existing is None or existing == [] or existing == {}:
@@ -992,15 +1637,195 @@ class LinkedBaseModel(BaseModel, GenericLinkedBaseModel, metaclass=LinkedBaseMod
     #     return cls.export_schema(cls)
 
 
+# pydantic v2
+# not declared in the class body, since pydantic rejects
+# non-annotated attributes of unknown types
+LinkedBaseModel.model_fields = _ModelFieldsProperty()
+
+
+def prefetch(
+    objs: LinkedBaseModel | list[LinkedBaseModel],
+    paths: list[str] | None = None,
+    depth: int = 1,
+) -> dict[str, LinkedBaseModel | None]:
+    """Resolve the IRI references of the given objects breadth-first.
+
+    All unresolved IRIs of a level are collected, deduplicated and fetched
+    with one request per resolver. The resolved nodes are assigned to their
+    fields, so a later attribute access does not hit the backend again.
+
+    Parameters
+    ----------
+    objs
+        The object or list of objects to start from.
+    paths
+        Dotted field paths to follow, e.g. ["links", "links.links"].
+        If None, all range fields are followed.
+    depth
+        The number of levels to follow if no paths are given.
+
+    Returns
+    -------
+        All nodes fetched from the resolvers by their IRI.
+    """
+    if isinstance(objs, LinkedBaseModel):
+        objs = [objs]
+
+    # a level entry is (object, fields to follow from this object)
+    # where the fields are given as a tree {field: subtree} of the paths
+    # or as the number of remaining levels if all range fields are followed
+    if paths is None:
+        root = depth
+
+        def expand(obj, tree):
+            return [(name, tree - 1) for name in _get_field_plan(type(obj)).range_fields]
+
+    else:
+        root = {}
+        for path in paths:
+            node = root
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+
+        def expand(obj, tree):
+            return tree.items()
+
+    resolved: dict[str, LinkedBaseModel | None] = {}
+    frontier = [(obj, root) for obj in objs if obj is not None and root]
+    while frontier:
+        seen = set()
+        pending = []  # (object, field, IRI reference(s), subtree)
+        # ordered sets of IRIs to fetch on this level per owning class,
+        # whose context provides the CURIE prefixes for routing
+        requested: dict[type, dict[str, None]] = {}
+        next_frontier = []
+        for obj, tree in frontier:
+            key = (id(obj), tree if isinstance(tree, int) else id(tree))
+            if key in seen:
+                continue
+            seen.add(key)
+            values = obj.__dict__
+            iris = obj.__iris__
+            for name, subtree in expand(obj, tree):
+                ref = iris.get(name)
+                value = values.get(name)
+                if ref and _is_unresolved(value):
+                    pending.append((obj, name, ref, subtree))
+                    for iri in ref if isinstance(ref, list) else [ref]:
+                        if iri not in resolved:
+                            requested.setdefault(type(obj), {})[iri] = None
+                elif subtree and value is not None:
+                    for child in value if isinstance(value, list) else [value]:
+                        if isinstance(child, LinkedBaseModel):
+                            next_frontier.append((child, subtree))
+
+        # the same IRI may route differently for different classes, so
+        # the nodes of an object are looked up in its class' result first
+        fetched = {cls: LinkedBaseModel._resolve(list(iris), cls) for cls, iris in requested.items()}
+        for nodes in fetched.values():
+            resolved.update(nodes)
+        for obj, name, ref, subtree in pending:
+            nodes = ChainMap(fetched.get(type(obj), {}), resolved)
+            obj._set_resolved(name, ref, nodes)
+            if subtree:
+                for iri in ref if isinstance(ref, list) else [ref]:
+                    child = nodes.get(iri)
+                    if child is not None:
+                        next_frontier.append((child, subtree))
+        frontier = next_frontier
+    return resolved
+
+
+class ControllerPlan(NamedTuple):
+    """Per controller class summary of its pure data model, computed
+    once per class, see BaseController."""
+
+    data_model_cls: type | None
+    """The data model class, a union class if there are several
+    data model bases, None if there is none."""
+    model_bases: tuple[type, ...]
+    """The pure data model base classes."""
+    type_array: tuple[str, ...] | None
+    """Merged type defaults of the data model bases, if there are
+    several of them."""
+    model_fields: frozenset[str]
+    """Names of the fields serialized by to_json(): the fields of the
+    data model and 'type'."""
+
+    @classmethod
+    def compile(cls, controller_cls) -> "ControllerPlan":
+        def _is_data_model(base):
+            return (
+                base is not controller_cls
+                and base.__name__
+                not in (
+                    "LinkedBaseModel",
+                    "_LinkedBaseModel",
+                    "BaseController",
+                    "GenericLinkedBaseModel",
+                    "BaseModel",
+                    "Representation",
+                )
+                and hasattr(base, "to_json")
+                and hasattr(base, "from_json")
+                and not issubclass(base, BaseController)
+            )
+
+        model_bases = []
+        for base in controller_cls.__mro__:
+            if _is_data_model(base) and not any(issubclass(m, base) for m in model_bases):
+                model_bases.append(base)
+        if len(model_bases) == 0:
+            return cls(None, (), None, frozenset())
+        if len(model_bases) == 1:
+            data_model_cls = model_bases[0]
+        else:
+            name = "_".join(b.__name__ for b in model_bases)
+            data_model_cls = type(name, tuple(model_bases), {"__oold_union__": True})
+            data_model_cls._union_bases = model_bases
+
+        type_array = None
+        if len(model_bases) > 1:
+            merged = []
+            for base in model_bases:
+                fields = base.model_fields if hasattr(base, "model_fields") else getattr(base, "__fields__", {})
+                field = fields.get("type")
+                default = getattr(field, "default", None) if field else None
+                if isinstance(default, list):
+                    for t in default:
+                        if t not in merged:
+                            merged.append(t)
+                elif isinstance(default, str) and default not in merged:
+                    merged.append(default)
+            type_array = tuple(merged) if merged else None
+
+        fields = (
+            data_model_cls.model_fields
+            if hasattr(data_model_cls, "model_fields")
+            else getattr(data_model_cls, "__fields__", {})
+        )
+        return cls(data_model_cls, tuple(model_bases), type_array, frozenset({*fields, "type"}))
+
+
+def _get_controller_plan(controller_cls) -> ControllerPlan:
+    """Return the controller plan of a class, compiled on first use."""
+    plan = controller_cls.__dict__.get("__oold_controller_plan__")
+    if plan is None:
+        plan = ControllerPlan.compile(controller_cls)
+        type.__setattr__(controller_cls, "__oold_controller_plan__", plan)
+    return plan
+
+
 class BaseController:
     """Base mixin for controllers that extend LinkedBaseModel data classes.
 
-    Overrides to_json() and to_jsonld() to serialize only the pure data
-    model fields, stripping controller-only fields (e.g. archive_database,
-    auto_archive, connection state).
+    Overrides to_json() to serialize only the pure data model fields,
+    stripping controller-only fields (e.g. archive_database,
+    auto_archive, connection state). to_jsonld() builds on to_json().
 
     The data model class is auto-detected from the MRO: the first
     LinkedBaseModel subclass that is not also a BaseController subclass.
+    It is detected once per controller class, see ControllerPlan.
 
     Controllers are excluded from oold's type IRI registry (_types) so
     they don't replace their pure data model counterparts during
@@ -1024,118 +1849,32 @@ class BaseController:
                 object.__setattr__(self, name, value)
 
     def _get_data_model_cls(self):
-        """Auto-detect the pure data model class from the MRO.
+        """Return the pure data model class of this controller.
 
         Finds all direct LinkedBaseModel bases that are not controllers.
-        If there are multiple, creates a dynamic union class combining
-        them (e.g. Controller(ModelA, ModelB) -> _ModelA_ModelB).
+        If there are multiple, a union class combining them is created
+        (e.g. Controller(ModelA, ModelB) -> _ModelA_ModelB).
         """
-
-        def _is_data_model(cls):
-            return (
-                cls is not type(self)
-                and cls.__name__
-                not in (
-                    "LinkedBaseModel",
-                    "_LinkedBaseModel",
-                    "BaseController",
-                    "GenericLinkedBaseModel",
-                    "BaseModel",
-                    "Representation",
-                )
-                and hasattr(cls, "to_json")
-                and hasattr(cls, "from_json")
-                and not issubclass(cls, BaseController)
-            )
-
-        model_bases = []
-        for cls in type(self).__mro__:
-            if _is_data_model(cls) and not any(issubclass(m, cls) for m in model_bases):
-                model_bases.append(cls)
-        if len(model_bases) == 0:
-            return None
-        if len(model_bases) == 1:
-            return model_bases[0]
-        name = "_".join(b.__name__ for b in model_bases)
-        union_cls = type(name, tuple(model_bases), {})
-        union_cls._union_bases = model_bases
-        return union_cls
+        return _get_controller_plan(type(self)).data_model_cls
 
     def _get_model_bases(self):
         """Return the list of pure data model base classes."""
-        model_cls = self._get_data_model_cls()
-        if model_cls is None:
-            return []
-        if hasattr(model_cls, "_union_bases"):
-            return model_cls._union_bases
-        return [model_cls]
+        return list(_get_controller_plan(type(self)).model_bases)
 
     def _collect_type_array(self):
         """Collect merged type array from all pure data model bases."""
-        bases = self._get_model_bases()
-        if len(bases) <= 1:
-            return None
-        merged = []
-        for base in bases:
-            field = None
-            if hasattr(base, "model_fields"):
-                field = base.model_fields.get("type")
-            elif hasattr(base, "__fields__"):
-                field = base.__fields__.get("type")
-            default = getattr(field, "default", None) if field else None
-            if isinstance(default, list):
-                for t in default:
-                    if t not in merged:
-                        merged.append(t)
-            elif isinstance(default, str) and default not in merged:
-                merged.append(default)
-        return merged if merged else None
+        type_array = _get_controller_plan(type(self)).type_array
+        return list(type_array) if type_array is not None else None
 
     def to_json(self, **kwargs):
-        # Serialize with LinkedBaseModel.to_json (includes __iris__),
-        # then strip controller-only fields
-        model_cls = self._get_data_model_cls()
-        if model_cls is not None:
-            # Use _raw_dict to avoid serialization errors from
-            # non-serializable controller fields (e.g. _driver).
-            # This bypasses BaseModel.json() which would fail on
-            # controller-added fields before we can strip them.
-            data = self._raw_dict()
-            model_fields = set(
-                model_cls.model_fields.keys()
-                if hasattr(model_cls, "model_fields")
-                else getattr(model_cls, "__fields__", {}).keys()
-            )
-            for key in list(data.keys()):
-                if key not in model_fields and key not in ("type", "@context"):
-                    del data[key]
-            merged_types = self._collect_type_array()
-            if merged_types:
-                data["type"] = merged_types
-            # Remove None values (match exclude_none behavior)
-            data = {k: v for k, v in data.items() if v is not None}
-            return data
-        return super().to_json(**kwargs)
-
-    def to_jsonld(self):
-        data = super().to_jsonld()
-        model_cls = self._get_data_model_cls()
-        if model_cls is not None:
-            merged_types = self._collect_type_array()
-            if merged_types:
-                data["type"] = merged_types
-            model_fields = set(
-                model_cls.model_fields.keys()
-                if hasattr(model_cls, "model_fields")
-                else getattr(model_cls, "__fields__", {}).keys()
-            )
-            for key in list(data.keys()):
-                if key not in model_fields and key not in (
-                    "type",
-                    "@type",
-                    "@context",
-                    "@id",
-                    "id",
-                ):
-                    del data[key]
+        # Serialize the data model fields with _raw_dict (includes
+        # __iris__, range fields holding objects are kept inline) and
+        # strip controller-only fields. _raw_dict avoids serialization
+        # errors from non-serializable controller fields (e.g. _driver).
+        plan = _get_controller_plan(type(self))
+        if plan.data_model_cls is None:
+            return super().to_json(**kwargs)
+        data = {k: v for k, v in self._raw_dict().items() if k in plan.model_fields and v is not None}
+        if plan.type_array:
+            data["type"] = list(plan.type_array)
         return data
@@ -20,21 +20,23 @@ from oold.backend import interface
 from oold.backend.interface import (
     Condition,
     GetBackendParam,
-    GetResolverParam,
     Query,
     QueryParam,
     ResolveParam,
-    Resolver,
     StoreParam,
     apply_operator,
     get_backend,
-    get_resolver,
 )
 from oold.static import (
     GenericLinkedBaseModel,
+    document_loader,
     export_jsonld,
+    export_jsonld_many,
     import_json,
     import_jsonld,
+    import_jsonld_many,
+    object_to_iri_many,
+    remove_none_inplace,
 )
 
 if TYPE_CHECKING:
@@ -134,7 +136,7 @@ class LinkedBaseModelMetaClass(pydantic.v1.main.ModelMetaclass):
 
         # Register type IRI mapping. Controllers go to _controller_types.
         _is_ctrl = any(b.__module__ == "oold.model" and b.__name__ == "BaseController" for b in cls.__mro__)
-        if hasattr(cls, "get_cls_iri"):
+        if hasattr(cls, "get_cls_iri") and not namespace.get("__oold_union__"):
             iri = cls.get_cls_iri()
             if iri is not None:
                 iris = iri if isinstance(iri, list) else [iri]
@@ -144,6 +146,8 @@ class LinkedBaseModelMetaClass(pydantic.v1.main.ModelMetaclass):
                         registry.setdefault(i, []).append(cls)
                     else:
                         registry[i] = cls
+                if not _is_ctrl:
+                    document_loader.register(cls)
         return cls
 
     # override operators, see https://docs.python.org/3/library/operator.html
@@ -342,11 +346,11 @@ class LinkedBaseModel(_LinkedBaseModel):
         a new (default) instance of the model."""
         if isinstance(obj, str):
             # pydantic v1
-            return cls._resolve([obj])[obj]
+            return cls._resolve([obj], cls)[obj]
         if isinstance(obj, list):
             # pydantic v1
             # return cls._resolve(obj).nodes[obj[0]]
-            node_dict = cls._resolve(obj)
+            node_dict = cls._resolve(obj, cls)
             node_list = []
             for iri in obj:
                 node = node_dict[iri]
@@ -532,7 +536,7 @@ class LinkedBaseModel(_LinkedBaseModel):
                 if not is_list:
                     iris = [iris]
 
-                node_dict = self._resolve(iris)
+                node_dict = self._resolve(iris, type(self))
                 if is_list:
                     node_list = []
                     for iri in iris:
@@ -591,39 +595,57 @@ class LinkedBaseModel(_LinkedBaseModel):
         return self.__dict__.get(field_name)
 
     @staticmethod
-    def _resolve(iris):
-        resolver = get_resolver(GetResolverParam(iri=iris[0])).resolver
-        node_dict = resolver.resolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel)).nodes
-        return node_dict
+    def _resolve(iris, context_cls=None):
+        return interface.resolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel), context_cls).nodes
+
+    @staticmethod
+    async def _aresolve(iris, context_cls=None):
+        """Async variant of _resolve."""
+        return (await interface.aresolve(ResolveParam(iris=iris, model_cls=LinkedBaseModel), context_cls)).nodes
 
     def _store(self):
-        backend = get_backend(GetBackendParam(iri=self.get_iri())).backend
+        backend = get_backend(GetBackendParam(iri=self.get_iri(), model_cls=type(self))).backend
         backend.store(StoreParam(nodes={self.get_iri(): self}))
 
     def store_jsonld(self):
         """Store the model instance in a backend matching its IRI."""
         self._store()
 
+    async def _astore(self):
+        backend = get_backend(GetBackendParam(iri=self.get_iri(), model_cls=type(self))).backend
+        await backend.astore(StoreParam(nodes={self.get_iri(): self}))
+
+    async def astore_jsonld(self):
+        """Async variant of store_jsonld."""
+        await self._astore()
+
     @classmethod
     def _oold_query(cls, query: str | list[str] | Query | Condition) -> "LinkedBaseModelList[Self]":
-        # get all resolvers
-        resolvers: list[Resolver] = interface._resolvers.values()
-        node_list = []
-        for r in resolvers:
-            try:
-                if isinstance(query, (str, list)):
-                    _node_list = r.resolve(
-                        ResolveParam(
-                            iris=[query] if isinstance(query, str) else query,
-                            model_cls=cls,
-                        )
-                    ).nodes.values()
-                else:
-                    _node_list = r.query(QueryParam(query=query, model_cls=cls)).nodes.values()
-                node_list.extend(_node_list)
-            except NotImplementedError:
-                continue
+        # all resolvers that may hold instances of this class are
+        # requested concurrently, see interface.resolve_all
+        if isinstance(query, (str, list)):
+            iris = [query] if isinstance(query, str) else query
+            nodes = interface.resolve_all(
+                ResolveParam(iris=iris, model_cls=cls), first_match=isinstance(query, str)
+            ).nodes
+        else:
+            nodes = interface.query_all(QueryParam(query=query, model_cls=cls)).nodes
+        return cls._query_result(query, nodes)
+
+    @classmethod
+    async def _aoold_query(cls, query: str | list[str] | Query | Condition) -> "LinkedBaseModelList[Self]":
+        if isinstance(query, (str, list)):
+            iris = [query] if isinstance(query, str) else query
+            result = await interface.aresolve_all(
+                ResolveParam(iris=iris, model_cls=cls), first_match=isinstance(query, str)
+            )
+        else:
+            result = await interface.aquery_all(QueryParam(query=query, model_cls=cls))
+        return cls._query_result(query, result.nodes)
 
+    @classmethod
+    def _query_result(cls, query: str | list[str] | Query | Condition, nodes: dict):
+        node_list = list(nodes.values())
         if isinstance(query, str):
             return node_list[0] if len(node_list) > 0 else None
         else:
@@ -648,22 +670,12 @@ class LinkedBaseModel(_LinkedBaseModel):
         """Allow access to the class by its IRI."""
         return cls._oold_query(item)
 
-    @staticmethod
-    @staticmethod
-    def _recursive_object_to_iri(d: dict, model_obj):
-        """Recursively apply __iris__ replacement for nested model objects."""
-        for name, value in list(d.items()):
-            if name not in model_obj.__fields__:
-                continue
-            model_value = model_obj.__dict__.get(name)
-            if isinstance(value, list) and isinstance(model_value, list):
-                for item, model_item in zip(value, model_value, strict=False):
-                    if isinstance(item, dict) and hasattr(model_item, "__iris__"):
-                        model_item._object_to_iri(item)
-                        LinkedBaseModel._recursive_object_to_iri(item, model_item)
-            elif isinstance(value, dict) and hasattr(model_value, "__iris__"):
-                model_value._object_to_iri(value)
-                LinkedBaseModel._recursive_object_to_iri(value, model_value)
+    @classmethod
+    async def aoold_query(
+        cls, item: str | list[str] | Query | bool
+    ) -> Union[Self, "LinkedBaseModelList[Self]", Optional["LinkedBaseModelList[Self]"]]:
+        """Async variant of oold_query, e.g. ``await Entity.aoold_query("ex:e1")``."""
+        return await cls._aoold_query(item)
 
     def _raw_dict(self):
         """Serialize to dict without _object_to_iri at any level.
@@ -706,10 +718,9 @@ class LinkedBaseModel(_LinkedBaseModel):
         exclude_none = kwargs.pop("exclude_none", False)
         kwargs["exclude_none"] = False
         d = super().dict(**kwargs)
-        self._object_to_iri(d)
-        self._recursive_object_to_iri(d, self)
+        object_to_iri_many([d], [self])
         if exclude_none:
-            d = self.remove_none(d)
+            remove_none_inplace(d)
         return d
 
     # pydantic v1
@@ -751,11 +762,9 @@ class LinkedBaseModel(_LinkedBaseModel):
         )  # ToDo directly use dict?
         # this may replace some None values with IRIs in case they were never resolved
         # thats why we handle exclude_none there
-        self._object_to_iri(d)
-        # Recursively apply _object_to_iri for nested models
-        self._recursive_object_to_iri(d, self)
+        object_to_iri_many([d], [self])
         if exclude_none:
-            d = self.remove_none(d)
+            remove_none_inplace(d)
         return json.dumps(d, **dumps_kwargs)
 
     def cast(
@@ -832,6 +841,18 @@ class LinkedBaseModel(_LinkedBaseModel):
         """Constructs a model instance from a JSON-LD representation."""
         return import_jsonld(BaseModel, LinkedBaseModel, cls, jsonld, _types)
 
+    @staticmethod
+    def to_jsonld_many(instances: list["LinkedBaseModel"]) -> list[builtins.dict]:
+        """Return the JSON-LD representations of many model instances.
+        Contexts are built once per class."""
+        return export_jsonld_many(instances, BaseModel, LinkedBaseModel)
+
+    @classmethod
+    def from_jsonld_many(cls, jsonld_dicts: list[builtins.dict]) -> list["LinkedBaseModel"]:
+        """Constructs model instances from many JSON-LD representations
+        (in the same order). Contexts are built once per class."""
+        return import_jsonld_many(BaseModel, LinkedBaseModel, cls, jsonld_dicts, _types)
+
     def to_json(self, exclude_defaults: bool = False) -> builtins.dict:
         """Return the JSON representation of the object as dict.
 
@@ -0,0 +1,232 @@
+"""Parallel import of JSON / JSON-LD documents.
+
+Validation (pydantic) and JSON-LD processing (pyld) are CPU-bound, so
+threads do not scale. ``import_many`` distributes chunks of documents to
+a process pool whose workers import the same model modules (by name) as
+the calling process::
+
+    nodes = import_many(docs, model_cls=Entity, workers=8)
+
+Results are returned in input order. Documents that cannot be imported
+are reported per item as :class:`ItemError`.
+"""
+
+import contextlib
+import importlib
+import math
+import os
+import sys
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from oold.backend.interface import LinkedDataFormat
+
+
+@dataclass
+class ItemError:
+    """Failed import of the document at index."""
+
+    index: int
+    type: str
+    message: str
+
+    def __str__(self):
+        return f"Document {self.index}: {self.type}: {self.message}"
+
+
+class ImportManyError(ValueError):
+    """Raised by import_many if one or more documents failed to import.
+    The individual failures are available as ``errors``, the full
+    result list (with ItemError placeholders) as ``results``."""
+
+    def __init__(self, errors: list[ItemError], results: list):
+        self.errors = errors
+        self.results = results
+        details = "\n".join(str(e) for e in errors[:10])
+        more = f"\n... and {len(errors) - 10} more" if len(errors) > 10 else ""
+        super().__init__(f"{len(errors)} of {len(results)} documents failed to import:\n{details}{more}")
+
+
+def _get_class_ref(cls: type) -> tuple[str, str]:
+    if "<locals>" in cls.__qualname__:
+        raise ValueError(
+            f"{cls.__qualname__} is defined in a function and cannot be loaded "
+            "by worker processes, use executor='thread' instead"
+        )
+    return cls.__module__, cls.__qualname__
+
+
+def _load_class(ref: tuple[str, str]) -> type:
+    module_name, qualname = ref
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _get_model_modules(model_cls: type) -> list[str]:
+    """Return the names of the modules defining model_cls and its
+    (registered) subclasses, which the type resolution may select."""
+    modules = {model_cls.__module__}
+    pending = [model_cls]
+    seen = set()
+    while pending:
+        cls = pending.pop()
+        for sub in cls.__subclasses__():
+            if sub not in seen:
+                seen.add(sub)
+                modules.add(sub.__module__)
+                pending.append(sub)
+    modules.discard("__main__")
+    return sorted(modules)
+
+
+def _init_worker(sys_path: list[str], modules: list[str]) -> None:
+    """Make the model modules of the parent process available (required
+    for the 'spawn' and 'forkserver' start methods)."""
+    for path in sys_path:
+        if path not in sys.path:
+            sys.path.append(path)
+    for module in modules:
+        # failures only matter if one of its classes is needed, which
+        # is then reported per item
+        with contextlib.suppress(Exception):
+            importlib.import_module(module)
+
+
+def _import_one(model_cls: type, document: dict, format: LinkedDataFormat):
+    if format == LinkedDataFormat.JSON_LD:
+        return model_cls.from_jsonld(document)
+    return model_cls.from_json(document)
+
+
+def _import_chunk(
+    model_ref: type | tuple[str, str],
+    format: LinkedDataFormat,
+    start: int,
+    documents: list[dict],
+    return_dicts: bool,
+) -> list:
+    """Import documents[i] (global index start + i). Failures are
+    returned as ItemError in place of the instance."""
+    model_cls = model_ref if isinstance(model_ref, type) else _load_class(model_ref)
+    nodes = None
+    if format == LinkedDataFormat.JSON_LD:
+        try:
+            nodes = model_cls.from_jsonld_many(documents)
+        except Exception:
+            nodes = None  # retry per item to locate the failures
+    results = []
+    for index, document in enumerate(documents, start):
+        try:
+            node = nodes[index - start] if nodes is not None else _import_one(model_cls, document, format)
+            results.append(node.to_json() if return_dicts else node)
+        except Exception as e:
+            results.append(ItemError(index, type(e).__name__, str(e)))
+    return results
+
+
+def import_many(
+    docs: Iterable[dict],
+    model_cls: type | None = None,
+    format: LinkedDataFormat = LinkedDataFormat.JSON,
+    workers: int | None = None,
+    executor: Literal["process", "thread", "serial"] | Executor = "process",
+    chunk_size: int | None = None,
+    return_dicts: bool = False,
+    errors: Literal["raise", "return"] = "raise",
+) -> list:
+    """Import many documents in parallel.
+
+    Parameters
+    ----------
+    docs
+        JSON or JSON-LD documents.
+    model_cls
+        The class to import the documents as. The type field of each
+        document selects the registered subclass.
+        Defaults to oold.model.LinkedBaseModel.
+    format
+        Whether the documents are plain JSON or JSON-LD.
+    workers
+        Number of workers, defaults to the number of CPUs.
+        With a single worker the documents are imported in-process.
+    executor
+        "process" (default), "thread", "serial" or an existing Executor.
+        Model classes must be importable by name for "process".
+    chunk_size
+        Number of documents sent to a worker at once. Defaults to an
+        even split into four chunks per worker.
+    return_dicts
+        Return the validated documents (``to_json()``) instead of the
+        model instances, avoiding pickling of instances.
+    errors
+        "raise" raises an ImportManyError after all documents have been
+        processed if any of them failed, "return" returns ItemError
+        objects in place of the failed instances.
+
+    Returns
+    -------
+    The instances (or validated dicts) in the order of docs.
+    """
+    if errors not in ("raise", "return"):
+        raise ValueError(f"errors must be 'raise' or 'return', not {errors!r}")
+    if model_cls is None:
+        from oold.model import LinkedBaseModel
+
+        model_cls = LinkedBaseModel
+    docs = list(docs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(docs) / (workers * 4)))
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    chunks = [(start, docs[start : start + chunk_size]) for start in range(0, len(docs), chunk_size)]
+
+    if not isinstance(executor, Executor) and executor not in ("process", "thread", "serial"):
+        raise ValueError(f"Unknown executor {executor!r}")
+    pool, owned = None, False
+    model_ref: type | tuple[str, str] = model_cls
+    if isinstance(executor, Executor):
+        pool = executor
+    elif executor != "serial" and workers > 1 and len(chunks) > 1:
+        if executor == "process":
+            model_ref = _get_class_ref(model_cls)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(list(sys.path), _get_model_modules(model_cls)),
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+        owned = True
+    if isinstance(pool, ProcessPoolExecutor):
+        model_ref = _get_class_ref(model_cls)
+
+    results: list[Any] = []
+    if pool is None:
+        for start, chunk in chunks:
+            results.extend(_import_chunk(model_cls, format, start, chunk, return_dicts))
+    else:
+        try:
+            futures = [
+                pool.submit(_import_chunk, model_ref, format, start, chunk, return_dicts) for start, chunk in chunks
+            ]
+            for (start, chunk), future in zip(chunks, futures, strict=True):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    # e.g. the results could not be pickled
+                    results.extend(ItemError(start + i, type(e).__name__, str(e)) for i in range(len(chunk)))
+        finally:
+            if owned:
+                pool.shutdown()
+
+    if errors == "raise":
+        failed = [r for r in results if isinstance(r, ItemError)]
+        if failed:
+            raise ImportManyError(failed, results)
+    return results
@@ -1,8 +1,14 @@
 import ast
+import contextlib
+import copy
 import inspect
 import json
 import logging
+import threading
+import time
+import weakref
 from abc import abstractmethod
+from collections import OrderedDict
 from collections.abc import Callable
 from enum import Enum
 from functools import partial
@@ -21,6 +27,7 @@ from pydantic.v1 import create_model as create_model_v1
 from pydantic_core import CoreSchema, to_jsonable_python
 from pyld import jsonld
 
+from oold.utils.compiled_context import CompiledContext, UnsupportedFeature, compile_context
 from oold.utils.environment import get_object_source
 
 _logger = logging.getLogger(__name__)
@@ -174,12 +181,84 @@ class PartialSchemaExportMode(str, Enum):
     by calculating the diff to the base class schema."""
 
 
+def remove_none_inplace(obj):
+    """Remove None values from all dicts nested in obj (dicts and lists),
+    in place and without recursion. Same result as
+    GenericLinkedBaseModel.remove_none, but no containers are copied.
+    Returns obj."""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            none_keys = None
+            for key, value in node.items():
+                if value is None:
+                    if none_keys is None:
+                        none_keys = [key]
+                    else:
+                        none_keys.append(key)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+            if none_keys is not None:
+                for key in none_keys:
+                    del node[key]
+        elif isinstance(node, list):
+            for value in node:
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+    return obj
+
+
+def remove_none_many(objs: list) -> list:
+    """Batch form of remove_none_inplace for a list of dumped dicts."""
+    return remove_none_inplace(objs)
+
+
+def _get_model_fields(model_cls) -> dict:
+    # pydantic v2 / v1
+    fields = getattr(model_cls, "__pydantic_fields__", None)
+    return fields if fields is not None else getattr(model_cls, "__fields__", {})
+
+
+def object_to_iri_many(dicts: list[dict], model_objs: list) -> list[dict]:
+    """Replace the values of range fields by their IRI(s) from __iris__
+    in the dumped dicts of model_objs, including the dicts of nested
+    (inline) models, in place and without recursion.
+
+    Same result as calling _object_to_iri on every (nested) model."""
+    stack = list(zip(dicts, model_objs, strict=True))
+    while stack:
+        d, model_obj = stack.pop()
+        iris = getattr(model_obj, "__iris__", None)
+        if iris:
+            for name, iri in iris.items():
+                if name in d:
+                    d[name] = iri
+        fields = _get_model_fields(type(model_obj))
+        values = model_obj.__dict__
+        for name, value in d.items():
+            if isinstance(value, dict):
+                model_value = values.get(name)
+                if hasattr(model_value, "__iris__") and name in fields:
+                    stack.append((value, model_value))
+            elif isinstance(value, list):
+                model_value = values.get(name)
+                if isinstance(model_value, list) and name in fields:
+                    for item, model_item in zip(value, model_value, strict=False):
+                        if isinstance(item, dict) and hasattr(model_item, "__iris__"):
+                            stack.append((item, model_item))
+    return dicts
+
+
 class GenericLinkedBaseModel:
     def _object_to_iri(self, d, exclude_none=False):
-        for name in list(d.keys()):  # force copy of keys for inline-delete
-            if name in self.__iris__:
-                d[name] = self.__iris__[name]
-            if exclude_none and d[name] is None:
+        iris = self.__iris__
+        if iris:
+            for name, iri in iris.items():
+                if name in d:
+                    d[name] = iri
+        if exclude_none:
+            for name in [name for name, value in d.items() if value is None]:
                 del d[name]
         return d
 
@@ -259,10 +338,15 @@ class GenericLinkedBaseModel:
         return "type"
 
 
-def get_jsonld_context_loader(model_cls, model_type) -> Callable:
-    """to overwrite the default jsonld document loader to load
-    relative context from the oold"""
+def _get_schema_iris(model_cls) -> list[str]:
+    iri = model_cls.get_cls_iri() if hasattr(model_cls, "get_cls_iri") else None
+    if iri is None:
+        return []
+    return iri if isinstance(iri, list) else [iri]
 
+
+def _get_class_hierarchy(model_cls, model_type) -> list:
+    """Breadth-first list of model_cls and its bases up to model_type."""
     classes = [model_cls]
     i = 0
     while 1:
@@ -274,43 +358,120 @@ def get_jsonld_context_loader(model_cls, model_type) -> Callable:
             break
         i += 1
         classes[i:i] = [base for base in cls.__bases__ if base not in classes]
+    return classes
 
-    schemas = {}
-    for base_class in classes:
-        schema = get_model_schema(base_class)
-        if schema is not None and hasattr(base_class, "get_cls_iri"):
-            iri = base_class.get_cls_iri()
-            if iri is not None:
-                if isinstance(iri, list):
-                    for i in iri:
-                        schemas[i] = schema
-                else:
+
+class JsonLdDocumentLoader:
+    """pyld document loader serving the schemas of the model classes.
+
+    Schemas are registered by class IRI as classes are defined (see
+    ``register``). URLs that do not match a registered class are fetched
+    remotely and kept in an LRU cache. The loader is passed per call via
+    pyld's ``documentLoader`` option, so pyld's process-global loader is
+    never replaced.
+
+    Parameters
+    ----------
+    max_remote
+        Maximum number of cached remote documents.
+    remote_ttl
+        Time to live of a cached remote document in seconds.
+        None means documents never expire.
+    """
+
+    def __init__(self, max_remote: int = 128, remote_ttl: float | None = None):
+        self.max_remote = max_remote
+        self.remote_ttl = remote_ttl
+        self._schemas: dict[str, dict] = {}
+        self._remote: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._requests_loader = None
+        self._class_loaders: weakref.WeakKeyDictionary[type, Callable] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def register(self, model_cls) -> None:
+        """Make the schema of model_cls loadable by its class IRI(s)."""
+        schema = get_model_schema(model_cls)
+        if schema is None:
+            return
+        for iri in _get_schema_iris(model_cls):
+            self._schemas[iri] = schema
+
+    def for_class(self, model_cls, model_type) -> Callable:
+        """Return a loader that prefers the schemas of the class hierarchy
+        of model_cls over schemas registered by other classes with the
+        same IRI."""
+        loader = self._class_loaders.get(model_cls)
+        if loader is not None:
+            return loader
+        schemas = {}
+        for base_class in _get_class_hierarchy(model_cls, model_type):
+            schema = get_model_schema(base_class)
+            if schema is not None:
+                for iri in _get_schema_iris(base_class):
                     schemas[iri] = schema
 
-    def loader(url, options=None):
+        def loader(url, options=None):
+            return self.load(url, options, schemas)
+
+        self._class_loaders[model_cls] = loader
+        return loader
+
+    def __call__(self, url, options=None):
+        return self.load(url, options)
+
+    def load(self, url, options=None, schemas: dict[str, dict] | None = None) -> dict:
         if options is None:
             options = {}
         # to support OSW wiki context loading
+        key = url
         if "/wiki/" in url:
-            url = url.split("/")[-1].split("?")[0]
-        if url in schemas:
-            schema = schemas[url]
-
-            doc = {
+            key = url.split("/")[-1].split("?")[0]
+        schema = schemas.get(key) if schemas else None
+        if schema is None:
+            schema = self._schemas.get(key)
+        if schema is not None:
+            _logger.debug("Resolve local context: %s", key)
+            return {
                 "contentType": "application/json",
                 "contextUrl": None,
-                "documentUrl": url,
+                "documentUrl": key,
                 "document": schema,
             }
-            _logger.debug("Resolve local context: %s", url)
-            return doc
+        return self._load_remote(url, options)
+
+    def _load_remote(self, url, options) -> dict:
+        with self._lock:
+            entry = self._remote.get(url)
+            if entry is not None:
+                doc, loaded_at = entry
+                if self.remote_ttl is None or time.monotonic() - loaded_at <= self.remote_ttl:
+                    self._remote.move_to_end(url)
+                    # pyld may modify the document while processing it
+                    return copy.deepcopy(doc)
+                del self._remote[url]
+        _logger.debug("Resolve remote context: %s", url)
+        if self._requests_loader is None:
+            self._requests_loader = pyld.documentloader.requests.requests_document_loader()
+        doc = self._requests_loader(url, options)
+        with self._lock:
+            self._remote[url] = (copy.deepcopy(doc), time.monotonic())
+            while len(self._remote) > self.max_remote:
+                self._remote.popitem(last=False)
+        return doc
+
+    def clear_remote_cache(self) -> None:
+        with self._lock:
+            self._remote.clear()
+
+
+document_loader = JsonLdDocumentLoader()
+"""Document loader shared by all JSON-LD operations of oold."""
 
-        else:
-            _logger.debug("Resolve remote context: %s", url)
-            requests_loader = pyld.documentloader.requests.requests_document_loader()
-            return requests_loader(url, options)
 
-    return loader
+def get_jsonld_context_loader(model_cls, model_type) -> Callable:
+    """to overwrite the default jsonld document loader to load
+    relative context from the oold"""
+    return document_loader.for_class(model_cls, model_type)
 
 
 def _interate_annotation_args(field_annotation_class):
@@ -345,13 +506,108 @@ def get_model_schema(model_cls) -> dict | None:
     return None
 
 
+def _read_only(*args, **kwargs):
+    raise TypeError("The memoized context is shared and read-only, copy it before modifying")
+
+
+class ReadOnlyDict(dict):
+    """A dict that cannot be modified. Since it is a dict, it can be
+    passed to pyld and json as is. copy.copy / copy.deepcopy return
+    mutable plain dicts (and lists)."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """A list that cannot be modified, see ReadOnlyDict."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(value):
+    """Return a read-only deep copy of a JSON value."""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(_freeze(item) for item in value)
+    return value
+
+
+# built contexts per model class, see build_context
+_context_cache: "weakref.WeakKeyDictionary[type, Any]" = weakref.WeakKeyDictionary()
+
+
+# compiled contexts per model class (None if not supported by the
+# fast path), see get_compiled_context
+_compiled_contexts: "weakref.WeakKeyDictionary[type, CompiledContext | None]" = weakref.WeakKeyDictionary()
+
+
+# CURIE prefixes per model class, see get_context_prefixes
+_context_prefixes: "weakref.WeakKeyDictionary[type, dict[str, str]]" = weakref.WeakKeyDictionary()
+
+
+def invalidate_context_cache() -> None:
+    """Drop all memoized contexts. Called whenever a new class is
+    registered, since it may complete forward references of other classes."""
+    _context_cache.clear()
+    _compiled_contexts.clear()
+    _context_prefixes.clear()
+
+
+def get_compiled_context(model_cls, model_type, context) -> CompiledContext | None:
+    """Return the compiled context of model_cls for the fast JSON-LD
+    expansion / compaction path or None if pyld has to be used."""
+    try:
+        return _compiled_contexts[model_cls]
+    except KeyError:
+        pass
+    compiled = compile_context(context, get_jsonld_context_loader(model_cls, model_type))
+    _compiled_contexts[model_cls] = compiled
+    return compiled
+
+
 def build_context(model_cls, model_type, visited=None) -> dict:
     """Takes the base context from the model_type.
     Iterate over the model_type fields.
-    If the field is another LinkedBaseModel, a nested context is built recursively."""
+    If the field is another LinkedBaseModel, a nested context is built recursively.
+
+    The result of a top-level call is memoized per model class and shared
+    between callers as a read-only copy (see ReadOnlyDict), copy.deepcopy
+    returns a modifiable one. The context of the model schema itself is
+    never modified."""
 
     if visited is None:
-        visited = set()
+        try:
+            return _context_cache[model_cls]
+        except KeyError:
+            pass
+        context = _freeze(_build_context(model_cls, model_type, set()))
+        _context_cache[model_cls] = context
+        return context
+    return _build_context(model_cls, model_type, visited)
+
+
+def _build_context(model_cls, model_type, visited: set):
     if model_cls in visited:
         return None
     visited.add(model_cls)
@@ -362,6 +618,7 @@ def build_context(model_cls, model_type, visited=None) -> dict:
 
     if model_type == BaseModel:
         # get the context from self.ConfigDict.json_schema_extra["@context"]
+        copied = False
 
         for field_name, field_value in model_cls.model_fields.items():
             annotation_class = _interate_annotation_args(field_value.annotation)
@@ -369,7 +626,13 @@ def build_context(model_cls, model_type, visited=None) -> dict:
             if json_schema_annotation is not None and "range" in json_schema_annotation:
                 continue  # skip fields of type IRI
             if annotation_class is not None and issubclass(annotation_class, BaseModel):
-                nested_context = build_context(annotation_class, model_type, visited)
+                nested_context = _build_context(annotation_class, model_type, visited)
+                if nested_context is None:
+                    continue
+                if not copied:
+                    # copy on first write, keep the schema untouched
+                    context = copy.deepcopy(context)
+                    copied = True
                 target_context = context
                 # if target context is a list,
                 # find the dict that contains the field_name
@@ -380,19 +643,18 @@ def build_context(model_cls, model_type, visited=None) -> dict:
                             break
                     if isinstance(target_context, list):
                         continue  # definition not found
-                if nested_context is not None:
-                    if target_context[field_name] is None:
-                        continue
-                    if isinstance(target_context[field_name], str):
-                        target_context[field_name] = {
-                            "@id": target_context[field_name],
-                            "@context": nested_context,
-                        }
-                    elif isinstance(target_context[field_name], dict):
-                        target_context[field_name] = {
-                            **target_context[field_name],
-                            **{"@context": nested_context},
-                        }
+                if target_context.get(field_name) is None:
+                    continue
+                if isinstance(target_context[field_name], str):
+                    target_context[field_name] = {
+                        "@id": target_context[field_name],
+                        "@context": nested_context,
+                    }
+                elif isinstance(target_context[field_name], dict):
+                    target_context[field_name] = {
+                        **target_context[field_name],
+                        **{"@context": nested_context},
+                    }
 
     if model_type == BaseModel_v1:
         # not yet implemented for pydantic v1
@@ -401,32 +663,144 @@ def build_context(model_cls, model_type, visited=None) -> dict:
     return context
 
 
-def export_jsonld(model_instance: GenericLinkedBaseModel, model_type) -> dict:
-    """Return the RDF representation of the object as JSON-LD."""
-
-    # serialize the model to a dictionary
-    # to_string().to_json() roundtrips is needed to serialize enums correctly
+def _get_context(model_cls, model_type):
     if model_type == BaseModel:
         # get the context from self.ConfigDict.json_schema_extra["@context"]
-        context = model_instance.model_config.get("json_schema_extra", {}).get("@context", {})
-        context = build_context(model_instance.__class__, model_type)
-        data = model_instance.to_json()
-    if model_type == BaseModel_v1:
-        context = model_instance.__class__.__config__.schema_extra.get("@context", {})
-        data = model_instance.to_json()
+        return build_context(model_cls, model_type)
+    return model_cls.__config__.schema_extra.get("@context", {})
+
+
+# an IRI ending with one of these characters can be used as a prefix,
+# see https://www.w3.org/TR/json-ld11/#dfn-prefix
+_PREFIX_DELIMITERS = ":/?#[]@"
+
+
+def _get_local_prefixes(context) -> dict[str, str]:
+    """Collect the prefix definitions of the local (embedded) contexts.
+    Remote contexts are not loaded."""
+    prefixes = {}
+    for ctx in context if isinstance(context, list) else [context]:
+        if not isinstance(ctx, dict):
+            continue
+        for term, value in ctx.items():
+            if isinstance(value, dict):
+                if not value.get("@prefix"):
+                    continue
+                value = value.get("@id")
+            if (
+                isinstance(value, str)
+                and ":" in value
+                and value[-1] in _PREFIX_DELIMITERS
+                and ":" not in term
+                and not term.startswith("@")
+            ):
+                prefixes[term] = value
+    # prefixes defined as compact IRIs, e.g. "Property": "wiki:Property:"
+    for term, value in prefixes.items():
+        prefix, suffix = value.split(":", 1)
+        if prefix in prefixes and not suffix.startswith("//"):
+            prefixes[term] = prefixes[prefix] + suffix
+    return prefixes
+
 
+def get_context_prefixes(model_cls) -> dict[str, str]:
+    """Return the CURIE prefixes (prefix -> IRI) defined by the JSON-LD
+    context of model_cls, e.g. {"ex": "https://example.com/"}.
+
+    The result is memoized per model class and must be treated as read-only."""
+    try:
+        return _context_prefixes[model_cls]
+    except KeyError:
+        pass
+    model_type = BaseModel_v1 if issubclass(model_cls, BaseModel_v1) else BaseModel
+    context = _get_context(model_cls, model_type)
+    prefixes = {}
+    if context:
+        compiled = get_compiled_context(model_cls, model_type, context)
+        prefixes = dict(compiled.prefixes) if compiled is not None else _get_local_prefixes(context)
+    _context_prefixes[model_cls] = prefixes
+    return prefixes
+
+
+def _get_export_data(model_instance: GenericLinkedBaseModel) -> dict:
+    # serialize the model to a dictionary
+    # to_string().to_json() roundtrips is needed to serialize enums correctly
+    data = model_instance.to_json()
     if "id" not in data and "@id" not in data:
         id = model_instance.get_iri()
         if id is not None:
             data["id"] = id
+    return data
+
+
+def export_jsonld(model_instance: GenericLinkedBaseModel, model_type) -> dict:
+    """Return the RDF representation of the object as JSON-LD."""
+    context = _get_context(model_instance.__class__, model_type)
+    data = _get_export_data(model_instance)
+    compiled = get_compiled_context(model_instance.__class__, model_type, context)
+    if compiled is not None:
+        try:
+            return compiled.expand(data)
+        except UnsupportedFeature:
+            pass
     jsonld_dict = {"@context": context, **data}
-    jsonld.set_document_loader(get_jsonld_context_loader(model_instance.__class__, model_type))
-    jsonld_dict = jsonld.expand(jsonld_dict)
+    loader = get_jsonld_context_loader(model_instance.__class__, model_type)
+    jsonld_dict = jsonld.expand(jsonld_dict, {"documentLoader": loader})
     if isinstance(jsonld_dict, list):
         jsonld_dict = jsonld_dict[0]
     return jsonld_dict
 
 
+def export_jsonld_many(
+    model_instances: list[GenericLinkedBaseModel],
+    model_type,
+    model_root_cls: type[GenericLinkedBaseModel] | None = None,
+) -> list[dict]:
+    """Return the JSON-LD representations of many objects in the given order.
+
+    Objects are grouped by class, so each context is built and compiled
+    once. Objects not supported by the fast path are expanded by pyld in a
+    single ``@graph`` per class. Objects of classes that override
+    ``to_jsonld`` of model_root_cls are exported by their own method."""
+    results: list = [None] * len(model_instances)
+    groups: dict[type, list[int]] = {}
+    for i, model_instance in enumerate(model_instances):
+        groups.setdefault(model_instance.__class__, []).append(i)
+
+    for cls, indices in groups.items():
+        if model_root_cls is not None and cls.to_jsonld is not model_root_cls.to_jsonld:
+            for i in indices:
+                results[i] = model_instances[i].to_jsonld()
+            continue
+        context = _get_context(cls, model_type)
+        compiled = get_compiled_context(cls, model_type, context)
+        pending: list[tuple[int, dict]] = []
+        for i in indices:
+            data = _get_export_data(model_instances[i])
+            if compiled is not None:
+                try:
+                    results[i] = compiled.expand(data)
+                    continue
+                except UnsupportedFeature:
+                    pass
+            pending.append((i, data))
+        if not pending:
+            continue
+        loader = get_jsonld_context_loader(cls, model_type)
+        graph = jsonld.expand(
+            {"@context": context, "@graph": [data for _, data in pending]},
+            {"documentLoader": loader},
+        )
+        if len(graph) == len(pending):
+            for (i, _), node in zip(pending, graph, strict=True):
+                results[i] = node
+        else:
+            # nodes were dropped or merged, the positions do not match
+            for i, _ in pending:
+                results[i] = export_jsonld(model_instances[i], model_type)
+    return results
+
+
 def normalize_iri(iri: str, model_cls, expand: bool) -> str:
     """Normalize the IRI using JSON-LD expansion or compaction.
     Example (ex: prefix for https://example.com/):
@@ -435,13 +809,13 @@ def normalize_iri(iri: str, model_cls, expand: bool) -> str:
     """
     schema = get_model_schema(model_cls)
     context = schema.get("@context", {})
-    jsonld.set_document_loader(get_jsonld_context_loader(model_cls, BaseModel))
+    options = {"documentLoader": get_jsonld_context_loader(model_cls, BaseModel)}
     if expand:
-        expanded = jsonld.expand({"@context": context, "id": iri})
+        expanded = jsonld.expand({"@context": context, "id": iri}, options)
         expanded_iri = expanded[0].get("@id", iri) if isinstance(expanded, list) and len(expanded) > 0 else iri
         return expanded_iri
     else:
-        compacted = jsonld.compact({"@context": context, "id": iri}, context)
+        compacted = jsonld.compact({"@context": context, "id": iri}, context, options)
         compacted_iri = compacted.get("id", iri)
         return compacted_iri
 
@@ -487,42 +861,28 @@ def resolve_type(
     return _types.get(type_iri)
 
 
-def import_jsonld(
-    model_type,
-    model_root_cls: GenericLinkedBaseModel,
-    model_cls: GenericLinkedBaseModel,
-    jsonld_dict: dict,
-    _types: dict[str, type],
-) -> GenericLinkedBaseModel:
-    """Return the object instance from the JSON-LD representation."""
-    # ToDo: apply jsonld frame with @id restriction
-    # get the @type from the jsonld_dict
-    type_field_name = model_root_cls.get_type_field()
-    type_iri = jsonld_dict.get("@type", jsonld_dict.get(type_field_name))
+def _get_import_cls(model_root_cls, model_cls, type_iri, document: dict, kind: str, _types: dict[str, type]):
+    """Return the class to import the document as: the class registered
+    for type_iri or model_cls if the document has no type."""
     # if type_iri is None, return None
     if type_iri is None:
         if model_root_cls != model_cls:
-            _logger.debug(f"Fall back to {model_cls.__name__} - no type IRI found in JSON-LD dict: {jsonld_dict}")
+            _logger.debug(f"Fall back to {model_cls.__name__} - no type IRI found in {kind} dict: {document}")
         else:
             raise ValueError(
                 f"No specific subclass of {model_root_cls.__name__} given "
-                f"and no type IRI found in JSON-LD dict: {jsonld_dict}"
+                f"and no type IRI found in {kind} dict: {document}"
             )
-    else:
-        model_cls = resolve_type(type_iri, _types)
-        if model_cls is None:
-            raise ValueError(f"Unknown model type IRI: {type_iri}")
-    if model_type == BaseModel:
-        # get the context from self.ConfigDict.json_schema_extra["@context"]
-        context = build_context(model_cls, model_type)
-    if model_type == BaseModel_v1:
-        context = model_cls.__config__.schema_extra.get("@context", {})
-    jsonld.set_document_loader(get_jsonld_context_loader(model_cls, model_type))
-    jsonld_dict = jsonld.compact(jsonld_dict, context)
-    if "@context" in jsonld_dict:
-        del jsonld_dict["@context"]
+        return model_cls
+    model_cls = resolve_type(type_iri, _types)
+    if model_cls is None:
+        raise ValueError(f"Unknown model type IRI: {type_iri}")
+    return model_cls
+
+
+def _construct(model_cls, type_iri, data: dict, _types: dict[str, type]) -> GenericLinkedBaseModel:
     try:
-        return model_cls(**jsonld_dict)
+        return model_cls(**data)
     except Exception:
         iri = type_iri[0] if isinstance(type_iri, list) else type_iri
         pure_cls = _types.get(iri) if iri else None
@@ -537,10 +897,94 @@ def import_jsonld(
                 pure_cls.__name__,
                 model_cls.__name__,
             )
-            return pure_cls(**jsonld_dict)
+            return pure_cls(**data)
         raise
 
 
+def _get_jsonld_import_cls(model_root_cls, model_cls, jsonld_dict: dict, _types: dict[str, type]):
+    # ToDo: apply jsonld frame with @id restriction
+    # get the @type from the jsonld_dict
+    type_field_name = model_root_cls.get_type_field()
+    type_iri = jsonld_dict.get("@type", jsonld_dict.get(type_field_name))
+    return _get_import_cls(model_root_cls, model_cls, type_iri, jsonld_dict, "JSON-LD", _types), type_iri
+
+
+def _compact(jsonld_dict: dict, model_cls, model_type, context, compiled: CompiledContext | None) -> dict:
+    if compiled is not None:
+        with contextlib.suppress(UnsupportedFeature):
+            return compiled.compact(jsonld_dict)
+    loader = get_jsonld_context_loader(model_cls, model_type)
+    compacted = jsonld.compact(jsonld_dict, context, {"documentLoader": loader})
+    if "@context" in compacted:
+        del compacted["@context"]
+    return compacted
+
+
+def import_jsonld(
+    model_type,
+    model_root_cls: GenericLinkedBaseModel,
+    model_cls: GenericLinkedBaseModel,
+    jsonld_dict: dict,
+    _types: dict[str, type],
+) -> GenericLinkedBaseModel:
+    """Return the object instance from the JSON-LD representation."""
+    model_cls, type_iri = _get_jsonld_import_cls(model_root_cls, model_cls, jsonld_dict, _types)
+    context = _get_context(model_cls, model_type)
+    compiled = get_compiled_context(model_cls, model_type, context)
+    data = _compact(jsonld_dict, model_cls, model_type, context, compiled)
+    return _construct(model_cls, type_iri, data, _types)
+
+
+def import_jsonld_many(
+    model_type,
+    model_root_cls: GenericLinkedBaseModel,
+    model_cls: GenericLinkedBaseModel,
+    jsonld_dicts: list[dict],
+    _types: dict[str, type],
+) -> list[GenericLinkedBaseModel]:
+    """Return the object instances of many JSON-LD documents in the given order.
+
+    Documents are grouped by their target class, so each context is built
+    and compiled once. Documents not supported by the fast path are
+    compacted by pyld in a single ``@graph`` per class."""
+    targets = [_get_jsonld_import_cls(model_root_cls, model_cls, d, _types) for d in jsonld_dicts]
+    groups: dict[type, list[int]] = {}
+    for i, (cls, _) in enumerate(targets):
+        groups.setdefault(cls, []).append(i)
+
+    compacted: list = [None] * len(jsonld_dicts)
+    for cls, indices in groups.items():
+        context = _get_context(cls, model_type)
+        compiled = get_compiled_context(cls, model_type, context)
+        pending = []
+        for i in indices:
+            if compiled is not None:
+                try:
+                    compacted[i] = compiled.compact(jsonld_dicts[i])
+                    continue
+                except UnsupportedFeature:
+                    pass
+            pending.append(i)
+        if not pending:
+            continue
+        loader = get_jsonld_context_loader(cls, model_type)
+        graph = jsonld.compact(
+            {"@graph": [jsonld_dicts[i] for i in pending]},
+            context,
+            {"documentLoader": loader, "graph": True},
+        )
+        graph = graph.get("@graph", [])
+        if len(graph) == len(pending):
+            for i, node in zip(pending, graph, strict=True):
+                compacted[i] = node
+        else:
+            # nodes were dropped or merged, the positions do not match
+            for i in pending:
+                compacted[i] = _compact(jsonld_dicts[i], cls, model_type, context, None)
+
+    return [_construct(cls, type_iri, data, _types) for (cls, type_iri), data in zip(targets, compacted, strict=True)]
+
+
 def import_json(
     model_type,
     model_root_cls: GenericLinkedBaseModel,
@@ -552,37 +996,9 @@ def import_json(
     # get the type from the json_dict
     type_field_name = model_root_cls.get_type_field()
     type_iri = json_dict.get(type_field_name)
-    # if type_iri is None, return None
-    if type_iri is None:
-        if model_root_cls != model_cls:
-            _logger.debug(f"Fall back to {model_cls.__name__} - no type IRI found in JSON dict: {json_dict}")
-        else:
-            raise ValueError(
-                f"No specific subclass of {model_root_cls.__name__} given "
-                f"and no type IRI found in JSON dict: {json_dict}"
-            )
-    else:
-        model_cls = resolve_type(type_iri, _types)
-        if model_cls is None:
-            raise ValueError(f"Unknown model type IRI: {type_iri}")
-    try:
-        return model_cls(**json_dict)
-    except Exception:
-        # If controller construction fails, fall back to pure model
-        pure_cls = _types.get(type_iri[0] if isinstance(type_iri, list) else type_iri)
-        if pure_cls is not None and pure_cls is not model_cls:
-            _logger.warning(
-                "Controller %s construction failed "
-                "(e.g. missing mandatory fields), "
-                "falling back to %s. "
-                "You can cast manually: "
-                "%s(model_instance, field=value)",
-                model_cls.__name__,
-                pure_cls.__name__,
-                model_cls.__name__,
-            )
-            return pure_cls(**json_dict)
-        raise
+    model_cls = _get_import_cls(model_root_cls, model_cls, type_iri, json_dict, "JSON", _types)
+    # if controller construction fails, fall back to pure model
+    return _construct(model_cls, type_iri, json_dict, _types)
 
 
 def _get_schema(model_cls):
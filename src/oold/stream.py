@@ -0,0 +1,236 @@
+"""Streaming import of large JSON / JSON-LD files.
+
+Documents are read incrementally from newline-delimited JSON (NDJSON) or
+from a JSON array / JSON-LD ``@graph`` and turned into model instances in
+chunks, so memory usage does not depend on the size of the file::
+
+    for chunk in stream_import("entities.ndjson", batch_size=1000):
+        ...
+
+    # load into a backend
+    for _ in stream_import("graph.jsonld", format=LinkedDataFormat.JSON_LD, backend=store):
+        pass
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from oold.backend.interface import Backend, LinkedDataFormat, StoreParam
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonReader:
+    """Reads consecutive JSON values from a text stream with a bounded buffer."""
+
+    def __init__(self, fp: IO[str], read_size: int):
+        self.fp = fp
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        data = self.fp.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str | None:
+        """Return the next non-whitespace character (not consumed)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.read_size):
+                return None
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if c is None or c not in chars:
+            raise ValueError(f"Expected one of {chars!r} but found {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        size = self.read_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may be truncated
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # value spans beyond the buffer, read more (growing to
+            # keep the number of retries logarithmic)
+            self._fill(size)
+            size *= 2
+
+    def array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def _open(source: str | Path | IO[str]) -> tuple[IO[str], bool]:
+    if isinstance(source, (str, Path)):
+        return open(source, encoding="utf-8"), True
+    return source, False
+
+
+def _is_ndjson(source) -> bool:
+    if isinstance(source, (str, Path)):
+        return Path(source).suffix.lower() in (".ndjson", ".jsonl")
+    return False
+
+
+def iter_ndjson(source: str | Path | IO[str]) -> Iterator[dict]:
+    """Yield the documents of a newline-delimited JSON file one by one."""
+    fp, close = _open(source)
+    try:
+        for line_number, line in enumerate(fp, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in line {line_number}: {e}") from e
+    finally:
+        if close:
+            fp.close()
+
+
+def iter_json(source: str | Path | IO[str], read_size: int = 65536) -> Iterator[dict]:
+    """Yield the documents of a JSON array, the nodes of a JSON-LD
+    ``@graph`` or a single JSON object, reading the file incrementally.
+
+    The top-level ``@context`` of a JSON-LD document is attached to every
+    node of the ``@graph``. It has to precede the ``@graph`` entry.
+    """
+    fp, close = _open(source)
+    try:
+        reader = _JsonReader(fp, read_size)
+        c = reader.peek()
+        if c == "[":
+            yield from reader.array()
+            return
+        reader.expect("{")
+        context = None
+        rest = {}
+        has_graph = False
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "@graph":
+                has_graph = True
+                for node in reader.array():
+                    if context is not None and "@context" not in node:
+                        node = {"@context": context, **node}
+                    yield node
+            elif key == "@context":
+                context = reader.value()
+            else:
+                rest[key] = reader.value()
+            if reader.expect(",}") == "}":
+                break
+        if not has_graph and rest:
+            yield {"@context": context, **rest} if context is not None else rest
+    finally:
+        if close:
+            fp.close()
+
+
+def iter_documents(source: str | Path | IO[str], ndjson: bool | None = None) -> Iterator[dict]:
+    """Yield the documents of source, see iter_ndjson and iter_json.
+    If ndjson is None, it is derived from the file suffix
+    (.ndjson / .jsonl)."""
+    if ndjson is None:
+        ndjson = _is_ndjson(source)
+    return iter_ndjson(source) if ndjson else iter_json(source)
+
+
+def _parse_chunk(model_cls, documents: list[dict], format: LinkedDataFormat) -> list:
+    if format == LinkedDataFormat.JSON_LD:
+        return model_cls.from_jsonld_many(documents)
+    return [model_cls.from_json(document) for document in documents]
+
+
+def stream_import(
+    source: str | Path | IO[str],
+    model_cls=None,
+    format: LinkedDataFormat = LinkedDataFormat.JSON,
+    ndjson: bool | None = None,
+    batch_size: int = 1000,
+    backend: Backend | None = None,
+) -> Iterator[list]:
+    """Import the documents of source as model instances in chunks.
+
+    Parameters
+    ----------
+    source
+        File path or text stream with NDJSON, a JSON array or a JSON-LD
+        document with ``@graph``.
+    model_cls
+        The class to import the documents as. The type field of each
+        document selects the registered subclass (see resolve_type).
+        Defaults to oold.model.LinkedBaseModel.
+    format
+        Whether the documents are plain JSON or JSON-LD.
+    ndjson
+        Whether source is newline-delimited. Derived from the file suffix
+        if None.
+    batch_size
+        Number of instances per yielded chunk.
+    backend
+        If given, every chunk is stored in the backend before it is yielded.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    if model_cls is None:
+        from oold.model import LinkedBaseModel
+
+        model_cls = LinkedBaseModel
+
+    def flush(documents):
+        chunk = _parse_chunk(model_cls, documents, format)
+        if backend is not None:
+            backend.store(StoreParam(nodes={node.get_iri(): node for node in chunk}))
+        return chunk
+
+    documents = []
+    for document in iter_documents(source, ndjson):
+        documents.append(document)
+        if len(documents) >= batch_size:
+            yield flush(documents)
+            documents = []
+    if documents:
+        yield flush(documents)
+
+
+async def astream_import(source: str | Path | IO[str], **kwargs) -> AsyncIterator[list]:
+    """Async variant of stream_import. Reading, parsing and storing run in
+    a worker thread, so the event loop is not blocked."""
+    chunks = stream_import(source, **kwargs)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
@@ -0,0 +1,300 @@
+"""Direct dict transforms for simple JSON-LD contexts.
+
+Most contexts of oold models are plain term -> IRI maps with ``@type``
+coercion and ``@container: @set`` annotations. For those, expansion and
+compaction of a single node object reduce to a lookup in a precomputed
+term table, which is much faster than running the general JSON-LD
+algorithms of pyld.
+
+The term table is computed by pyld's own context processing, so prefixes,
+remote contexts and scoped contexts are interpreted exactly as pyld does.
+Whenever a context or document uses a feature the fast path does not
+implement, ``UnsupportedFeature`` is raised and the caller falls back to
+pyld.
+"""
+
+import re
+from typing import Any, NamedTuple
+
+from pyld import jsonld
+
+# see pyld.jsonld._is_absolute_iri
+_ABSOLUTE_IRI = re.compile(r"^([A-Za-z][A-Za-z0-9+-.]*|_):[^\s]*$")
+_KEYWORD_LIKE = re.compile(r"^@[a-zA-Z]+$")
+_SCALAR_TYPES = (str, bool, int, float)
+_ACTIVE_CONTEXT_KEYS = {"mappings", "_uuid", "processingMode"}
+_TERM_KEYS = {"@id", "@type", "@container", "@context", "protected", "reverse"}
+
+
+class UnsupportedFeature(Exception):
+    """The context or document requires the full JSON-LD algorithms."""
+
+
+class Term(NamedTuple):
+    iri: str
+    type: str | None
+    is_set: bool
+    context: Any
+
+
+class CompiledContext:
+    """Term table of a processed JSON-LD context.
+
+    Use ``compile`` to create an instance from a (local) context.
+    """
+
+    def __init__(self, active_ctx: dict, options: dict):
+        self._active_ctx = active_ctx
+        self._options = options
+        self._scoped: dict[str, CompiledContext] = {}
+        self.terms: dict[str, Term] = {}
+        self.prefixes: dict[str, str] = {}
+        self.keyword_aliases: dict[str, str] = {}
+        self._inverse: dict[str, list[str]] = {}
+        self._keyword_terms: dict[str, list[str]] = {"@id": [], "@type": []}
+
+        unsupported = set(active_ctx) - _ACTIVE_CONTEXT_KEYS
+        if unsupported:
+            raise UnsupportedFeature(f"context uses {sorted(unsupported)}")
+        for name, mapping in active_ctx["mappings"].items():
+            if mapping is None:
+                raise UnsupportedFeature(f"term {name!r} is mapped to null")
+            keys = {k for k in mapping if not k.startswith("_")}
+            if keys - _TERM_KEYS or mapping.get("reverse"):
+                raise UnsupportedFeature(f"term {name!r} uses {sorted(keys - _TERM_KEYS)}")
+            iri = mapping["@id"]
+            if iri in ("@id", "@type"):
+                self.keyword_aliases[name] = iri
+                self._keyword_terms[iri].append(name)
+                continue
+            if iri.startswith("@"):
+                raise UnsupportedFeature(f"term {name!r} is an alias of {iri}")
+            container = mapping.get("@container")
+            if container is not None and container != ["@set"]:
+                raise UnsupportedFeature(f"term {name!r} uses container {container}")
+            type_ = mapping.get("@type")
+            if type_ is not None and type_.startswith("@") and type_ != "@id":
+                raise UnsupportedFeature(f"term {name!r} uses type {type_}")
+            self.terms[name] = Term(iri, type_, container is not None, mapping.get("@context"))
+            if mapping.get("_prefix"):
+                self.prefixes[name] = iri
+            self._inverse.setdefault(iri, []).append(name)
+
+    @classmethod
+    def compile(cls, context, document_loader=None) -> "CompiledContext":
+        """Process the local context with pyld and build its term table.
+
+        Raises UnsupportedFeature (or a pyld JsonLdError) if the context
+        cannot be handled by the fast path."""
+        options = {"base": "", "processingMode": "json-ld-1.1"}
+        if document_loader is not None:
+            options["documentLoader"] = document_loader
+        processor = jsonld.JsonLdProcessor()
+        active_ctx = processor.process_context(processor._get_initial_context(options), context, options)
+        return cls(active_ctx, options)
+
+    def _get_scoped(self, name: str) -> "CompiledContext":
+        """Return the context for values of the term name (property-scoped
+        context applied on top of this one)."""
+        term = self.terms[name]
+        if term.context is None:
+            return self
+        scoped = self._scoped.get(name)
+        if scoped is None:
+            options = {**self._options, "overrideProtected": True}
+            active_ctx = jsonld.JsonLdProcessor().process_context(self._active_ctx, term.context, options)
+            scoped = CompiledContext(active_ctx, self._options)
+            self._scoped[name] = scoped
+        return scoped
+
+    # expansion
+
+    def expand_iri(self, value, vocab: bool) -> str:
+        """Expand a term, compact IRI or absolute IRI. Terms are only
+        used if vocab is True (property names and type values)."""
+        if not isinstance(value, str) or value.startswith("@"):
+            raise UnsupportedFeature(f"cannot expand {value!r}")
+        if vocab:
+            if value in self.keyword_aliases:
+                raise UnsupportedFeature(f"keyword alias {value!r} used as value")
+            term = self.terms.get(value)
+            if term is not None:
+                if term.context is not None:
+                    raise UnsupportedFeature(f"type-scoped context of {value!r}")
+                return term.iri
+        colon = value.find(":")
+        if colon > 0:
+            prefix, suffix = value[:colon], value[colon + 1 :]
+            if prefix == "_" or suffix.startswith("//"):
+                return value
+            prefix_iri = self.prefixes.get(prefix)
+            if prefix_iri is not None:
+                return prefix_iri + suffix
+            if _ABSOLUTE_IRI.match(value):
+                return value
+        raise UnsupportedFeature(f"relative IRI {value!r}")
+
+    def expand(self, document: dict) -> dict:
+        """Expand a single node object without embedded context.
+        Returns the expanded node (pyld wraps it into a list)."""
+        node = self._expand_node(document)
+        if len(node) == 0 or list(node) == ["@id"]:
+            raise UnsupportedFeature("free-floating node")
+        return node
+
+    def _expand_node(self, node) -> dict:
+        if not isinstance(node, dict) or "@context" in node:
+            raise UnsupportedFeature("embedded context")
+        result = {}
+        for key in sorted(node):
+            value = node[key]
+            name = None
+            if key in self.keyword_aliases:
+                expanded_key = self.keyword_aliases[key]
+            elif key.startswith("@"):
+                if not _KEYWORD_LIKE.match(key):
+                    raise UnsupportedFeature(f"key {key!r}")
+                if key not in ("@id", "@type"):
+                    raise UnsupportedFeature(f"keyword {key}")
+                expanded_key = key
+            elif key in self.terms:
+                name = key
+                expanded_key = self.terms[key].iri
+            elif ":" in key:
+                expanded_key = self.expand_iri(key, vocab=True)
+            else:
+                continue  # not mapped to an IRI, dropped by JSON-LD expansion
+
+            if expanded_key in ("@id", "@type"):
+                if expanded_key in result:
+                    raise UnsupportedFeature(f"colliding keywords {expanded_key}")
+                if expanded_key == "@id":
+                    result["@id"] = self.expand_iri(value, vocab=False)
+                else:
+                    types = value if isinstance(value, list) else [value]
+                    result["@type"] = [self.expand_iri(t, vocab=True) for t in types]
+                continue
+            if value is None:
+                continue
+
+            term = self.terms[name] if name is not None else None
+            ctx = self._get_scoped(name) if name is not None else self
+            type_ = term.type if term is not None else None
+            items = []
+            for item in value if isinstance(value, list) else [value]:
+                if item is None:
+                    continue
+                if isinstance(item, dict):
+                    items.append(ctx._expand_node(item))
+                elif isinstance(item, str) and type_ == "@id":
+                    items.append({"@id": ctx.expand_iri(item, vocab=False)})
+                elif isinstance(item, _SCALAR_TYPES):
+                    if type_ is None or type_ == "@id":
+                        items.append({"@value": item})
+                    else:
+                        items.append({"@type": type_, "@value": item})
+                else:
+                    raise UnsupportedFeature(f"value {item!r}")
+            result.setdefault(expanded_key, []).extend(items)
+        return result
+
+    # compaction
+
+    def _get_keyword_alias(self, keyword: str) -> str:
+        terms = self._keyword_terms[keyword]
+        if not terms:
+            return keyword
+        if len(terms) > 1:
+            raise UnsupportedFeature(f"multiple aliases for {keyword}")
+        return terms[0]
+
+    def compact_iri(self, iri, vocab: bool) -> str:
+        """Compact an absolute IRI to a compact IRI (shortest, then
+        lexicographically least prefix). Terms are not selected."""
+        if not isinstance(iri, str) or not _ABSOLUTE_IRI.match(iri):
+            raise UnsupportedFeature(f"cannot compact {iri!r}")
+        if vocab and iri in self._inverse:
+            raise UnsupportedFeature(f"term selection for {iri!r}")
+        best = None
+        for prefix, prefix_iri in self.prefixes.items():
+            if len(iri) > len(prefix_iri) and iri.startswith(prefix_iri):
+                candidate = prefix + ":" + iri[len(prefix_iri) :]
+                if candidate in self._active_ctx["mappings"]:
+                    raise UnsupportedFeature(f"compact IRI {candidate!r} is a term")
+                if best is None or (len(candidate), candidate) < (len(best), best):
+                    best = candidate
+        if best is not None:
+            return best
+        if iri[: iri.find(":")] in self._active_ctx["mappings"]:
+            raise UnsupportedFeature(f"absolute IRI {iri!r} confused with prefix")
+        return iri
+
+    def compact(self, document) -> dict:
+        """Compact an expanded node object (or a list with one node
+        object). The returned dict does not contain a @context entry."""
+        if isinstance(document, list):
+            if len(document) != 1:
+                raise UnsupportedFeature("multiple nodes")
+            document = document[0]
+        if not isinstance(document, dict) or set(document) <= {"@id"}:
+            raise UnsupportedFeature("free-floating node")
+        return self._compact_node(document)
+
+    def _compact_node(self, node) -> dict:
+        if not isinstance(node, dict) or "@value" in node:
+            raise UnsupportedFeature("not a node object")
+        result = {}
+        for key in sorted(node):
+            value = node[key]
+            if key == "@id":
+                result[self._get_keyword_alias("@id")] = self.compact_iri(value, vocab=False)
+            elif key == "@type":
+                types = [self.compact_iri(t, vocab=True) for t in (value if isinstance(value, list) else [value])]
+                result[self._get_keyword_alias("@type")] = types[0] if len(types) == 1 else types
+            elif key.startswith("@") or not _ABSOLUTE_IRI.match(key):
+                raise UnsupportedFeature(f"key {key!r}")
+            else:
+                names = self._inverse.get(key)
+                if not isinstance(value, list) or (names is not None and len(names) != 1):
+                    raise UnsupportedFeature(f"term selection for {key!r}")
+                if names is None:
+                    # no term, use a compact IRI without type coercion
+                    name = self.compact_iri(key, vocab=True)
+                    term = Term(key, None, False, None)
+                    ctx = self
+                else:
+                    name = names[0]
+                    term = self.terms[name]
+                    ctx = self._get_scoped(name)
+                items = [ctx._compact_value(item, term) for item in value]
+                result[name] = items if term.is_set or len(items) != 1 else items[0]
+        return result
+
+    def _compact_value(self, item, term: Term):
+        if not isinstance(item, dict):
+            raise UnsupportedFeature(f"value {item!r}")
+        if "@value" in item:
+            value = item["@value"]
+            if set(item) - {"@value", "@type"} or not isinstance(value, _SCALAR_TYPES):
+                raise UnsupportedFeature(f"value object {item!r}")
+            if term.type == "@id" or item.get("@type") != term.type:
+                raise UnsupportedFeature(f"value {item!r} does not match term type")
+            return value
+        if set(item) == {"@id"}:
+            if term.type == "@id":
+                return self.compact_iri(item["@id"], vocab=False)
+            if term.type is None:
+                return {self._get_keyword_alias("@id"): self.compact_iri(item["@id"], vocab=False)}
+            raise UnsupportedFeature(f"node reference for typed term {term}")
+        if term.type not in (None, "@id"):
+            raise UnsupportedFeature(f"node object for typed term {term}")
+        return self._compact_node(item)
+
+
+def compile_context(context, document_loader=None) -> CompiledContext | None:
+    """Return the compiled context or None if the context is not supported
+    by the fast path."""
+    try:
+        return CompiledContext.compile(context, document_loader)
+    except (UnsupportedFeature, jsonld.JsonLdError):
+        return None
@@ -1,4 +1,5 @@
 import time
+from array import array
 
 import pytest
 
@@ -273,6 +274,204 @@ def _run_performance(pydantic_version):
     print(f"[{pydantic_version}] Accessed a specific link in {elapsed:.6f} seconds")
 
 
+def test_synced_list_wrapper_cache():
+    Entity, _LinkedBaseModelList = _define_entity("v2")
+
+    e1 = Entity(id="ex:e1", name="Entity 1")
+    e2 = Entity(id="ex:e2", name="Entity 2")
+    e3 = Entity(id="ex:e3", name="Entity 3", links=[e1, e2])
+
+    # the wrapper is created once and reused
+    links = e3.links
+    assert e3.links is links
+    assert links.has_iri("ex:e2") and not links.has_iri("ex:e3")
+
+    # modifications through the wrapper keep the cache valid
+    links.append(e1)
+    assert e3.links is links
+    assert e3.__iris__["links"] == ["ex:e1", "ex:e2", "ex:e1"]
+    links.remove(e1)
+    assert links.has_iri("ex:e1")
+    links.remove(e1)
+    assert not links.has_iri("ex:e1")
+    assert e3.__iris__["links"] == ["ex:e2"]
+
+    # assignment invalidates the cached wrapper
+    e3.links = [e1]
+    assert e3.links is not links
+    assert e3.links == [e1]
+    assert e3.links.has_iri("ex:e1") and not e3.links.has_iri("ex:e2")
+
+    # every modification of the wrapper is written through to the field
+    e4 = Entity(id="ex:e4", name="Entity 4")
+
+    def check(iris):
+        assert [e.id for e in e3.links] == iris
+        assert e3.__dict__["links"] == list(e3.links)
+        assert e3.to_json()["links"] == iris
+
+    e3.links = [e1, e2, e4]
+    e3.links.pop()
+    check(["ex:e1", "ex:e2"])
+    e3.links[0] = e4
+    check(["ex:e4", "ex:e2"])
+    e3.links.insert(1, e1)
+    check(["ex:e4", "ex:e1", "ex:e2"])
+    e3.links.sort(key=lambda e: e.id)
+    check(["ex:e1", "ex:e2", "ex:e4"])
+    e3.links.reverse()
+    check(["ex:e4", "ex:e2", "ex:e1"])
+    del e3.links[1]
+    check(["ex:e4", "ex:e1"])
+    e3.links[:1] = [e2, e2]
+    check(["ex:e2", "ex:e2", "ex:e1"])
+    e3.links.extend(x for x in [e4])
+    check(["ex:e2", "ex:e2", "ex:e1", "ex:e4"])
+    e3.links.clear()
+    check([])
+
+    # the cache is not carried into copies and pickles
+    import copy
+
+    e3.links = [e1, e2]
+    links = e3.links
+    for clone in (e3.model_copy(), e3.model_copy(deep=True), copy.copy(e3)):
+        assert clone.__pydantic_private__["_synced_lists"] is None
+        assert clone.links is not links and clone.links == links
+    assert e3.__getstate__()["__pydantic_private__"]["_synced_lists"] is None
+    assert e3.links is links
+
+
+def test_linked_base_model_list_indexes():
+    Entity, LinkedBaseModelList = _define_entity("v2")
+
+    el = LinkedBaseModelList[Entity]([Entity(id=f"ex:e{i}", name=f"Entity {i % 3}") for i in range(9)])
+    el.create_index("name")
+
+    # IRI lookup, kept consistent on modification
+    assert el["ex:e4"].id == "ex:e4"
+    el.append(Entity(id="ex:e9", name="Entity 0"))
+    assert el["ex:e9"].id == "ex:e9"
+    el.remove(el["ex:e0"])
+    assert el["ex:e1"] is el[0]
+    with pytest.raises(KeyError):
+        el["ex:e0"]
+    el.extend([Entity(id="ex:e10", name="Entity 1")])
+    assert el["ex:e10"] is el[-1]
+
+    # equality queries use the value index
+    assert [e.id for e in el[Entity.name == "Entity 0"]] == ["ex:e3", "ex:e6", "ex:e9"]
+    assert [e.id for e in el["@name=='Entity 1'"]] == ["ex:e1", "ex:e4", "ex:e7", "ex:e10"]
+    el.insert(0, Entity(id="ex:e11", name="Entity 1"))
+    assert [e.id for e in el[Entity.name == "Entity 1"]] == ["ex:e11", "ex:e1", "ex:e4", "ex:e7", "ex:e10"]
+    assert len(el[Entity.name == "Entity 3"]) == 0
+
+    # AND / OR queries
+    r = el[(Entity.name == "Entity 0") & (Entity.id > "ex:e4")]
+    assert [e.id for e in r] == ["ex:e6", "ex:e9"]
+    r = el[Query(op1=Entity.name == "Entity 2", operator="or", op2=Entity.id == "ex:e1")]
+    assert [e.id for e in r] == ["ex:e1", "ex:e2", "ex:e5", "ex:e8"]
+    r = el[(Entity.id != "ex:e2") & ((Entity.name == "Entity 2") & (Entity.id < "ex:e8"))]
+    assert [e.id for e in r] == ["ex:e5"]
+
+
+def test_linked_base_model_list_columns():
+    Entity, LinkedBaseModelList = _define_entity("v2")
+
+    el = LinkedBaseModelList[Entity]([
+        Entity(id="ex:a", name="A", links=["ex:x", "ex:y"]),
+        None,
+        Entity(id="ex:b", name="B"),
+    ])
+
+    # list methods are not shadowed by attribute broadcasting
+    assert el.count(None) == 1
+    assert el.get_item_type() is Entity
+
+    assert el.column("name") == ["A", None, "B"]
+    # IRI columns are returned without resolving the references
+    assert el.column("links") == [["ex:x", "ex:y"], None, None]
+    columns = el.to_columns(["id", "type"])
+    assert columns == {"id": ["ex:a", None, "ex:b"], "type": ["ex:Entity", None, "ex:Entity"]}
+    assert set(el.to_columns()) == {"id", "name", "type", "links"}
+
+    from oold.model import LinkedBaseModel
+
+    class Measurement(LinkedBaseModel):
+        id: str
+        value: float | int
+        count: int
+
+    ml = LinkedBaseModelList[Measurement]([
+        Measurement(id="ex:m1", value=1, count=3),
+        Measurement(id="ex:m2", value=2.5, count=4),
+    ])
+    column = ml.column("value", use_numpy=False)
+    assert isinstance(column, array) and column.typecode == "d"
+    assert list(column) == [1.0, 2.5]
+    assert list(ml.column("count", use_numpy=False)) == [3, 4]
+    # values beyond the array types are returned as a list
+    ml.append(Measurement(id="ex:m3", value=2**1100, count=2**70))
+    assert ml.column("count") == [3, 4, 2**70]
+    assert ml.column("value") == [1.0, 2.5, 2**1100]
+    ml[2] = Measurement(id="ex:m3", value=2**70, count=-(2**63))
+    assert list(ml.column("count", use_numpy=False)) == [3, 4, -(2**63)]
+    assert list(ml.column("value", use_numpy=False)) == [1.0, 2.5, float(2**70)]
+    with pytest.raises(AttributeError):
+        _ = el.does_not_exist
+
+
+def test_prefetch(monkeypatch):
+    from test_backends import CountingStore
+
+    from oold.backend import interface
+    from oold.backend.routing import RoutingTable
+    from oold.model import prefetch
+
+    for name in ("_resolvers", "_backends"):
+        monkeypatch.setattr(interface, name, {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+    monkeypatch.setattr(interface, "_backend_routes", RoutingTable())
+
+    Entity, _LinkedBaseModelList = _define_entity("v2")
+
+    backend = CountingStore()
+    set_backend(SetBackendParam(iri="ex", backend=backend))
+
+    # a -> b1, b2; b1 -> c1; b2 -> c1, c2
+    for e in [
+        Entity(id="ex:a", name="a", links=["ex:b1", "ex:b2"]),
+        Entity(id="ex:b1", name="b1", links=["ex:c1"]),
+        Entity(id="ex:b2", name="b2", links=["ex:c1", "ex:c2"]),
+        Entity(id="ex:c1", name="c1"),
+        Entity(id="ex:c2", name="c2"),
+    ]:
+        e.store_jsonld()
+    backend.requested.clear()
+
+    a = Entity.from_json(backend._store["ex:a"])
+    a2 = Entity.from_json(backend._store["ex:a"])
+    nodes = prefetch([a, a2], paths=["links.links"])
+    # one request per level, each IRI requested once
+    assert backend.requested == [["ex:b1", "ex:b2"], ["ex:c1", "ex:c2"]]
+    assert set(nodes) == {"ex:b1", "ex:b2", "ex:c1", "ex:c2"}
+
+    # the graph is wired, no further requests on access
+    assert [e.name for e in a.links] == ["b1", "b2"]
+    assert [e.name for e in a.links[1].links] == ["c1", "c2"]
+    assert a.links[0].links[0] is a.links[1].links[0]
+    assert a2.links[0] is a.links[0]
+    assert len(backend.requested) == 2
+
+    # depth-based prefetch of all range fields
+    backend.requested.clear()
+    a = Entity.from_json(backend._store["ex:a"])
+    prefetch(a, depth=3)
+    assert len(backend.requested) == 2
+    assert a.links[0].links[0].name == "c1"
+    assert len(backend.requested) == 2
+
+
 @pytest.mark.parametrize("pydantic_version", ["v1", "v2"])
 def test_queries(pydantic_version):
     _run_queries(pydantic_version)
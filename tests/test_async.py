@@ -0,0 +1,234 @@
+"""Tests of the async resolver / backend interface."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from pydantic import ConfigDict
+from rdflib import Graph
+
+from oold.backend import interface
+from oold.backend.document_store import SimpleDictDocumentStore, SqliteDocumentStore
+from oold.backend.interface import (
+    Backend,
+    ResolveParam,
+    Resolver,
+    SetBackendParam,
+    SetResolverParam,
+    StoreParam,
+    StoreResult,
+    set_backend,
+    set_resolver,
+)
+from oold.backend.routing import RoutingTable
+from oold.backend.sparql import SparqlResolver
+from oold.model import LinkedBaseModel
+
+
+class AsyncEntity(LinkedBaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "@context": {
+                "id": "@id",
+                "type": "@type",
+                "schema": "https://schema.org/",
+                "ex": "https://example.com/",
+                "name": "schema:name",
+            },
+            "$id": "https://example.com/AsyncEntity",
+        }
+    )
+    type: str | None = "ex:AsyncEntity"
+    name: str
+
+    def get_iri(self):
+        return "ex:" + self.name
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Isolate the resolver / backend registrations of a test."""
+    for name in ("_resolvers", "_backends"):
+        monkeypatch.setattr(interface, name, {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+    monkeypatch.setattr(interface, "_backend_routes", RoutingTable())
+
+
+@pytest.fixture
+def sparql_endpoint():
+    """Local stub of a SPARQL HTTP endpoint answering CONSTRUCT queries
+    on an rdflib graph. Yields the endpoint URL, the graph and the list
+    of received queries."""
+    graph = Graph()
+    queries = []
+    # the SPARQL parser of rdflib is not thread-safe
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self, query: str):
+            with lock:
+                queries.append(query)
+                body = graph.query(query).serialize(format="json-ld", encoding="utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/ld+json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond(parse_qs(urlparse(self.path).query)["query"][0])
+
+        def do_POST(self):
+            data = self.rfile.read(int(self.headers["Content-Length"])).decode()
+            self._respond(parse_qs(data)["query"][0])
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/sparql", graph, queries
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sparql_resolver_async(sparql_endpoint, registry):
+    url, graph, queries = sparql_endpoint
+    for name in ("Alice", "Bob"):
+        graph.parse(data=AsyncEntity(name=name).to_jsonld(), format="json-ld")
+    resolver = SparqlResolver(endpoint=url)
+    request = ResolveParam(iris=["ex:Alice", "ex:Bob", "ex:Nobody"], model_cls=AsyncEntity)
+
+    nodes = asyncio.run(resolver.aresolve(request)).nodes
+    assert [node.name if node else None for node in nodes.values()] == ["Alice", "Bob", None]
+    # one query per batch
+    assert len(queries) == 1
+    # the sync API returns the same
+    nodes = resolver.resolve(request).nodes
+    assert [node.name if node else None for node in nodes.values()] == ["Alice", "Bob", None]
+
+    set_resolver(SetResolverParam(iri="ex", resolver=resolver))
+
+    async def lookup():
+        return await asyncio.gather(
+            AsyncEntity.aoold_query("ex:Alice"),
+            AsyncEntity._aresolve(["ex:Bob", "ex:Alice"], AsyncEntity),
+        )
+
+    alice, nodes = asyncio.run(lookup())
+    assert alice.name == "Alice"
+    assert [node.name for node in nodes.values()] == ["Bob", "Alice"]
+
+
+def test_sparql_resolver_async_batches(sparql_endpoint, registry):
+    """Large requests are split into batches, at most max_concurrency
+    of them are sent at once."""
+    url, graph, queries = sparql_endpoint
+    names = [f"E{i}" for i in range(20)]
+    for name in names:
+        graph.parse(data=AsyncEntity(name=name).to_jsonld(), format="json-ld")
+    resolver = SparqlResolver(endpoint=url, batch_size=3, max_concurrency=2)
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    resolve_batch = resolver._resolve_batch
+
+    def counting_resolve_batch(sparql, iris):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            return resolve_batch(sparql, iris)
+        finally:
+            with lock:
+                active -= 1
+
+    resolver._resolve_batch = counting_resolve_batch
+    iris = ["https://example.com/E0"] + [f"ex:{name}" for name in names[1:]] + ["ex:Nobody"]
+    jsonld_dicts = asyncio.run(resolver.aresolve_iris(iris))
+    assert list(jsonld_dicts) == iris
+    assert jsonld_dicts["ex:Nobody"] is None
+    assert [jsonld_dicts[iri]["@id"] for iri in iris[:-1]] == [f"https://example.com/{name}" for name in names]
+    assert len(queries) == 7
+    assert peak <= 2
+
+
+@pytest.mark.parametrize("store_cls", [SimpleDictDocumentStore, SqliteDocumentStore])
+def test_async_model_api(store_cls, registry):
+    store = store_cls(db_path=":memory:") if store_cls is SqliteDocumentStore else store_cls()
+    set_backend(SetBackendParam(iri="ex", backend=store))
+
+    async def run():
+        await asyncio.gather(*(AsyncEntity(name=name).astore_jsonld() for name in ("A", "B")))
+        a = await AsyncEntity.aoold_query("ex:A")
+        entities = await AsyncEntity.aoold_query(["ex:B", "ex:A"])
+        return a, entities
+
+    a, entities = asyncio.run(run())
+    assert a.name == "A"
+    assert [e.name for e in entities] == ["B", "A"]
+    # stored asynchronously, readable synchronously
+    assert AsyncEntity["ex:B"].name == "B"
+    result = asyncio.run(AsyncEntity.aoold_query(AsyncEntity.name == "B"))
+    assert [e.name for e in result] == ["B"]
+
+
+def test_sync_async_adapters():
+    class AsyncOnlyBackend(Backend):
+        """Implements the async API only."""
+
+        format: interface.LinkedDataFormat = interface.LinkedDataFormat.JSON
+        documents: dict = {}
+
+        async def aresolve_iris(self, iris):
+            await asyncio.sleep(0)
+            return {iri: self.documents.get(iri) for iri in iris}
+
+        async def astore_json_dicts(self, json_dicts):
+            await asyncio.sleep(0)
+            self.documents.update(json_dicts)
+            return StoreResult(success=True)
+
+    backend = AsyncOnlyBackend()
+    backend.store(StoreParam(nodes={"ex:A": AsyncEntity(name="A")}))
+    assert backend.resolve(ResolveParam(iris=["ex:A"], model_cls=AsyncEntity)).nodes["ex:A"].name == "A"
+
+    async def sync_call_in_loop():
+        # a blocking call from async code runs on a separate loop
+        return backend.resolve_iris(["ex:A"])
+
+    assert asyncio.run(sync_call_in_loop())["ex:A"]["name"] == "A"
+
+    # the sync only SimpleDictDocumentStore is adapted the other way round
+    store = SimpleDictDocumentStore()
+    asyncio.run(store.astore(StoreParam(nodes={"ex:B": AsyncEntity(name="B")})))
+    assert asyncio.run(store.aresolve_iris(["ex:B"]))["ex:B"]["name"] == "B"
+
+    with pytest.raises(NotImplementedError):
+        Resolver().resolve_iris(["ex:A"])
+    with pytest.raises(NotImplementedError):
+        asyncio.run(Resolver().aresolve_iris(["ex:A"]))
+
+
+def test_async_fan_out_timeout(registry, caplog):
+    class SlowResolver(Resolver):
+        async def aresolve_iris(self, iris):
+            await asyncio.sleep(5)
+            return {}
+
+    store = SimpleDictDocumentStore()
+    store.store(StoreParam(nodes={"ex:A": AsyncEntity(name="A"), "ex:B": AsyncEntity(name="B")}))
+    set_resolver(SetResolverParam(iri="ex", resolver=store))
+    set_resolver(SetResolverParam(iri="slow", resolver=SlowResolver(timeout=0.1)))
+
+    with caplog.at_level("WARNING", logger="oold.backend.interface"):
+        entities = asyncio.run(AsyncEntity.aoold_query(["ex:A", "ex:B"]))
+    assert [e.name for e in entities] == ["A", "B"]
+    assert "Skipping SlowResolver: No response within 0.1 s" in caplog.text
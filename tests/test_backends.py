@@ -12,6 +12,20 @@ from oold.backend.interface import (
 )
 
 
+class CountingStore(SimpleDictDocumentStore):
+    """Records the IRI lists passed to resolve_iris."""
+
+    requested: list[list[str]] = []
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self.requested = []
+
+    def resolve_iris(self, iris):
+        self.requested.append(iris)
+        return super().resolve_iris(iris)
+
+
 def _store_procedure(store: Backend, pydantic_version="v2"):
     if pydantic_version == "v1":
         # based on pydantic v1
@@ -108,6 +122,195 @@ def test_sqlite_document_store(benchmark):
         _run(store)
 
 
+_STORE_FROM_PROCESS = """
+import sys
+from oold.backend.document_store import SqliteDocumentStore
+
+store = SqliteDocumentStore(db_path=sys.argv[1])
+for i in range(100):
+    store.store_json_dicts({f"ex:p{i}": {"id": f"ex:p{i}", "value": i}})
+"""
+
+
+def test_sqlite_connection_pool(tmp_path):
+    import sqlite3
+    import subprocess
+    import sys
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from oold.backend.document_store import SqliteDocumentStore
+
+    db_path = str(tmp_path / "entities.db")
+    store = SqliteDocumentStore(db_path=db_path, pool_size=4, cache_size=-4096, mmap_size=2**20)
+    with store._connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # normal
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+    store.store_json_dicts({f"ex:e{i}": {"id": f"ex:e{i}", "value": i} for i in range(100)})
+
+    # readers run concurrently with a writer of the same store and a
+    # writer in another process
+    stop = threading.Event()
+
+    def read():
+        count = 0
+        while not stop.is_set() or count == 0:
+            assert store.resolve_iris(["ex:e1"])["ex:e1"]["value"] == 1
+            count += 1
+        return count
+
+    def write():
+        for i in range(100):
+            store.store_json_dicts({f"ex:w{i}": {"id": f"ex:w{i}", "value": i}})
+
+    process = subprocess.Popen([sys.executable, "-c", _STORE_FROM_PROCESS, db_path])  # noqa: S603
+    with ThreadPoolExecutor(8) as threads:
+        readers = [threads.submit(read) for _ in range(6)]
+        threads.submit(write).result()
+        assert process.wait(timeout=60) == 0
+        stop.set()
+        assert all(reader.result() > 0 for reader in readers)
+
+    assert None not in store.resolve_iris([f"ex:w{i}" for i in range(100)]).values()
+    assert None not in store.resolve_iris([f"ex:p{i}" for i in range(100)]).values()
+    # connections are reused and bounded by the pool size
+    assert 0 < len(store._idle) <= 4
+
+    # a failed write is rolled back
+    with pytest.raises(sqlite3.Error), store._connection(write=True) as conn:
+        conn.execute("INSERT INTO entities (id, data) VALUES ('ex:x', '{}')")
+        conn.execute("INSERT INTO missing (id) VALUES ('ex:x')")
+    assert store.resolve_iris(["ex:x"]) == {"ex:x": None}
+
+    store.close()
+    assert store._idle == []
+    # the store reopens connections on demand
+    assert store.resolve_iris(["ex:e2"])["ex:e2"]["value"] == 2
+    store.close()
+
+
+def test_sqlite_query(monkeypatch):
+    """Queries are compiled to SQL and match the results of the
+    SimpleDictDocumentStore."""
+    from pydantic import ConfigDict
+
+    from oold.backend import interface
+    from oold.backend.document_store import SqliteDocumentStore, _compile_query
+    from oold.backend.interface import ComparisonOperator, Condition, Query, QueryParam
+    from oold.backend.routing import RoutingTable
+    from oold.model import LinkedBaseModel
+
+    class Item(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {"ex": "https://example.com/", "id": "@id", "name": "ex:name"},
+                "$id": "https://example.com/Item",
+            }
+        )
+        id: str
+        name: str
+        value: int | None = None
+        weight: float | None = None
+
+    docs = {f"ex:i{i}": {"id": f"ex:i{i}", "name": f"n{i % 3}", "value": i, "weight": i / 2} for i in range(20)}
+    docs["ex:i0"]["note"] = "x"
+    docs["ex:null"] = {"id": "ex:null", "name": "n0", "note": None}
+    docs["ex:quote"] = {"id": "ex:quote", "name": "it's", "value": 100}
+    sqlite_store = SqliteDocumentStore(db_path=":memory:", indexes=["name"])
+    sqlite_store.store_json_dicts(docs)
+    dict_store = SimpleDictDocumentStore()
+    dict_store.store_json_dicts(docs)
+
+    def cond(field, operator, value):
+        return Condition(field=field, operator=operator, value=value)
+
+    queries = [cond("name", op, "n1") for op in ComparisonOperator]
+    queries += [cond("value", op, 10) for op in ComparisonOperator]
+    queries += [
+        cond("weight", "ge", 4.5),
+        cond("name", "eq", "it's"),
+        cond("note", "eq", None),
+        cond("note", "ne", None),
+        cond("note", "ne", "x"),
+        cond("missing", "ne", 1),
+        Query(op1=cond("name", "eq", "n0"), operator="and", op2=cond("value", "gt", 5)),
+        Query(
+            op1=Query(op1=cond("name", "eq", "n2"), operator="or", op2=cond("value", "lt", 3)),
+            operator="and",
+            op2=cond("value", "ne", 2),
+        ),
+    ]
+    for query in queries:
+        expected = dict_store._query(query)
+        assert set(sqlite_store._query_dicts(query)) == expected, query
+        assert expected or query.field == "missing"
+
+    result = sqlite_store.query(QueryParam(query=cond("name", "eq", "n1") & cond("value", "ge", 10), model_cls=Item))
+    assert sorted(node.value for node in result.nodes.values()) == [10, 13, 16, 19]
+    with pytest.raises(ValueError):
+        sqlite_store._query_dicts(cond("value", "lt", None))
+
+    # equality and range filters use the expression index
+    def plan(query):
+        condition, params = _compile_query(query)
+        with sqlite_store._connection() as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM entities WHERE {condition}", params)  # noqa: S608
+            return " ".join(row[-1] for row in rows)
+
+    assert "idx_entities_name" in plan(cond("name", "eq", "n1"))
+    assert "idx_entities_name" in plan(cond("name", "gt", "n1"))
+    assert "idx_entities_value" not in plan(cond("value", "eq", 1))
+    sqlite_store.create_index("value")
+    assert "idx_entities_value" in plan(cond("value", "le", 1))
+    sqlite_store.drop_index("value")
+    # (a different statement, the cached EXPLAIN is not prepared again)
+    assert "idx_entities_value" not in plan(cond("value", "lt", 1))
+    with pytest.raises(ValueError):
+        sqlite_store.create_index('na"me')
+
+    # class-level queries reach the store
+    for name in ("_resolvers", "_backends"):
+        monkeypatch.setattr(interface, name, {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+    set_resolver(SetResolverParam(iri="ex", resolver=sqlite_store))
+    assert sorted(item.id for item in Item[Item.name == "it's"]) == ["ex:quote"]
+
+
+def test_sqlite_bulk_resolve(tmp_path):
+    """Large IRI lists are resolved in chunks or joined from a temporary
+    table, missing IRIs map to None."""
+    from oold.backend.document_store import SqliteDocumentStore
+
+    store = SqliteDocumentStore(db_path=str(tmp_path / "entities.db"))
+    store.store_json_dicts({f"ex:e{i}": {"id": f"ex:e{i}", "value": i} for i in range(3000)})
+    # more IRIs than parameters allowed per statement
+    iris = [f"ex:e{i}" for i in range(3500, -1, -2)]
+    expected = [(iri, {"id": iri, "value": int(iri[4:])} if int(iri[4:]) < 3000 else None) for iri in iris]
+
+    assert list(store.resolve_iris(iris).items()) == expected
+    assert list(store.iter_resolve_iris(iris, chunk_size=100)) == expected
+    store.temp_table_threshold = 1000
+    assert list(store.iter_resolve_iris(iris, chunk_size=100)) == expected
+    # an abandoned generator releases the temporary table
+    rows = store.iter_resolve_iris(iris)
+    assert next(rows) == expected[0]
+    rows.close()
+    assert list(store.resolve_iris(iris).items()) == expected
+    store.close()
+
+    memory_store = SqliteDocumentStore(db_path=":memory:")
+    memory_store.store_json_dicts({"ex:a": {"id": "ex:a"}})
+    assert memory_store.resolve_iris(["ex:b", "ex:a"]) == {"ex:b": None, "ex:a": {"id": "ex:a"}}
+    # the chunked default of other resolvers
+    dict_store = SimpleDictDocumentStore()
+    dict_store.store_json_dicts({"ex:a": {"id": "ex:a"}})
+    assert list(dict_store.iter_resolve_iris(["ex:b", "ex:a"], chunk_size=1)) == [
+        ("ex:b", None),
+        ("ex:a", {"id": "ex:a"}),
+    ]
+
+
 @pytest.mark.benchmark(group="backend")
 def test_local_sparql_store(benchmark):
     from oold.backend.sparql import LocalSparqlBackend
@@ -153,6 +356,156 @@ def test_simple_dict_file_persistence(tmp_path):
     assert loaded.name == "Foo"
 
 
+def test_simple_dict_journal(tmp_path):
+    """With journal=True, stores append to a journal, which is replayed
+    on init and merged into the file by compaction."""
+    import errno
+    import json
+
+    file_path = tmp_path / "store.json"
+    store = SimpleDictDocumentStore(file_path=file_path, journal=True, sync_batch_size=10)
+    for i in range(5):
+        store.store_json_dicts({f"ex:e{i}": {"name": f"e{i}"}})
+    store.store_json_dicts({"ex:e0": {"name": "updated"}})
+    store.delete_iris(["ex:e1"])
+    # only the changes are written
+    assert not file_path.exists()
+    records = [json.loads(line) for line in store.journal_path.read_text().splitlines()]
+    assert len(records) == 7
+    assert records[-1] == {"op": "delete", "id": "ex:e1"}
+    store.close()
+
+    # replay
+    expected = {"ex:e0": {"name": "updated"}, "ex:e2": {"name": "e2"}, "ex:e3": {"name": "e3"}, "ex:e4": {"name": "e4"}}
+    assert SimpleDictDocumentStore(file_path=file_path, journal=True)._store == expected
+
+    # an interrupted last write is dropped, the journal stays appendable
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op": "upsert", "id": "ex:e5", "da')
+    replayed = SimpleDictDocumentStore(file_path=file_path, journal=True)
+    assert replayed._store == expected
+    replayed.store_json_dicts({"ex:e5": {"name": "e5"}})
+    replayed.close()
+    assert SimpleDictDocumentStore(file_path=file_path, journal=True)._store == {**expected, "ex:e5": {"name": "e5"}}
+    # a corrupt record in the middle is an error
+    store.journal_path.write_bytes(b'{"op": "upsert"\n{"op": "delete", "id": "ex:e2"}\n')
+    with pytest.raises(ValueError):
+        SimpleDictDocumentStore(file_path=file_path, journal=True)
+    store.journal_path.unlink()
+
+    # compaction writes the dict and clears the journal
+    store = SimpleDictDocumentStore(file_path=file_path, journal=True, compact_threshold=None)
+    for i in range(20):
+        store.store_json_dicts({f"ex:c{i}": {"name": f"c{i}"}})
+    store.compact()
+    assert store.journal_path.stat().st_size == 0
+    assert json.loads(file_path.read_text()) == {f"ex:c{i}": {"name": f"c{i}"} for i in range(20)}
+    store.store_json_dicts({"ex:c0": {"name": "after"}})
+    store.close()
+    reloaded = SimpleDictDocumentStore(file_path=file_path, journal=True, compact_threshold=5)
+    assert reloaded._store["ex:c0"] == {"name": "after"}
+    # automatic compaction once the journal outgrows the store
+    for i in range(40):
+        reloaded.store_json_dicts({"ex:c1": {"name": f"v{i}"}})
+    assert reloaded._journal_records < 20
+    assert SimpleDictDocumentStore(file_path=file_path)._store["ex:c1"]["name"] in {f"v{i}" for i in range(20, 40)}
+
+    # a failed journal write does not change the store
+    class FullDisk:
+        def __init__(self, file):
+            self.file = file
+
+        def write(self, data):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        def __getattr__(self, name):
+            return getattr(self.file, name)
+
+    reloaded._journal_file = FullDisk(reloaded._journal_file)
+    before = dict(reloaded._store)
+    with pytest.raises(OSError):
+        reloaded.store_json_dicts({"ex:c1": {"name": "lost"}, "ex:new": {"name": "lost"}})
+    with pytest.raises(OSError):
+        reloaded.delete_iris(["ex:c0"])
+    assert reloaded._store == before
+    reloaded._journal_file = reloaded._journal_file.file
+    reloaded.close()
+
+    with pytest.raises(ValueError):
+        SimpleDictDocumentStore(journal=True)
+
+
+def test_simple_dict_indexes(tmp_path):
+    """Indexed queries return the results of a full scan and only test
+    the candidates of the most selective index."""
+    import random
+
+    from oold.backend.interface import ComparisonOperator, Condition, Query
+
+    rng = random.Random(0)  # noqa: S311
+
+    def random_doc():
+        doc = {"name": rng.choice(["a", "b", "c", "d"]), "value": rng.randint(0, 50)}
+        if rng.random() < 0.1:
+            doc["tags"] = ["x"]
+        if rng.random() < 0.2:
+            del doc["name"]
+        return doc
+
+    docs = {f"ex:e{i}": random_doc() for i in range(300)}
+    scan = SimpleDictDocumentStore()
+    scan.store_json_dicts(docs)
+    indexed = SimpleDictDocumentStore(
+        file_path=tmp_path / "store.json",
+        journal=True,
+        indexes=["name", "value", "tags"],
+        sorted_indexes=["value", "name"],
+    )
+    indexed.store_json_dicts(docs)
+    # updates and deletes are reflected in the indexes
+    for i in range(0, 300, 7):
+        update = {f"ex:e{i}": random_doc()}
+        scan.store_json_dicts(update)
+        indexed.store_json_dicts(update)
+    scan.delete_iris([f"ex:e{i}" for i in range(0, 300, 11)])
+    indexed.delete_iris([f"ex:e{i}" for i in range(0, 300, 11)])
+    indexed.close()
+    # indexes are built from the replayed journal
+    replayed = SimpleDictDocumentStore(
+        file_path=tmp_path / "store.json", journal=True, indexes=["name", "tags"], sorted_indexes=["value"]
+    )
+
+    def cond(field, operator, value):
+        return Condition(field=field, operator=operator, value=value)
+
+    queries = [cond("name", op, "b") for op in ComparisonOperator]
+    queries += [cond("value", op, 25) for op in ComparisonOperator]
+    queries += [
+        cond("tags", "ne", "x"),
+        cond("missing", "eq", 1),
+        cond("name", "eq", "a") & cond("value", "lt", 10),
+        cond("value", "ge", 10) & cond("value", "le", 12) & cond("name", "ne", "a"),
+        Query(op1=cond("name", "eq", "d"), operator="or", op2=cond("value", "gt", 48) & cond("name", "eq", "c")),
+    ]
+    for query in queries:
+        expected = scan._query(query)
+        assert indexed._query(query) == expected, query
+        assert replayed._query(query) == expected, query
+    replayed.close()
+
+    # only the candidates of the most selective condition are tested
+    tested = []
+    matches = indexed._matches
+    indexed._matches = lambda query, doc: tested.append(doc) or matches(query, doc)
+    result = indexed._query(cond("name", "ne", "z") & cond("value", "eq", 3))
+    assert len(tested) == sum(doc.get("value") == 3 for doc in scan._store.values())
+    assert len(result) == sum(doc.get("value") == 3 and "name" in doc for doc in scan._store.values())
+    indexed.drop_index("value")
+    tested.clear()
+    indexed._query(cond("value", "eq", 3))
+    assert len(tested) == len(scan._store)
+
+
 def test_simple_dict_file_no_file():
     """SimpleDictDocumentStore without file_path works in-memory only."""
     store = SimpleDictDocumentStore()
@@ -160,6 +513,261 @@ def test_simple_dict_file_no_file():
     assert store._store == {}
 
 
+def test_session_identity_map(monkeypatch):
+    """Within a session each IRI resolves to a single canonical instance."""
+    from pydantic import ConfigDict, Field
+
+    from oold.backend import interface
+    from oold.backend import session as session_module
+    from oold.backend.routing import RoutingTable
+    from oold.backend.session import Session, get_session
+    from oold.model import LinkedBaseModel
+
+    for name in ("_resolvers", "_backends"):
+        monkeypatch.setattr(interface, name, {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+    monkeypatch.setattr(interface, "_backend_routes", RoutingTable())
+
+    class Node(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {"ex": "https://example.com/", "id": "@id", "type": "@type", "name": "ex:name"},
+                "iri": "ex:Node",
+            }
+        )
+        id: str
+        type: str | None = "ex:Node"
+        name: str
+        parent: "Node | None" = Field(None, json_schema_extra={"range": "ex:Node"})
+
+    store = CountingStore()
+    set_resolver(SetResolverParam(iri="ex", resolver=store))
+    set_backend(SetBackendParam(iri="ex", backend=store))
+    store.store_json_dicts({
+        "ex:root": {"id": "ex:root", "type": "ex:Node", "name": "root"},
+        "ex:a": {"id": "ex:a", "type": "ex:Node", "name": "a", "parent": "ex:root"},
+        "ex:b": {"id": "ex:b", "type": "ex:Node", "name": "b", "parent": "ex:root"},
+    })
+
+    # without a session every resolution creates a new instance
+    assert get_session() is None
+    assert Node["ex:root"] is not Node["ex:root"]
+
+    with Session() as session:
+        assert get_session() is session
+        store.requested.clear()
+        a, b = Node["ex:a"], Node["ex:b"]
+        assert a.parent is b.parent
+        assert a.parent is Node["ex:root"]
+        assert store.requested == [["ex:a"], ["ex:b"], ["ex:root"]]
+        assert session.hits == 2
+        assert session.misses == 3
+        # query results are mapped to the canonical instances
+        assert Node[Node.name == "a"][0] is a
+        # stored nodes become canonical
+        c = Node(id="ex:c", name="c")
+        store.store(StoreParam(nodes={"ex:c": c}))
+        assert Node["ex:c"] is c
+    assert get_session() is None
+
+    # LRU eviction
+    session = Session(max_size=2)
+    with session:
+        root = Node["ex:root"]
+        Node["ex:a"]
+        Node["ex:b"]
+        assert "ex:root" not in session
+        assert len(session) == 2
+        assert Node["ex:root"] is not root
+
+    # TTL eviction
+    now = [0.0]
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: now[0])
+    with Session(ttl=10) as session:
+        root = Node["ex:root"]
+        now[0] = 5.0
+        assert Node["ex:root"] is root
+        now[0] = 20.0
+        assert Node["ex:root"] is not root
+        assert (session.hits, session.misses) == (1, 2)
+
+    # nested sessions restore the outer one
+    with Session() as outer:
+        with Session() as inner:
+            assert get_session() is inner
+        assert get_session() is outer
+
+
+def test_resolver_routing(monkeypatch):
+    """IRIs are routed to the resolver with the longest matching prefix,
+    mixed batches are split per resolver."""
+    from pydantic import ConfigDict, Field
+
+    from oold.backend import interface
+    from oold.backend.interface import GetBackendParam, GetResolverParam, get_backend, get_resolver
+    from oold.backend.routing import PrefixMap, RoutingTable
+    from oold.model import LinkedBaseModel, prefetch
+
+    # routing without prefixes
+    table = RoutingTable()
+    table.register("ex", "compact")
+    table.register("https://example.com/", "expanded")
+    table.register("https://example.com/items/", "items")
+    assert table.lookup("ex:e1") == "compact"
+    assert table.lookup("https://example.com/e1") == "expanded"
+    assert table.lookup("https://example.com/items/1") == "items"
+    assert table.lookup("other:e1") is None
+    # with prefixes both forms match, the longest expanded prefix wins
+    prefixes = PrefixMap({"ex": "https://example.com/", "items": "https://example.com/items/"})
+    assert prefixes.compact("https://example.com/items/1") == ["items:1", "ex:items/1"]
+    assert table.lookup("ex:items/1", prefixes) == "items"
+    assert table.lookup("items:1", prefixes) == "items"
+    table.unregister("https://example.com/items/")
+    assert table.lookup("items:1", prefixes) == "expanded"
+
+    for name in ("_resolvers", "_backends"):
+        monkeypatch.setattr(interface, name, {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+    monkeypatch.setattr(interface, "_backend_routes", RoutingTable())
+
+    class Entity(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {
+                    "a": "https://a.example.org/",
+                    "b": "https://b.example.org/",
+                    "id": "@id",
+                    "type": "@type",
+                    "name": "a:name",
+                },
+                "iri": "a:Entity",
+            }
+        )
+        id: str
+        type: str | None = "a:Entity"
+        name: str
+        links: list["Entity"] | None = Field(None, json_schema_extra={"range": "a:Entity"})
+
+    store_a, store_b, store_items = CountingStore(), CountingStore(), CountingStore()
+    set_backend(SetBackendParam(iri="a", backend=store_a))
+    set_backend(SetBackendParam(iri="https://b.example.org/", backend=store_b))
+    set_backend(SetBackendParam(iri="a:items/", backend=store_items))
+
+    assert get_resolver(GetResolverParam(iri="b:y", model_cls=Entity)).resolver is store_b
+    assert get_resolver(GetResolverParam(iri="https://a.example.org/x", model_cls=Entity)).resolver is store_a
+    assert get_backend(GetBackendParam(iri="https://a.example.org/items/z", model_cls=Entity)).backend is store_items
+    with pytest.raises(ValueError, match="No resolvers found for c:x"):
+        get_resolver(GetResolverParam(iri="c:x", model_cls=Entity))
+
+    for iri in ("a:x", "b:y", "a:items/z"):
+        Entity(id=iri, name=iri).store_jsonld()
+    assert list(store_a._store) == ["a:x"]
+    assert list(store_b._store) == ["b:y"]
+    assert list(store_items._store) == ["a:items/z"]
+
+    root = Entity(id="a:root", name="root", links=["b:y", "a:x", "a:items/z", "a:missing"])
+    assert [e.name if e else None for e in root.links] == ["b:y", "a:x", "a:items/z", None]
+    assert store_a.requested == [["a:x", "a:missing"]]
+    assert store_b.requested == [["b:y"]]
+    assert store_items.requested == [["a:items/z"]]
+    assert [e.name for e in Entity.model_validate(["a:items/z", "b:y"])] == ["a:items/z", "b:y"]
+
+    # prefetch routes with the context of the owning class as well
+    for store in (store_a, store_b, store_items):
+        store.requested.clear()
+    root = Entity(id="a:root", name="root", links=["b:y", "a:x", "a:items/z"])
+    nodes = prefetch(root, ["links"])
+    assert sorted(nodes) == ["a:items/z", "a:x", "b:y"]
+    assert store_a.requested == [["a:x"]]
+    assert store_b.requested == [["b:y"]]
+    assert store_items.requested == [["a:items/z"]]
+    assert [e.name for e in root.links] == ["b:y", "a:x", "a:items/z"]
+
+
+def test_resolver_fan_out(monkeypatch, caplog):
+    """Class lookups only request the resolvers serving the class,
+    concurrently and with per-resolver timeouts."""
+    import threading
+
+    from pydantic import ConfigDict
+
+    from oold.backend import interface
+    from oold.backend.interface import get_resolvers
+    from oold.backend.routing import RoutingTable
+    from oold.model import LinkedBaseModel
+
+    monkeypatch.setattr(interface, "_resolvers", {})
+    monkeypatch.setattr(interface, "_resolver_routes", RoutingTable())
+
+    context = {"a": "https://a.example.org/", "id": "@id", "type": "@type", "name": "a:name"}
+
+    class Entity(LinkedBaseModel):
+        model_config = ConfigDict(json_schema_extra={"@context": context, "iri": "a:Entity"})
+        id: str
+        type: str | None = "a:Entity"
+        name: str
+
+    class Person(Entity):
+        model_config = ConfigDict(json_schema_extra={"@context": context, "iri": "a:Person"})
+        type: str | None = "a:Person"
+
+    class Place(Entity):
+        model_config = ConfigDict(json_schema_extra={"@context": context, "iri": "a:Place"})
+        type: str | None = "a:Place"
+
+    people = CountingStore(class_iris=["https://a.example.org/Person"])
+    places = CountingStore(class_iris=["a:Place"], iri_prefixes=["a:places/"])
+    anything = CountingStore()
+    for name, store in [("people", people), ("places", places), ("anything", anything)]:
+        set_resolver(SetResolverParam(iri=name, resolver=store))
+    # registered under two prefixes, but requested once
+    set_resolver(SetResolverParam(iri="people2", resolver=people))
+    people.store(StoreParam(nodes={"a:p1": Person(id="a:p1", name="Alice")}))
+    places.store(StoreParam(nodes={"a:places/1": Place(id="a:places/1", name="Berlin")}))
+    anything.store(StoreParam(nodes={"a:p1": Person(id="a:p1", name="Alice"), "a:x": Entity(id="a:x", name="X")}))
+
+    assert get_resolvers(Person) == [people, anything]
+    assert get_resolvers(Place) == [places, anything]
+    # the stores may hold subclass instances
+    assert get_resolvers(Entity) == [people, places, anything]
+
+    assert Person["a:p1"].name == "Alice"
+    assert places.requested == []
+    assert [e.name for e in Person[["a:p1"]]] == ["Alice"]
+    # places only serves IRIs starting with a:places/
+    assert [e.name if e else None for e in Entity[["a:p1", "a:places/1", "a:x"]]] == ["Alice", "Berlin", "X"]
+    assert places.requested == [["a:places/1"]]
+    # query results are merged and deduplicated by IRI
+    assert [e.id for e in Entity[Entity.name == "Alice"]] == ["a:p1"]
+    assert [e.id for e in Place[Place.name == "Berlin"]] == ["a:places/1"]
+
+    release = threading.Event()
+
+    class BlockingStore(SimpleDictDocumentStore):
+        def resolve_iris(self, iris):
+            release.wait(5)
+            return super().resolve_iris(iris)
+
+        def query(self, param):
+            release.wait(5)
+            return super().query(param)
+
+    slow = BlockingStore()
+    set_resolver(SetResolverParam(iri="slow", resolver=slow))
+    try:
+        # a single IRI lookup returns once a resolver found the node,
+        # without waiting for the blocked one
+        assert Person["a:p1"].name == "Alice"
+        assert not release.is_set()
+        # list lookups and queries skip the resolver after its timeout
+        slow.timeout = 0.2
+        with caplog.at_level("WARNING", logger="oold.backend.interface"):
+            assert [e.id for e in Entity[["a:p1", "a:x"]]] == ["a:p1", "a:x"]
+        assert "Skipping BlockingStore: No response within 0.2 s" in caplog.text
+    finally:
+        release.set()
+
+
 if __name__ == "__main__":
     test_simple_dict_document_store(None)
     test_sqlite_document_store(None)
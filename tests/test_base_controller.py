@@ -234,3 +234,66 @@ def test_from_json_controller_failure_falls_back():
     restored = LinkedBaseModel.from_json(j)
     # StrictController failed, so we get ModelA or another controller
     assert hasattr(restored, "field_a")
+
+
+# -- Per-class caching --
+
+
+def test_data_model_detection_cached():
+    """The union class is created once per controller class and not
+    registered as a data model."""
+    from oold.model import _types
+
+    ctrl = MultiController(name="test", label=[])
+    union_cls = ctrl._get_data_model_cls()
+    assert MultiController(name="other", label=[])._get_data_model_cls() is union_cls
+    assert ctrl._collect_type_array() == ["Category:OSWModelA", "Category:OSWModelB"]
+    assert _types["Category:OSWModelA"] is ModelA
+    assert _types["Category:OSWModelB"] is ModelB
+
+
+def test_to_json_skips_controller_field_values():
+    """Controller-only fields are not serialized, so they may hold any value."""
+    ctrl = SingleController(name="test", label=[])
+    ctrl.controller_field = object()
+    assert ctrl.to_json() == ModelA(name="test", label=[]).to_json()
+
+
+def test_to_jsonld_matches_data_model():
+    """to_jsonld() of a controller keeps the data model properties."""
+
+    class Model(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {"ex": "https://example.com/", "id": "@id", "type": "@type", "name": "ex:name"},
+                "iri": "ex:ControllerModel",
+            }
+        )
+        id: str
+        type: str = "ex:ControllerModel"
+        name: str = "n"
+
+    class Controller(BaseController, Model):
+        state: int = 0
+
+    assert Controller(id="ex:a", state=1).to_jsonld() == Model(id="ex:a").to_jsonld()
+
+
+def test_to_json_keeps_range_objects_inline():
+    """Range fields holding objects are serialized inline (as by _raw_dict),
+    range fields holding only IRIs as IRIs."""
+
+    class Node(LinkedBaseModel):
+        model_config = ConfigDict(json_schema_extra={"title": "InlineNode"})
+        id: str
+        link: "Node | None" = Field(None, json_schema_extra={"range": "Category:InlineNode"})
+        links: list["Node"] | None = Field(None, json_schema_extra={"range": "Category:InlineNode"})
+
+    class NodeController(BaseController, Node):
+        state: int = 0
+
+    target = Node(id="ex:t", link="ex:other")
+    ctrl = NodeController(id="ex:a", link=target, links=[target], state=1)
+    inline = {"id": "ex:t", "link": "ex:other", "links": None}
+    assert ctrl.to_json() == {"id": "ex:a", "link": inline, "links": [inline]}
+    assert NodeController(id="ex:a", link="ex:t").to_json() == {"id": "ex:a", "link": "ex:t"}
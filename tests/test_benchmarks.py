@@ -0,0 +1,426 @@
+"""Micro-benchmarks for the hot paths of LinkedBaseModel.
+
+Run with ``make benchmark``; CI compares the results against the
+baseline of the main branch (see scripts/compare_benchmarks.py)."""
+
+import json
+
+import pytest
+from pydantic import BaseModel, ConfigDict, Field
+
+from oold.model import BaseController, LinkedBaseModel, LinkedBaseModelList
+from oold.static import GenericLinkedBaseModel, remove_none_many
+
+
+class BenchEntity(LinkedBaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "@context": {
+                "ex": "https://example.com/",
+                "id": "@id",
+                "type": "@type",
+                "name": "ex:name",
+                "links": {"@id": "ex:links", "@type": "@id", "@container": "@set"},
+                "parent": {"@id": "ex:parent", "@type": "@id"},
+            },
+            "iri": "ex:BenchEntity",
+        }
+    )
+
+    id: str
+    type: str | None = "ex:BenchEntity"
+    name: str
+    description: str | None = None
+    value: int = 0
+    links: list["BenchEntity"] | None = Field(None, json_schema_extra={"range": "ex:BenchEntity"})
+    parent: "BenchEntity | None" = Field(None, json_schema_extra={"range": "ex:BenchEntity"})
+
+
+N_ENTITIES = 1000
+
+
+def _construct_from_iris():
+    return [
+        BenchEntity(
+            id=f"ex:e{i}",
+            name=f"Entity {i}",
+            value=i,
+            links=[f"ex:e{i + 1}", f"ex:e{i + 2}"],
+            parent=f"ex:e{i - 1}",
+        )
+        for i in range(N_ENTITIES)
+    ]
+
+
+def _construct_from_objects(targets):
+    return [
+        BenchEntity(
+            id=f"ex:e{i}",
+            name=f"Entity {i}",
+            value=i,
+            links=targets,
+            parent=targets[0],
+        )
+        for i in range(N_ENTITIES)
+    ]
+
+
+def _construct_plain_fields():
+    return [BenchEntity(id=f"ex:e{i}", name=f"Entity {i}", value=i) for i in range(N_ENTITIES)]
+
+
+@pytest.mark.benchmark(group="model_construction")
+def test_construct_from_iris(benchmark):
+    entities = benchmark(_construct_from_iris)
+    assert len(entities) == N_ENTITIES
+    assert entities[1].__iris__ == {"links": ["ex:e2", "ex:e3"], "parent": "ex:e0"}
+
+
+@pytest.mark.benchmark(group="model_construction")
+def test_construct_from_objects(benchmark):
+    targets = [BenchEntity(id="ex:t1", name="T1"), BenchEntity(id="ex:t2", name="T2")]
+    entities = benchmark(_construct_from_objects, targets)
+    assert entities[0].__iris__ == {"links": ["ex:t1", "ex:t2"], "parent": "ex:t1"}
+
+
+@pytest.mark.benchmark(group="model_construction")
+def test_construct_plain_fields(benchmark):
+    entities = benchmark(_construct_plain_fields)
+    assert entities[-1].__iris__ == {}
+
+
+class PlainEntity(BaseModel):
+    """pydantic reference model without linked data features"""
+
+    id: str
+    name: str
+    value: int = 0
+
+
+N_READS = 10000
+
+
+def _read_attribute(obj, name):
+    for _ in range(N_READS):
+        getattr(obj, name)
+
+
+@pytest.fixture
+def linked_entity():
+    targets = [BenchEntity(id="ex:t1", name="T1"), BenchEntity(id="ex:t2", name="T2")]
+    return BenchEntity(id="ex:e", name="E", links=targets, parent=targets[0])
+
+
+@pytest.mark.benchmark(group="attribute_access")
+def test_getattr_pydantic_reference(benchmark):
+    benchmark(_read_attribute, PlainEntity(id="ex:e", name="E"), "name")
+
+
+@pytest.mark.benchmark(group="attribute_access")
+def test_getattr_plain_field(benchmark, linked_entity):
+    benchmark(_read_attribute, linked_entity, "name")
+
+
+@pytest.mark.benchmark(group="attribute_access")
+def test_getattr_method(benchmark, linked_entity):
+    benchmark(_read_attribute, linked_entity, "get_iri")
+
+
+@pytest.mark.benchmark(group="attribute_access")
+def test_getattr_range_field(benchmark, linked_entity):
+    benchmark(_read_attribute, linked_entity, "parent")
+    assert linked_entity.parent.id == "ex:t1"
+
+
+@pytest.mark.benchmark(group="attribute_access")
+def test_getattr_list_range_field(benchmark, linked_entity):
+    benchmark(_read_attribute, linked_entity, "links")
+    assert [e.id for e in linked_entity.links] == ["ex:t1", "ex:t2"]
+
+
+@pytest.fixture(scope="module")
+def entity_list():
+    return LinkedBaseModelList[BenchEntity](_construct_plain_fields())
+
+
+def _lookup_iris(entities):
+    for i in range(0, N_ENTITIES, 10):
+        entities[f"ex:e{i}"]
+
+
+@pytest.mark.benchmark(group="list_query")
+def test_list_iri_lookup(benchmark, entity_list):
+    benchmark(_lookup_iris, entity_list)
+
+
+@pytest.mark.benchmark(group="list_query")
+def test_list_condition_scan(benchmark, entity_list):
+    result = benchmark(entity_list.__getitem__, BenchEntity.name == "Entity 500")
+    assert len(result) == 1
+
+
+@pytest.mark.benchmark(group="list_query")
+def test_list_condition_indexed(benchmark, entity_list):
+    entity_list.create_index("name")
+    result = benchmark(entity_list.__getitem__, (BenchEntity.name == "Entity 500") & (BenchEntity.value > 0))
+    assert len(result) == 1
+
+
+@pytest.mark.benchmark(group="list_projection")
+def test_list_attribute_broadcast(benchmark, entity_list):
+    result = benchmark(getattr, entity_list, "value")
+    assert len(result) == N_ENTITIES
+
+
+@pytest.mark.benchmark(group="list_projection")
+def test_list_column(benchmark, entity_list):
+    result = benchmark(entity_list.column, "value")
+    assert len(result) == N_ENTITIES
+
+
+N_EXPORTS = 100
+
+
+def _export_jsonld(entities):
+    return [e.to_jsonld() for e in entities]
+
+
+@pytest.mark.benchmark(group="jsonld")
+def test_export_jsonld(benchmark):
+    entities = _construct_from_iris()[:N_EXPORTS]
+    result = benchmark(_export_jsonld, entities)
+    assert result[1]["https://example.com/parent"] == [{"@id": "https://example.com/e0"}]
+
+
+def _import_jsonld(documents):
+    return [BenchEntity.from_jsonld(d) for d in documents]
+
+
+@pytest.mark.benchmark(group="jsonld")
+def test_import_jsonld(benchmark):
+    # without @type, the class IRI of BenchEntity is only registered in compact form
+    documents = [
+        {k: v for k, v in d.items() if k != "@type"} for d in _export_jsonld(_construct_from_iris()[:N_EXPORTS])
+    ]
+    result = benchmark(_import_jsonld, documents)
+    assert result[1].__iris__ == {"links": ["ex:e2", "ex:e3"], "parent": "ex:e0"}
+
+
+@pytest.mark.benchmark(group="jsonld")
+def test_export_jsonld_many(benchmark):
+    entities = _construct_from_iris()[:N_EXPORTS]
+    result = benchmark(LinkedBaseModel.to_jsonld_many, entities)
+    assert result == _export_jsonld(entities)
+
+
+def _nested_entities():
+    targets = [BenchEntity(id="ex:t1", name="T1"), BenchEntity(id="ex:t2", name="T2")]
+    return _construct_from_iris()[:N_EXPORTS] + _construct_from_objects(targets)[:N_EXPORTS]
+
+
+def _model_dump_json(entities):
+    return [e.model_dump_json(exclude_none=True) for e in entities]
+
+
+@pytest.mark.benchmark(group="json")
+def test_model_dump_json(benchmark):
+    entities = _nested_entities()
+    result = benchmark(_model_dump_json, entities)
+    assert json.loads(result[1]) == {
+        "id": "ex:e1",
+        "type": "ex:BenchEntity",
+        "name": "Entity 1",
+        "value": 1,
+        "links": ["ex:e2", "ex:e3"],
+        "parent": "ex:e0",
+    }
+    assert json.loads(result[-1])["links"] == ["ex:t1", "ex:t2"]
+
+
+def _to_json(entities):
+    return [e.to_json() for e in entities]
+
+
+@pytest.mark.benchmark(group="json")
+def test_to_json(benchmark):
+    entities = _nested_entities()
+    result = benchmark(_to_json, entities)
+    assert result[-1]["links"] == ["ex:t1", "ex:t2"]
+    assert "description" not in result[-1]
+
+
+class BenchTree(LinkedBaseModel):
+    name: str
+    children: list["BenchTree"] = []
+
+
+class BenchTreeController(BaseController, BenchTree):
+    state: int = 0
+
+
+def _build_tree(depth, width=3):
+    if depth == 0:
+        return BenchTree(name="leaf")
+    return BenchTree(name=f"node{depth}", children=[_build_tree(depth - 1, width) for _ in range(width)])
+
+
+@pytest.mark.benchmark(group="cast")
+@pytest.mark.parametrize("trusted", [False, True])
+def test_cast_tree(benchmark, trusted):
+    tree = _build_tree(4)
+    result = benchmark(tree.cast, BenchTreeController, trusted=trusted, state=1)
+    assert result.state == 1
+    assert len(result.children[0].children) == 3
+
+
+class BenchEntityController(BaseController, BenchEntity):
+    state: int = 0
+
+
+@pytest.mark.benchmark(group="json")
+@pytest.mark.parametrize("model_cls", [BenchEntity, BenchEntityController])
+def test_controller_to_json(benchmark, model_cls):
+    entities = [model_cls(id=f"ex:e{i}", name=f"Entity {i}", links=["ex:e0"]) for i in range(N_EXPORTS)]
+    result = benchmark(_to_json, entities)
+    assert result[1] == {"id": "ex:e1", "type": "ex:BenchEntity", "name": "Entity 1", "value": 0, "links": ["ex:e0"]}
+
+
+def _remove_none_copy(dicts):
+    return [GenericLinkedBaseModel.remove_none(d) for d in dicts]
+
+
+@pytest.mark.benchmark(group="json")
+@pytest.mark.parametrize("batch", [False, True])
+def test_remove_none(benchmark, batch):
+    entities = _nested_entities()
+    dumped = [e.model_dump() for e in entities]
+    # the in-place variant is idempotent, repeated runs process the same input
+    result = benchmark(remove_none_many if batch else _remove_none_copy, dumped)
+    assert "description" not in result[0]
+
+
+N_LOOKUPS = 1600
+
+
+@pytest.fixture(scope="module")
+def sqlite_db(tmp_path_factory):
+    from oold.backend.document_store import SqliteDocumentStore
+
+    db_path = str(tmp_path_factory.mktemp("sqlite") / "entities.db")
+    store = SqliteDocumentStore(db_path=db_path)
+    store.store_json_dicts({f"ex:e{i}": e.model_dump() for i, e in enumerate(_construct_plain_fields())})
+    store.close()
+    return db_path
+
+
+def _lookup_concurrently(store, executor, threads):
+    # one IRI per request, as issued by lazy field resolution
+    def lookup(offset):
+        for i in range(offset, N_LOOKUPS, threads):
+            store.resolve_iris([f"ex:e{i % N_ENTITIES}"])
+
+    list(executor.map(lookup, range(threads)))
+
+
+@pytest.mark.benchmark(group="sqlite_threads")
+@pytest.mark.parametrize("persist_connection", [True, False])
+@pytest.mark.parametrize("threads", [1, 4, 16])
+def test_sqlite_lookup_throughput(benchmark, sqlite_db, threads, persist_connection):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from oold.backend.document_store import SqliteDocumentStore
+
+    store = SqliteDocumentStore(db_path=sqlite_db, persist_connection=persist_connection)
+    with ThreadPoolExecutor(threads) as executor:
+        benchmark(_lookup_concurrently, store, executor, threads)
+    store.close()
+
+
+N_QUERY_DOCS = 100000
+
+
+@pytest.fixture(scope="module")
+def sqlite_query_db(tmp_path_factory):
+    from oold.backend.document_store import SqliteDocumentStore
+
+    db_path = str(tmp_path_factory.mktemp("sqlite") / "query.db")
+    store = SqliteDocumentStore(db_path=db_path)
+    store.store_json_dicts({
+        f"ex:e{i}": {"id": f"ex:e{i}", "name": f"Entity {i}", "value": i} for i in range(N_QUERY_DOCS)
+    })
+    store.close()
+    return db_path
+
+
+@pytest.mark.benchmark(group="sqlite_query")
+@pytest.mark.parametrize("indexed", [False, True])
+def test_sqlite_query(benchmark, sqlite_query_db, indexed):
+    from oold.backend.document_store import SqliteDocumentStore
+    from oold.backend.interface import Condition, Query
+
+    store = SqliteDocumentStore(db_path=sqlite_query_db)
+    if indexed:
+        store.create_index("name")
+        store.create_index("value")
+    else:
+        store.drop_index("name")
+        store.drop_index("value")
+    query = Query(
+        op1=Condition(field="name", operator="eq", value="Entity 500"),
+        operator="or",
+        op2=Condition(field="value", operator="ge", value=N_QUERY_DOCS - 10),
+    )
+    result = benchmark(store._query_dicts, query)
+    assert len(result) == 11
+    store.close()
+
+
+@pytest.mark.benchmark(group="sqlite_bulk")
+@pytest.mark.parametrize("join", [False, True])
+def test_sqlite_bulk_resolve(benchmark, sqlite_query_db, join):
+    from oold.backend.document_store import SqliteDocumentStore
+
+    store = SqliteDocumentStore(db_path=sqlite_query_db, temp_table_threshold=0 if join else None)
+    iris = [f"ex:e{i}" for i in range(0, N_QUERY_DOCS * 2, 2)]
+
+    def consume():
+        return sum(doc is not None for _, doc in store.iter_resolve_iris(iris))
+
+    assert benchmark(consume) == N_QUERY_DOCS // 2
+    store.close()
+
+
+N_STORES = 200
+
+
+@pytest.mark.benchmark(group="dict_store_persistence")
+@pytest.mark.parametrize("journal", [False, True])
+def test_dict_store_incremental_writes(benchmark, tmp_path, journal):
+    from oold.backend.document_store import SimpleDictDocumentStore
+
+    docs = [e.model_dump() for e in _construct_plain_fields()]
+    store = SimpleDictDocumentStore(file_path=tmp_path / "store.json", journal=journal, compact_threshold=None)
+
+    def store_one_by_one():
+        for i in range(N_STORES):
+            store.store_json_dicts({f"ex:e{i}": docs[i]})
+
+    # start from a store of N_ENTITIES entities
+    store.store_json_dicts({f"ex:e{i}": doc for i, doc in enumerate(docs)})
+    benchmark(store_one_by_one)
+    store.close()
+
+
+@pytest.mark.benchmark(group="dict_store_query")
+@pytest.mark.parametrize("indexed", [False, True])
+def test_dict_store_query(benchmark, indexed):
+    from oold.backend.document_store import SimpleDictDocumentStore
+    from oold.backend.interface import Condition
+
+    store = SimpleDictDocumentStore(indexes=["name"] if indexed else [], sorted_indexes=["value"] if indexed else [])
+    store.store_json_dicts({
+        f"ex:e{i}": {"id": f"ex:e{i}", "name": f"Entity {i % 1000}", "value": i} for i in range(N_QUERY_DOCS)
+    })
+    name = Condition(field="name", operator="eq", value="Entity 500")
+    query = name & Condition(field="value", operator="lt", value=N_QUERY_DOCS // 2)
+    assert len(benchmark(store._query, query)) == N_QUERY_DOCS // 2000
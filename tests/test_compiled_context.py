@@ -0,0 +1,128 @@
+"""Conformance of the fast JSON-LD path with pyld."""
+
+import pytest
+from pyld import jsonld
+
+from oold.utils.compiled_context import CompiledContext, UnsupportedFeature, compile_context
+
+CONTEXT = {
+    "ex": "https://example.com/",
+    "schema": "https://schema.org/",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "id": "@id",
+    "type": "@type",
+    "name": "ex:name",
+    "links": {"@id": "ex:links", "@type": "@id", "@container": "@set"},
+    "parent": {"@id": "ex:parent", "@type": "@id"},
+    "count": {"@id": "ex:count", "@type": "xsd:integer"},
+    "sub": {"@id": "ex:sub", "@context": {"q": "ex:q", "name": "schema:name"}},
+    "plain": "ex:plain",
+    "tags": {"@id": "ex:tags", "@container": "@set"},
+}
+
+DOCUMENTS = [
+    {"id": "ex:a", "name": "A"},
+    {"id": "ex:a", "type": "ex:T", "name": "A", "undefined": 3},
+    {
+        "id": "ex:a",
+        "type": ["ex:T", "https://other.org/U"],
+        "name": ["A", "B"],
+        "tags": ["x"],
+        "links": ["ex:b", "urn:x:1"],
+        "parent": "ex:p",
+        "count": "5",
+    },
+    {"id": "ex:a", "sub": {"q": 1, "name": "S", "id": "ex:s"}, "plain": {"name": "x"}},
+    {"id": "ex:a", "sub": {}},
+    {"id": "ex:a", "name": [None, 2.5, True], "tags": []},
+    {"id": "ex:a", "ex:other": "o", "https://other.org/p": {"id": "ex:z", "name": "z"}},
+    {"id": "ex:a", "parent": {"id": "ex:p", "name": "P"}},
+    {"id": "ex:a", "type": "ex:T"},
+    {"id": "http://other.org/a", "name": "A", "plain": {"id": "ex:b"}},
+]
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return CompiledContext.compile(CONTEXT)
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_expand_conformance(compiled, document):
+    expected = jsonld.expand({"@context": CONTEXT, **document})
+    result = compiled.expand(document)
+    assert [result] == expected
+    assert list(result) == list(expected[0])
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_compact_conformance(compiled, document):
+    expanded = jsonld.expand({"@context": CONTEXT, **document})
+    expected = jsonld.compact(expanded, CONTEXT)
+    del expected["@context"]
+    result = compiled.compact(expanded)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"id": "ex:a"},  # dropped by expansion
+        {"id": "relative", "name": "A"},  # resolved against the base IRI
+        {"id": "ex:a", "name": {"@value": "A", "@language": "en"}},
+        {"id": "ex:a", "@context": {"x": "ex:x"}, "x": 1},
+        {"id": "ex:a", "name": [["nested"]]},
+    ],
+)
+def test_expand_unsupported(compiled, document):
+    with pytest.raises(UnsupportedFeature):
+        compiled.expand(document)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"@context": CONTEXT, "id": "ex:a", "name": "A"},  # not expanded
+        {"@id": "https://example.com/a", "https://example.com/parent": [{"@value": 5}]},
+        {"@id": "https://example.com/a", "https://example.com/name": [{"@value": "A", "@language": "en"}]},
+        {"@id": "https://example.com/a", "https://example.com/count": [{"@value": "5"}]},
+        {"@id": "https://example.com/a", "@graph": []},
+    ],
+)
+def test_compact_unsupported(compiled, document):
+    with pytest.raises(UnsupportedFeature):
+        compiled.compact(document)
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"@vocab": "https://example.com/", "name": "name"},
+        {"@language": "en", "name": "https://example.com/name"},
+        {"items": {"@id": "https://example.com/items", "@container": "@list"}},
+        {"label": {"@id": "https://example.com/label", "@language": "en"}},
+        {"value": {"@id": "https://example.com/value", "@type": "@json"}},
+    ],
+)
+def test_unsupported_context(context):
+    assert compile_context(context) is None
+
+
+def test_remote_context():
+    documents = {
+        "https://example.com/Base": {
+            "contextUrl": None,
+            "documentUrl": "https://example.com/Base",
+            "document": {"@context": {"ex": "https://example.com/", "name": "ex:name"}},
+        }
+    }
+
+    def loader(url, options=None):
+        return documents[url]
+
+    context = ["https://example.com/Base", {"parent": {"@id": "ex:parent", "@type": "@id"}}]
+    compiled = CompiledContext.compile(context, loader)
+    document = {"name": "A", "parent": "ex:p"}
+    expected = jsonld.expand({"@context": context, **document}, {"documentLoader": loader})
+    assert [compiled.expand(document)] == expected
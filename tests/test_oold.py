@@ -426,6 +426,62 @@ def test_nested_iris_cast_v2():
     _run_nested_iris_cast_tests("v2")
 
 
+def test_cast_trusted():
+    """cast(trusted=True) reuses validated nested instances."""
+    import pydantic
+    from pydantic import Field as PydField
+
+    from oold.model import BaseController, LinkedBaseModel, _cast_plans
+
+    class Child(LinkedBaseModel):
+        value: int = 0
+        ref: str | None = PydField(None, json_schema_extra={"range": "Category:Target"})
+
+    class Parent(LinkedBaseModel):
+        type: str = "Parent"
+        name: str = "parent"
+        label: str | None = "label"
+        children: list[Child] | None = None
+
+    class ParentController(BaseController, Parent):
+        extra: float = 1.0
+
+    class Other(LinkedBaseModel):
+        name: int = 0
+
+    p = Parent(name="p1", label=None, children=[Child(value=1, ref="ex:t1"), Child(value=2)])
+    p.__iris__["custom"] = "ex:custom"
+
+    # downcast to a controller
+    pc = p.cast(ParentController, trusted=True, extra="2.5")
+    assert type(pc) is ParentController
+    assert pc.children[0] is p.children[0]
+    assert pc.__dict__["children"] is not p.__dict__["children"]
+    assert pc.children[0].__iris__ == {"ref": "ex:t1"}
+    assert pc.__iris__["custom"] == "ex:custom"
+    assert pc.extra == 2.5
+    assert pc.type == "Parent"
+    assert pc.label is None
+    assert pc.model_fields_set == {"name", "label", "children", "extra"}
+    assert pc.to_json() == p.cast(ParentController, extra="2.5").to_json()
+    with pytest.raises(pydantic.ValidationError):
+        p.cast(ParentController, trusted=True, extra="not a number")
+
+    # upcast to the data model, the controller field is ignored
+    p2 = pc.cast(Parent, trusted=True)
+    assert type(p2) is Parent
+    assert p2.children[1] is p.children[1]
+    assert "extra" not in p2.__dict__
+
+    assert p.cast(Parent, trusted=True, none_to_default=True).label == "label"
+    assert ParentController in _cast_plans[Parent]
+
+    # incompatible field types fall back to a validated cast
+    with pytest.raises(pydantic.ValidationError):
+        Parent(name="x").cast(Other, trusted=True)
+    assert Parent(name="5").cast(Other, trusted=True).name == 5
+
+
 if __name__ == "__main__":
     _run("v1")
     _run("v2")
@@ -0,0 +1,81 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from pydantic import ConfigDict
+
+from oold.backend.interface import LinkedDataFormat
+from oold.model import LinkedBaseModel
+from oold.parallel import ImportManyError, ItemError, import_many
+
+CONTEXT = {"ex": "https://example.com/", "id": "@id", "type": "@type", "name": "ex:name"}
+
+
+class ParallelThing(LinkedBaseModel):
+    model_config = ConfigDict(json_schema_extra={"@context": CONTEXT, "iri": "https://example.com/ParallelThing"})
+    id: str
+    type: str = "https://example.com/ParallelThing"
+    name: str
+
+
+class ParallelPerson(ParallelThing):
+    model_config = ConfigDict(json_schema_extra={"@context": CONTEXT, "iri": "https://example.com/ParallelPerson"})
+    type: str = "https://example.com/ParallelPerson"
+    age: int = 0
+
+
+DOCUMENTS = [
+    {
+        "id": f"ex:{i}",
+        "type": "https://example.com/ParallelPerson" if i % 3 == 0 else "https://example.com/ParallelThing",
+        "name": f"n{i}",
+    }
+    for i in range(20)
+]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread", "serial"])
+def test_import_many(executor):
+    nodes = import_many(DOCUMENTS, model_cls=ParallelThing, workers=2, executor=executor, chunk_size=3)
+    assert [n.id for n in nodes] == [d["id"] for d in DOCUMENTS]
+    assert [type(n) for n in nodes] == [ParallelPerson if i % 3 == 0 else ParallelThing for i in range(20)]
+
+
+def test_import_many_errors():
+    documents = list(DOCUMENTS)
+    documents[4] = {"id": "ex:4", "type": "https://example.com/ParallelThing"}  # name missing
+    documents[9] = {"id": "ex:9", "type": "https://example.com/ParallelPerson", "name": "n9", "age": "old"}
+    with pytest.raises(ImportManyError) as exc_info:
+        import_many(documents, model_cls=ParallelThing, workers=2, chunk_size=4)
+    assert [e.index for e in exc_info.value.errors] == [4, 9]
+    assert exc_info.value.errors[0].type == "ValidationError"
+
+    results = import_many(documents, model_cls=ParallelThing, workers=2, chunk_size=4, errors="return")
+    assert isinstance(results[4], ItemError) and isinstance(results[9], ItemError)
+    assert results[5].id == "ex:5"
+
+
+def test_import_many_jsonld_dicts():
+    documents = [ParallelThing.from_json(d).to_jsonld() for d in DOCUMENTS]
+    results = import_many(
+        documents, model_cls=ParallelThing, format=LinkedDataFormat.JSON_LD, workers=2, return_dicts=True
+    )
+    assert [(r["id"], r["name"], "age" in r) for r in results] == [
+        (d["id"], d["name"], i % 3 == 0) for i, d in enumerate(DOCUMENTS)
+    ]
+
+
+def test_import_many_spawn():
+    # workers started from scratch import the model modules by name
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        nodes = import_many(DOCUMENTS, model_cls=ParallelThing, executor=executor, chunk_size=10)
+    assert [type(n) for n in nodes][:4] == [ParallelPerson, ParallelThing, ParallelThing, ParallelPerson]
+
+
+def test_import_many_local_class():
+    class Local(LinkedBaseModel):
+        name: str
+
+    with pytest.raises(ValueError, match="executor='thread'"):
+        import_many([{"name": "a"}, {"name": "b"}], model_cls=Local, workers=2, chunk_size=1)
+    assert import_many([{"name": "a"}], model_cls=Local, executor="thread")[0].name == "a"
@@ -1,6 +1,7 @@
 """Tests for to_json / from_json serialization."""
 
 import pytest
+from pydantic import BaseModel
 
 
 def _get_models(pydantic_version):
@@ -79,3 +80,402 @@ def test_to_json_excludes_none(pydantic_version):
     obj = Foo(value=1.0)
     result = obj.to_json()
     assert "label" not in result
+
+
+def test_build_context_cached():
+    from pydantic import ConfigDict
+
+    from oold.model import LinkedBaseModel
+    from oold.static import build_context
+
+    class Address(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {"ex": "https://example.com/", "street": "ex:street"},
+                "iri": "ex:Address",
+            }
+        )
+        street: str
+
+    class Person(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {
+                    "ex": "https://example.com/",
+                    "id": "@id",
+                    "name": "ex:name",
+                    "address": {"@id": "ex:address", "@container": "@set"},
+                },
+                "iri": "ex:Person",
+            }
+        )
+        id: str
+        name: str
+        address: list[Address]
+
+    context = build_context(Person, BaseModel)
+    assert context["address"] == {
+        "@id": "ex:address",
+        "@container": "@set",
+        "@context": {"ex": "https://example.com/", "street": "ex:street"},
+    }
+    # the schema context is left untouched
+    assert "@context" not in Person.model_config["json_schema_extra"]["@context"]["address"]
+    # repeated calls return the memoized context
+    assert build_context(Person, BaseModel) is context
+
+    p = Person(id="ex:p", name="P", address=[Address(street="Main St")])
+    jsonld = p.to_jsonld()
+    assert jsonld["https://example.com/address"][0]["https://example.com/street"][0]["@value"] == "Main St"
+    assert build_context(Person, BaseModel) is context
+    assert Person.from_jsonld(jsonld).address[0].street == "Main St"
+
+    # registering a new class invalidates the cache
+    class Other(LinkedBaseModel):
+        model_config = ConfigDict(json_schema_extra={"@context": {}, "iri": "ex:Other"})
+
+    rebuilt = build_context(Person, BaseModel)
+    assert rebuilt is not context
+    assert rebuilt == context
+
+
+def test_build_context_read_only():
+    import copy
+
+    from pydantic import ConfigDict
+
+    from oold.model import LinkedBaseModel
+    from oold.static import build_context, get_model_schema
+
+    class A(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {
+                    "ex": "https://example.com/",
+                    "id": "@id",
+                    "name": "ex:name",
+                    "tags": {"@id": "ex:tag", "@container": "@set"},
+                },
+                "iri": "ex:A",
+            }
+        )
+        id: str
+        name: str
+        tags: list[str] = []
+
+    context = build_context(A, LinkedBaseModel)
+    # the memoized context is a copy of the schema context
+    assert context is not get_model_schema(A)["@context"]
+    with pytest.raises(TypeError):
+        context["name"] = "ex:other"
+    with pytest.raises(TypeError):
+        context.update({"name": "ex:other"})
+    with pytest.raises(TypeError):
+        context["tags"]["@id"] = "ex:other"
+    # copies are modifiable and independent
+    modified = copy.deepcopy(context)
+    modified["name"] = "ex:other"
+    modified["tags"]["@id"] = "ex:other"
+    assert type(modified) is dict and type(modified["tags"]) is dict
+    assert build_context(A, LinkedBaseModel)["name"] == "ex:name"
+    assert get_model_schema(A)["@context"]["name"] == "ex:name"
+    assert get_model_schema(A)["@context"]["tags"]["@id"] == "ex:tag"
+    assert build_context(A, LinkedBaseModel)["tags"]["@id"] == "ex:tag"
+    assert "https://example.com/name" in A(id="ex:a", name="a").to_jsonld()
+
+    class B(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": [{"ex": "https://example.com/", "id": "@id"}, {"name": "ex:name"}],
+                "iri": "ex:B",
+            }
+        )
+        id: str
+        name: str
+
+    context = build_context(B, LinkedBaseModel)
+    with pytest.raises(TypeError):
+        context.append({})
+    with pytest.raises(TypeError):
+        context[1]["name"] = "ex:other"
+    assert copy.deepcopy(context) == [{"ex": "https://example.com/", "id": "@id"}, {"name": "ex:name"}]
+    assert "https://example.com/name" in B(id="ex:b", name="b").to_jsonld()
+
+
+def test_jsonld_document_loader(monkeypatch):
+    from pydantic import ConfigDict
+    from pyld import jsonld
+
+    from oold import static
+    from oold.model import LinkedBaseModel
+    from oold.static import JsonLdDocumentLoader, document_loader
+
+    class Tag(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": {"ex": "https://example.com/", "id": "@id", "label": "ex:label"},
+                "$id": "https://example.com/LoaderTag",
+            }
+        )
+        id: str
+        label: str
+
+    # imports the context of a class outside of its hierarchy by IRI
+    class Note(LinkedBaseModel):
+        model_config = ConfigDict(
+            json_schema_extra={
+                "@context": ["https://example.com/LoaderTag", {"text": "ex:text"}],
+                "$id": "https://example.com/LoaderNote",
+            }
+        )
+        id: str
+        label: str
+        text: str
+
+    global_loader = jsonld.get_document_loader()
+    note = Note(id="ex:n", label="L", text="T")
+    expanded = note.to_jsonld()
+    assert expanded["https://example.com/label"] == [{"@value": "L"}]
+    assert Note.from_jsonld(expanded).text == "T"
+    # pyld's process-global loader is left untouched
+    assert jsonld.get_document_loader() is global_loader
+    assert document_loader("https://example.com/LoaderTag")["document"] is Tag.model_config["json_schema_extra"]
+    # one loader per class
+    assert static.get_jsonld_context_loader(Note, BaseModel) is static.get_jsonld_context_loader(Note, BaseModel)
+
+    # remote documents are cached with LRU and TTL eviction
+    fetched = []
+
+    def fake_remote(url, options):
+        fetched.append(url)
+        return {"contextUrl": None, "documentUrl": url, "document": {"@context": {"x": url}}}
+
+    now = [0.0]
+    monkeypatch.setattr(static.time, "monotonic", lambda: now[0])
+    loader = JsonLdDocumentLoader(max_remote=2, remote_ttl=60)
+    loader._requests_loader = fake_remote
+    loader("https://remote/a")
+    doc = loader("https://remote/a")
+    assert doc["document"] == {"@context": {"x": "https://remote/a"}}
+    assert fetched == ["https://remote/a"]
+    loader("https://remote/b")
+    loader("https://remote/c")
+    loader("https://remote/a")  # evicted as least recently used
+    assert fetched == ["https://remote/a", "https://remote/b", "https://remote/c", "https://remote/a"]
+    now[0] = 100.0
+    loader("https://remote/a")  # expired
+    assert fetched[-2:] == ["https://remote/a", "https://remote/a"]
+
+
+@pytest.mark.parametrize("pydantic_version", ["v1", "v2"])
+def test_jsonld_many(pydantic_version):
+    LinkedBaseModel = _get_models(pydantic_version)
+    context = {"ex": "https://example.com/", "id": "@id", "type": "@type", "name": "ex:name"}
+    # @vocab is not supported by the fast path, so pyld processes a @graph
+    vocab_context = {"@vocab": "https://example.com/vocab/", "id": "@id", "type": "@type"}
+
+    if pydantic_version == "v2":
+        from pydantic import ConfigDict
+
+        class Simple(LinkedBaseModel):
+            model_config = ConfigDict(json_schema_extra={"@context": context, "$id": "https://example.com/ManySimple"})
+            id: str
+            type: str = "https://example.com/ManySimple"
+            name: str
+
+        class Vocab(LinkedBaseModel):
+            model_config = ConfigDict(
+                json_schema_extra={"@context": vocab_context, "$id": "https://example.com/ManyVocab"}
+            )
+            id: str
+            type: str = "https://example.com/ManyVocab"
+            label: str
+
+    else:
+
+        class Simple(LinkedBaseModel):
+            class Config:
+                schema_extra = {"@context": context, "$id": "https://example.com/ManySimple"}
+
+            id: str
+            type: str = "https://example.com/ManySimple"
+            name: str
+
+        class Vocab(LinkedBaseModel):
+            class Config:
+                schema_extra = {"@context": vocab_context, "$id": "https://example.com/ManyVocab"}
+
+            id: str
+            type: str = "https://example.com/ManyVocab"
+            label: str
+
+    objs = [
+        Simple(id="ex:s1", name="S1"),
+        Vocab(id="https://example.com/v1", label="V1"),
+        Simple(id="ex:s2", name="S2"),
+        Vocab(id="https://example.com/v2", label="V2"),
+    ]
+    exported = LinkedBaseModel.to_jsonld_many(objs)
+    assert exported == [o.to_jsonld() for o in objs]
+    assert exported[1]["https://example.com/vocab/label"] == [{"@value": "V1"}]
+
+    imported = LinkedBaseModel.from_jsonld_many(exported)
+    assert [type(o) for o in imported] == [Simple, Vocab, Simple, Vocab]
+    assert [o.id for o in imported] == [o.id for o in objs]
+    assert imported[3].label == "V2"
+    assert LinkedBaseModel.to_jsonld_many([]) == []
+
+
+def test_model_dump_iris():
+    """Range fields are serialized as IRIs in a single serialization pass."""
+    import json
+    from typing import Any
+
+    from pydantic import Field
+
+    from oold.model import LinkedBaseModel
+
+    class Item(LinkedBaseModel):
+        id: str
+        name: str | None = None
+        ref: "Item | None" = Field(None, json_schema_extra={"range": "Item"})
+        refs: list["Item"] | None = Field(None, json_schema_extra={"range": "Item"})
+        meta: dict[str, Any] | None = None
+
+    class Container(LinkedBaseModel):
+        id: str
+        first: Item | None = Field(None, json_schema_extra={"range": "Item"})
+        inline: Item | None = None
+        inline_list: list[Item] = []
+
+    target = Item(id="ex:t", name="T")
+    nested = Item(id="ex:n", ref="ex:x", refs=[target, "ex:y"], meta={"a": None, "b": [{"c": None}]})
+    container = Container(id="ex:c", first=target, inline=nested, inline_list=[nested])
+
+    expected_nested = {"id": "ex:n", "ref": "ex:x", "refs": ["ex:t", "ex:y"], "meta": {"b": [{}]}}
+    expected = {"id": "ex:c", "first": "ex:t", "inline": expected_nested, "inline_list": [expected_nested]}
+    assert container.to_json() == expected
+    assert json.loads(container.model_dump_json(exclude_none=True)) == expected
+    assert container.model_dump(exclude_none=True) == expected
+    # IRI-only fields keep their position
+    assert list(container.to_json()["inline"]) == ["id", "ref", "refs", "meta"]
+
+    full = container.model_dump()
+    assert full["inline"]["ref"] == "ex:x"
+    assert full["inline"]["name"] is None
+    assert full["inline"]["meta"] == {"a": None, "b": [{"c": None}]}
+
+    # exclusion arguments take precedence over IRI-only fields
+    assert "ref" not in nested.model_dump(exclude_none=True, exclude={"ref"})
+    assert set(nested.model_dump(exclude_none=True, include={"id", "refs"})) == {"id", "refs"}
+    assert "ref" not in nested.model_dump(exclude_none=True, exclude_defaults=True)
+    assert nested.to_json(exclude_defaults=True)["ref"] == "ex:x"
+
+    # json.dumps options fall back to the python serializer
+    assert container.model_dump_json(exclude_none=True, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+def _random_tree(rng, depth=0):
+    """Random JSON-like structure with None values at any level."""
+    kind = rng.random()
+    if depth > 4 or kind < 0.4:
+        return rng.choice([None, None, 0, 1.5, "", "s", True, False])
+    if kind < 0.7:
+        return [_random_tree(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": _random_tree(rng, depth + 1) for i in range(rng.randint(0, 5))}
+
+
+def test_remove_none_inplace_matches_remove_none():
+    """Property: the in-place variant equals the copying reference on
+    random nested structures."""
+    import copy
+    import random
+
+    from oold.static import GenericLinkedBaseModel, remove_none_inplace, remove_none_many
+
+    rng = random.Random(0)  # noqa: S311  # reproducible test data
+    trees = [_random_tree(rng) for _ in range(1000)]
+    expected = [GenericLinkedBaseModel.remove_none(t) for t in trees]
+    for tree, result in zip(trees, expected, strict=True):
+        assert remove_none_inplace(copy.deepcopy(tree)) == result
+    assert remove_none_many(copy.deepcopy(trees)) == expected
+    # untouched subtrees are not copied
+    tree = {"a": {"b": [1, {"c": 2}]}, "d": None}
+    inner = tree["a"]
+    assert remove_none_inplace(tree) is tree
+    assert tree == {"a": {"b": [1, {"c": 2}]}} and tree["a"] is inner
+
+
+def _reference_object_to_iri(d: dict, model_obj):
+    """_object_to_iri and _recursive_object_to_iri before they were
+    replaced by object_to_iri_many."""
+    for name in list(d.keys()):
+        if name in model_obj.__iris__:
+            d[name] = model_obj.__iris__[name]
+    fields = type(model_obj).model_fields if hasattr(type(model_obj), "model_fields") else model_obj.__fields__
+    for name, value in list(d.items()):
+        if name not in fields:
+            continue
+        model_value = model_obj.__dict__.get(name)
+        if isinstance(value, list) and isinstance(model_value, list):
+            for item, model_item in zip(value, model_value, strict=False):
+                if isinstance(item, dict) and hasattr(model_item, "__iris__"):
+                    _reference_object_to_iri(item, model_item)
+        elif isinstance(value, dict) and hasattr(model_value, "__iris__"):
+            _reference_object_to_iri(value, model_value)
+
+
+@pytest.mark.parametrize("pydantic_version", ["v1", "v2"])
+def test_object_to_iri_many_matches_reference(pydantic_version):
+    """Property: object_to_iri_many equals the recursive reference on
+    random trees of inline and referenced nodes."""
+    import copy
+    import random
+
+    from oold.static import object_to_iri_many
+
+    LinkedBaseModel = _get_models(pydantic_version)
+    if pydantic_version == "v2":
+        from pydantic import Field
+
+        def range_field(default):
+            return Field(default, json_schema_extra={"range": "Node"})
+
+    else:
+        from pydantic.v1 import Field
+
+        def range_field(default):
+            return Field(default, range="Node")
+
+    class Node(LinkedBaseModel):
+        id: str
+        value: int | None = None
+        ref: "Node | None" = range_field(None)
+        refs: list["Node"] | None = range_field(None)
+        inline: "Node | None" = None
+        inline_list: list["Node"] = []
+
+    if pydantic_version == "v1":
+        Node.update_forward_refs()
+
+    rng = random.Random(1)  # noqa: S311  # reproducible test data
+    counter = iter(range(10**6))
+
+    def random_node(depth=0):
+        kwargs = {"id": f"ex:n{next(counter)}", "value": rng.choice([None, 1])}
+        if rng.random() < 0.5:
+            kwargs["ref"] = rng.choice(["ex:r", Node(id="ex:target")])
+        if rng.random() < 0.5:
+            kwargs["refs"] = [rng.choice(["ex:r1", Node(id="ex:t1")]) for _ in range(rng.randint(1, 3))]
+        if depth < 3 and rng.random() < 0.5:
+            kwargs["inline"] = random_node(depth + 1)
+        if depth < 3:
+            kwargs["inline_list"] = [random_node(depth + 1) for _ in range(rng.randint(0, 2))]
+        return Node(**kwargs)
+
+    nodes = [random_node() for _ in range(100)]
+    dumped = [n.model_dump() if pydantic_version == "v2" else super(LinkedBaseModel, n).dict() for n in nodes]
+    expected = copy.deepcopy(dumped)
+    for d, n in zip(expected, nodes, strict=True):
+        _reference_object_to_iri(d, n)
+    assert object_to_iri_many(dumped, nodes) == expected
@@ -0,0 +1,103 @@
+import asyncio
+import io
+import json
+
+import pytest
+from pydantic import ConfigDict
+
+from oold.backend.document_store import SimpleDictDocumentStore
+from oold.backend.interface import LinkedDataFormat, ResolveParam
+from oold.model import LinkedBaseModel
+from oold.stream import astream_import, iter_documents, iter_json, stream_import
+
+CONTEXT = {"ex": "https://example.com/", "id": "@id", "type": "@type", "name": "ex:name"}
+
+
+class StreamThing(LinkedBaseModel):
+    model_config = ConfigDict(json_schema_extra={"@context": CONTEXT, "iri": "ex:StreamThing"})
+    id: str
+    type: str = "ex:StreamThing"
+    name: str
+
+
+class StreamPerson(StreamThing):
+    model_config = ConfigDict(json_schema_extra={"@context": CONTEXT, "iri": "ex:StreamPerson"})
+    type: str = "ex:StreamPerson"
+
+
+DOCUMENTS = [
+    {"id": f"ex:{i}", "type": "ex:StreamPerson" if i % 2 else "ex:StreamThing", "name": f"n{i}"} for i in range(5)
+]
+
+
+class CountingReader(io.StringIO):
+    """Counts the characters handed out by read()."""
+
+    consumed = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+def test_stream_ndjson(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text("\n".join(json.dumps(d) for d in DOCUMENTS) + "\n\n")
+    chunks = list(stream_import(path, batch_size=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    nodes = [n for c in chunks for n in c]
+    assert [type(n) for n in nodes] == [StreamThing, StreamPerson, StreamThing, StreamPerson, StreamThing]
+    assert [n.name for n in nodes] == [d["name"] for d in DOCUMENTS]
+
+    path.write_text(json.dumps(DOCUMENTS[0]) + "\n{invalid\n")
+    with pytest.raises(ValueError, match="line 2"):
+        list(stream_import(path))
+
+
+def test_stream_json_array():
+    source = io.StringIO(json.dumps(DOCUMENTS, indent=2))
+    assert list(iter_json(source, read_size=7)) == DOCUMENTS
+    assert list(iter_json(io.StringIO("[ ]"))) == []
+    assert list(iter_json(io.StringIO('{"id": "ex:a", "n": 1.5}'), read_size=3)) == [{"id": "ex:a", "n": 1.5}]
+
+
+def test_stream_jsonld_graph():
+    graph = {"@context": CONTEXT, "@graph": DOCUMENTS}
+    documents = list(iter_json(io.StringIO(json.dumps(graph)), read_size=16))
+    assert documents == [{"@context": CONTEXT, **d} for d in DOCUMENTS]
+
+    nodes = [
+        n
+        for c in stream_import(io.StringIO(json.dumps(graph)), format=LinkedDataFormat.JSON_LD, batch_size=3)
+        for n in c
+    ]
+    assert [type(n) for n in nodes] == [StreamThing, StreamPerson, StreamThing, StreamPerson, StreamThing]
+    assert nodes[1].id == "ex:1"
+
+
+def test_stream_is_lazy():
+    documents = [{"id": f"ex:{i}", "type": "ex:StreamThing", "name": "x" * 100} for i in range(1000)]
+    source = CountingReader(json.dumps({"@graph": documents}))
+    iterator = iter_documents(source)
+    next(iterator)
+    assert source.consumed < 2 * 65536
+    assert len(list(iterator)) == 999
+
+
+def test_stream_into_backend():
+    store = SimpleDictDocumentStore()
+    source = io.StringIO("\n".join(json.dumps(d) for d in DOCUMENTS))
+    chunks = list(stream_import(source, model_cls=StreamThing, ndjson=True, batch_size=2, backend=store))
+    assert len(chunks) == 3
+    result = store.resolve(ResolveParam(iris=["ex:3"], model_cls=StreamThing)).nodes["ex:3"]
+    assert type(result) is StreamPerson
+
+
+def test_astream_import():
+    async def collect():
+        source = io.StringIO(json.dumps(DOCUMENTS))
+        return [chunk async for chunk in astream_import(source, batch_size=4)]
+
+    chunks = asyncio.run(collect())
+    assert [len(c) for c in chunks] == [4, 1]